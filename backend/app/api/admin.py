@@ -1,13 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, PlainTextResponse, ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, delete
 from sqlalchemy.orm import selectinload
 from datetime import datetime, date, timedelta
 from typing import Optional
-import io
 
-from app.database import get_db
+from app.database import get_db, get_read_db, slow_query_log
 from app.config import settings
 from app.models.user import User
 from app.models.student import Student
@@ -18,7 +17,20 @@ from app.models.subject import Subject
 from app.models.schedule import Schedule
 from app.models.lesson import Lesson
 from app.models.attendance import Attendance
-from app.api.auth import get_current_user
+from app.models.risk import StudentRisk, RiskSnapshot
+from app.models.data_version import bump_data_version, get_data_version, group_scope, ATTENDANCE
+from app.api.auth import get_current_user, get_current_user_readonly
+from app.schemas.rows import StudentRow, AttendanceReportRow, RiskRow
+from app.services import profiler_service, export_service, archive_service, backup_service, matrix_service, risk_service
+from app.services.executor_service import report_executor, ExecutorBusy, ClientDisconnected
+from app.services.report_service import (
+    attendance_report_query, parse_report_date, report_cache, REPORT_PAGE_SIZE
+)
+from app.services.report_render import build_attendance_xlsx
+from app.services.stats_service import stats_cache, attendance_trend, trend_range
+from app.services import notification_service
+from app.services.snapshot_service import snapshot
+from app.services.scheduler_service import reconcile_lessons, database_maintenance
 
 router = APIRouter(tags=["admin"])
 
@@ -33,8 +45,8 @@ async def check_admin(current_user: User, db: AsyncSession):
 
 @router.get("/stats")
 async def get_stats(
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
 ):
     """Umumiy statistika"""
     await check_admin(current_user, db)
@@ -42,18 +54,24 @@ async def get_stats(
     students_count = await db.scalar(select(func.count(Student.id)))
     teachers_count = await db.scalar(select(func.count(Teacher.id)))
     groups_count = await db.scalar(select(func.count(Group.id)))
-    lessons_count = await db.scalar(select(func.count(Lesson.id)))
-    attendance_count = await db.scalar(select(func.count(Attendance.id)))
 
     today = date.today()
-    today_lessons = await db.scalar(
-        select(func.count(Lesson.id)).where(Lesson.date == today)
-    )
-    today_attendance = await db.scalar(
-        select(func.count(Attendance.id))
-        .join(Lesson)
-        .where(Lesson.date == today)
-    )
+    current = await snapshot.current(db)
+    if current is not None:
+        counts = current.counts(today)
+        lessons_count, attendance_count = counts["lessons"], counts["attendance"]
+        today_lessons, today_attendance = counts["today_lessons"], counts["today_attendance"]
+    else:
+        lessons_count = await db.scalar(select(func.count(Lesson.id)))
+        attendance_count = await db.scalar(select(func.count(Attendance.id)))
+        today_lessons = await db.scalar(
+            select(func.count(Lesson.id)).where(Lesson.date == today)
+        )
+        today_attendance = await db.scalar(
+            select(func.count(Attendance.id))
+            .join(Lesson)
+            .where(Lesson.date == today)
+        )
 
     return {
         "total_students": students_count or 0,
@@ -62,44 +80,47 @@ async def get_stats(
         "total_lessons": lessons_count or 0,
         "total_attendance": attendance_count or 0,
         "today_lessons": today_lessons or 0,
-        "today_attendance": today_attendance or 0
+        "today_attendance": today_attendance or 0,
+        "report_cache": report_cache.stats(),
+        "stats_cache": stats_cache.stats(),
+        "snapshot": snapshot.stats(),
+        "notifications": await notification_service.queue_stats(db)
     }
 
 
 @router.get("/students")
 async def get_all_students(
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
 ):
     """Barcha talabalar"""
     await check_admin(current_user, db)
 
     result = await db.execute(
-        select(Student)
-        .options(
-            selectinload(Student.user),
-            selectinload(Student.group).selectinload(Group.direction)
+        select(
+            Student.id,
+            Student.user_id,
+            User.full_name,
+            User.username,
+            Student.student_id,
+            Group.name,
+            Direction.name,
+            Student.created_at
         )
+        .select_from(Student)
+        .outerjoin(User, User.id == Student.user_id)
+        .outerjoin(Group, Group.id == Student.group_id)
+        .outerjoin(Direction, Direction.id == Group.direction_id)
         .order_by(Student.id)
     )
-    students = result.scalars().all()
 
-    return [{
-        "id": s.id,
-        "user_id": s.user_id,
-        "full_name": s.user.full_name if s.user else None,
-        "username": s.user.username if s.user else None,
-        "student_id": s.student_id,
-        "group_name": s.group.name if s.group else None,
-        "direction_name": s.group.direction.name if s.group and s.group.direction else None,
-        "created_at": s.created_at.isoformat() if s.created_at else None
-    } for s in students]
+    return ORJSONResponse([StudentRow(*row) for row in result.all()])
 
 
 @router.get("/teachers")
 async def get_all_teachers(
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
 ):
     """Barcha o'qituvchilar"""
     await check_admin(current_user, db)
@@ -124,8 +145,8 @@ async def get_all_teachers(
 
 @router.get("/groups")
 async def get_all_groups(
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
 ):
     """Barcha guruhlar"""
     await check_admin(current_user, db)
@@ -150,8 +171,8 @@ async def get_all_groups(
 
 @router.get("/directions")
 async def get_all_directions(
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
 ):
     """Barcha yo'nalishlar"""
     await check_admin(current_user, db)
@@ -261,8 +282,8 @@ async def delete_group(
 
 @router.get("/subjects")
 async def get_all_subjects(
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
 ):
     """Barcha fanlar"""
     await check_admin(current_user, db)
@@ -310,7 +331,10 @@ async def delete_subject(
     if not subject:
         raise HTTPException(status_code=404, detail="Fan topilmadi")
 
+    # Hisobotlar va shu fan o'tiladigan guruhlar statistikasidagi fan nomlari
+    groups = await db.execute(select(Schedule.group_id).distinct().where(Schedule.subject_id == subject_id))
     await db.delete(subject)
+    await bump_data_version(db, ATTENDANCE, *map(group_scope, groups.scalars()))
     await db.commit()
 
     return {"success": True, "message": "Fan o'chirildi"}
@@ -323,177 +347,170 @@ async def get_attendance_report(
         start_date: Optional[str] = Query(None),
         end_date: Optional[str] = Query(None),
         group_id: Optional[int] = Query(None),
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
+        source: str = Query(default="hot", pattern="^(hot|archive|all)$"),
+        page: int = Query(default=1, ge=1),
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
 ):
-    """Davomat hisoboti"""
+    """Davomat hisoboti (sahifa - REPORT_PAGE_SIZE ta yozuv; source=archive|all - arxiv bilan)"""
     await check_admin(current_user, db)
 
-    query = select(Attendance).options(
-        selectinload(Attendance.student).selectinload(Student.user),
-        selectinload(Attendance.student).selectinload(Student.group),
-        selectinload(Attendance.lesson).selectinload(Lesson.schedule).selectinload(Schedule.subject)
-    )
-
-    # Filter conditions
-    conditions = []
-
-    if start_date and start_date.strip():
-        try:
-            start = date.fromisoformat(start_date)
-            conditions.append(Lesson.date >= start)
-        except:
-            pass
+    start = parse_report_date(start_date)
+    end = parse_report_date(end_date)
+    version = await get_data_version(db, ATTENDANCE)
+
+    # Keshda tayyor JSON baytlar saqlanadi - hit bo'lsa kodlash ham yo'q
+    key = (start, end, group_id or None, source, page, version)
+    body = report_cache.get(key)
+    if body is None:
+        result = await db.execute(
+            attendance_report_query(start, end, group_id, source)
+            .limit(REPORT_PAGE_SIZE)
+            .offset((page - 1) * REPORT_PAGE_SIZE)
+        )
+        body = ORJSONResponse([AttendanceReportRow(*row) for row in result.all()]).body
+        report_cache.set(key, body)
+    return Response(content=body, media_type="application/json")
 
-    if end_date and end_date.strip():
-        try:
-            end = date.fromisoformat(end_date)
-            conditions.append(Lesson.date <= end)
-        except:
-            pass
 
-    if group_id:
-        conditions.append(Student.group_id == group_id)
-
-    if conditions:
-        query = query.join(Attendance.lesson).join(Attendance.student)
-        for cond in conditions:
-            query = query.where(cond)
+@router.get("/attendance/trend")
+async def get_attendance_trend(
+        bucket: str = Query("day", pattern="^(day|week)$"),
+        start_date: Optional[str] = Query(None),
+        end_date: Optional[str] = Query(None),
+        group_id: Optional[int] = Query(None),
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Umumiy (yoki guruh) davomat trendi - dashboard uchun"""
+    await check_admin(current_user, db)
+    try:
+        start, end = trend_range(parse_report_date(start_date), parse_report_date(end_date))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await attendance_trend(db, start, end, bucket, group_id=group_id)
 
-    result = await db.execute(query.order_by(Attendance.id.desc()).limit(500))
-    attendances = result.scalars().all()
 
-    return [{
-        "id": a.id,
-        "student_name": a.student.user.full_name if a.student and a.student.user else None,
-        "student_id": a.student.student_id if a.student else None,
-        "group_name": a.student.group.name if a.student and a.student.group else None,
-        "subject_name": a.lesson.schedule.subject.name if a.lesson and a.lesson.schedule and a.lesson.schedule.subject else None,
-        "date": a.lesson.date.isoformat() if a.lesson else None,
-        "status": a.status,
-        "marked_at": a.marked_at.isoformat() if a.marked_at else None
-    } for a in attendances]
+@router.get("/attendance/matrix")
+async def get_attendance_matrix(
+        start_date: Optional[str] = Query(None),
+        end_date: Optional[str] = Query(None),
+        source: str = Query(default="hot", pattern="^(hot|archive|all)$"),
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Guruh × fan davomat foizi (heatmap; standart - joriy semestr)"""
+    await check_admin(current_user, db)
+    end = parse_report_date(end_date) or date.today()
+    start = parse_report_date(start_date) or archive_service.semester_start(end)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start_date end_date dan keyin bo'lmasligi kerak")
+    return await matrix_service.attendance_matrix(db, start, end, source)
 
 
 @router.get("/attendance/export")
 async def export_attendance_excel(
+        request: Request,
         start_date: Optional[str] = Query(None),
         end_date: Optional[str] = Query(None),
         group_id: Optional[int] = Query(None),
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
+        source: str = Query(default="hot", pattern="^(hot|archive|all)$"),
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
 ):
     """Davomatni Excel formatda eksport qilish"""
     await check_admin(current_user, db)
 
+    # Ma'lumotlarni olish (tekis qatorlar - worker jarayonga yuboriladi)
+    result = await db.execute(attendance_report_query(
+        parse_report_date(start_date),
+        parse_report_date(end_date),
+        group_id,
+        source
+    ))
+    rows = [tuple(row) for row in result.all()]
+
+    # Excel yaratish - event loopdan tashqarida
     try:
-        import openpyxl
-        from openpyxl.styles import Font, Alignment, PatternFill
-    except ImportError:
-        raise HTTPException(status_code=500, detail="openpyxl kutubxonasi o'rnatilmagan")
-
-    # Ma'lumotlarni olish
-    query = select(Attendance).options(
-        selectinload(Attendance.student).selectinload(Student.user),
-        selectinload(Attendance.student).selectinload(Student.group),
-        selectinload(Attendance.lesson).selectinload(Lesson.schedule).selectinload(Schedule.subject)
+        content = await report_executor.run(build_attendance_xlsx, rows, request=request)
+    except ExecutorBusy:
+        raise HTTPException(status_code=503, detail="Hisobotlar navbati to'la, keyinroq urinib ko'ring")
+    except ClientDisconnected:
+        raise HTTPException(status_code=499, detail="So'rov bekor qilindi")
+
+    filename = f"davomat_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+
+    return Response(
+        content=content,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
     )
 
-    # Filter conditions
-    conditions = []
 
-    if start_date and start_date.strip():
-        try:
-            start = date.fromisoformat(start_date)
-            conditions.append(Lesson.date >= start)
-        except:
-            pass
+@router.post("/exports")
+async def create_export(
+        start_date: Optional[str] = Query(None),
+        end_date: Optional[str] = Query(None),
+        group_id: Optional[int] = Query(None),
+        source: str = Query(default="hot", pattern="^(hot|archive|all)$"),
+        format: str = Query(default="xlsx"),
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Fon rejimida eksport (bir xil filtrlar uchun tayyor fayl qayta ishlatiladi)"""
+    await check_admin(current_user, db)
 
-    if end_date and end_date.strip():
-        try:
-            end = date.fromisoformat(end_date)
-            conditions.append(Lesson.date <= end)
-        except:
-            pass
+    if format not in export_service.FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format: {', '.join(export_service.FORMATS)}")
 
-    if group_id:
-        conditions.append(Student.group_id == group_id)
-
-    if conditions:
-        query = query.join(Attendance.lesson).join(Attendance.student)
-        for cond in conditions:
-            query = query.where(cond)
-
-    result = await db.execute(query.order_by(Attendance.id.desc()))
-    attendances = result.scalars().all()
-
-    # Excel yaratish
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Davomat"
-
-    # Sarlavhalar
-    headers = ["#", "Talaba", "Talaba ID", "Guruh", "Fan", "Sana", "Status", "Vaqt"]
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center")
-
-    # Ma'lumotlar
-    status_colors = {
-        "present": "C6EFCE",
-        "late": "FFEB9C",
-        "absent": "FFC7CE"
-    }
+    filters = export_service.normalize_filters(
+        parse_report_date(start_date),
+        parse_report_date(end_date),
+        group_id,
+        source
+    )
+    job = await export_service.submit(filters, format)
+    return job.as_dict()
 
-    for row, a in enumerate(attendances, 2):
-        ws.cell(row=row, column=1, value=row - 1)
-        ws.cell(row=row, column=2, value=a.student.user.full_name if a.student and a.student.user else "-")
-        ws.cell(row=row, column=3, value=a.student.student_id if a.student else "-")
-        ws.cell(row=row, column=4, value=a.student.group.name if a.student and a.student.group else "-")
-        ws.cell(row=row, column=5,
-                value=a.lesson.schedule.subject.name if a.lesson and a.lesson.schedule and a.lesson.schedule.subject else "-")
-        ws.cell(row=row, column=6, value=a.lesson.date.isoformat() if a.lesson else "-")
-
-        status_cell = ws.cell(row=row, column=7, value=a.status)
-        if a.status in status_colors:
-            status_cell.fill = PatternFill(start_color=status_colors[a.status], end_color=status_colors[a.status],
-                                           fill_type="solid")
-
-        ws.cell(row=row, column=8, value=a.marked_at.strftime("%H:%M") if a.marked_at else "-")
-
-    # Ustun kengliklari
-    ws.column_dimensions['A'].width = 5
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 12
-    ws.column_dimensions['D'].width = 12
-    ws.column_dimensions['E'].width = 20
-    ws.column_dimensions['F'].width = 12
-    ws.column_dimensions['G'].width = 10
-    ws.column_dimensions['H'].width = 10
-
-    # Faylni saqlash
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
 
-    filename = f"davomat_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+@router.get("/exports/{job_id}")
+async def get_export(
+        job_id: str,
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Eksport holati"""
+    await check_admin(current_user, db)
 
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    job = export_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Eksport topilmadi")
+    return job.as_dict()
+
+
+@router.get("/exports/{job_id}/download")
+async def download_export(
+        job_id: str,
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Tayyor eksport faylini yuklab olish"""
+    await check_admin(current_user, db)
+
+    job = export_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Eksport topilmadi")
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"Eksport hali tayyor emas: {job.status}")
+
+    export_service.touch(job)
+    return FileResponse(job.path, media_type=job.media_type, filename=job.filename)
 
 
 @router.get("/lessons/today")
 async def get_today_lessons(
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
 ):
     """Bugungi darslar"""
     await check_admin(current_user, db)
@@ -523,6 +540,90 @@ async def get_today_lessons(
     } for l in lessons]
 
 
+@router.post("/lessons/reconcile")
+async def reconcile_lessons_now(
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Darslar holatini hozirgi vaqtga moslashtirish (qo'lda)"""
+    await check_admin(current_user, db)
+    return await reconcile_lessons()
+
+
+@router.get("/archive")
+async def get_archive_stats(
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Issiq va arxiv jadvallar hajmi"""
+    await check_admin(current_user, db)
+    return await archive_service.archive_stats()
+
+
+@router.post("/archive/run")
+async def run_archive(
+        before: Optional[str] = Query(None, description="Shu sanadan oldingi darslar (standart - joriy semestr boshi)"),
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Yopilgan semestrlarni hoziroq arxivlash"""
+    await check_admin(current_user, db)
+    return await archive_service.archive_closed_semesters(parse_report_date(before))
+
+
+@router.post("/maintenance")
+async def run_maintenance(
+        full_vacuum: bool = Query(False),
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Baza maintenance ni hoziroq bajarish (ANALYZE, incremental vacuum, checkpoint).
+    full_vacuum=true - baza INCREMENTAL bo'lmasa, bir martalik to'liq VACUUM
+    """
+    await check_admin(current_user, db)
+    return await database_maintenance(full_vacuum)
+
+
+@router.get("/backups")
+async def get_backups(
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Backuplar ro'yxati va joriy/oxirgi backup holati"""
+    await check_admin(current_user, db)
+    return {"state": backup_service.state, "backups": backup_service.list_backups()}
+
+
+@router.post("/backups")
+async def create_backup(
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Hoziroq backup yaratish"""
+    await check_admin(current_user, db)
+    try:
+        return await backup_service.run_backup()
+    except backup_service.BackupInProgress:
+        raise HTTPException(status_code=409, detail="Backup allaqachon bajarilmoqda")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Backup xatosi: {e}")
+
+
+@router.get("/backups/{name}")
+async def download_backup(
+        name: str,
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Backup faylini yuklab olish"""
+    await check_admin(current_user, db)
+    path = backup_service.backup_path(name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Backup topilmadi")
+    return FileResponse(path, media_type="application/gzip", filename=name)
+
+
 @router.delete("/users/{user_id}")
 async def delete_user(
         user_id: int,
@@ -539,10 +640,149 @@ async def delete_user(
         raise HTTPException(status_code=404, detail="User topilmadi")
 
     # Student yoki Teacher o'chirish
+    await db.execute(delete(StudentRisk).where(
+        StudentRisk.student_id.in_(select(Student.id).where(Student.user_id == user_id))
+    ))
     await db.execute(delete(Student).where(Student.user_id == user_id))
     await db.execute(delete(Teacher).where(Teacher.user_id == user_id))
 
     await db.delete(user)
+    await bump_data_version(db, ATTENDANCE)
     await db.commit()
 
-    return {"success": True, "message": "User o'chirildi"}
\ No newline at end of file
+    return {"success": True, "message": "User o'chirildi"}
+
+
+# ============ XAVF OSTIDAGI TALABALAR ============
+
+def _risk_rows(source, where):
+    """Xavf ro'yxati (StudentRisk yoki RiskSnapshot) uchun tekis so'rov"""
+    return (
+        select(
+            source.student_id, User.full_name, Student.student_id, source.group_id, Group.name,
+            source.lessons, source.absences, source.absence_rate
+        )
+        .join(Student, Student.id == source.student_id)
+        .outerjoin(User, User.id == Student.user_id)
+        .outerjoin(Group, Group.id == source.group_id)
+        .where(*where)
+        .order_by(Group.name, source.absence_rate.desc())
+    )
+
+
+@router.get("/risk")
+async def get_at_risk_students(
+        group_id: Optional[int] = Query(None),
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Xavf ostidagi talabalar (oxirgi RISK_WINDOW_LESSONS darsda qoldirish >= RISK_ABSENCE_THRESHOLD)"""
+    await check_admin(current_user, db)
+    where = [StudentRisk.at_risk == True]
+    if group_id:
+        where.append(StudentRisk.group_id == group_id)
+    result = await db.execute(_risk_rows(StudentRisk, where))
+    return ORJSONResponse([RiskRow(*row) for row in result.all()])
+
+
+@router.get("/risk/snapshots")
+async def get_risk_snapshot(
+        snapshot_date: Optional[str] = Query(None, description="Standart - oxirgi saqlangan kun"),
+        group_id: Optional[int] = Query(None),
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Kunlik job saqlagan xavf ro'yxati"""
+    await check_admin(current_user, db)
+    day = parse_report_date(snapshot_date) or await db.scalar(select(func.max(RiskSnapshot.snapshot_date)))
+    if day is None:
+        return {"date": None, "students": []}
+    where = [RiskSnapshot.snapshot_date == day]
+    if group_id:
+        where.append(RiskSnapshot.group_id == group_id)
+    result = await db.execute(_risk_rows(RiskSnapshot, where))
+    return ORJSONResponse({"date": day, "students": [RiskRow(*row) for row in result.all()]})
+
+
+@router.post("/risk/rebuild")
+async def rebuild_risk(
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Xavf oynalarini attendance dan qayta qurish (sozlamalar o'zgargandan keyin)"""
+    await check_admin(current_user, db)
+    return await risk_service.rebuild_risk()
+
+
+# ============ MONITORING ============
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+        limit: int = Query(default=50, le=500),
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Sekin SQL so'rovlar (fingerprint bo'yicha, EXPLAIN QUERY PLAN bilan)"""
+    await check_admin(current_user, db)
+
+    return {
+        "threshold_ms": settings.SLOW_QUERY_MS,
+        "buffered": len(slow_query_log.entries),
+        "queries": slow_query_log.summary(limit)
+    }
+
+
+@router.delete("/slow-queries")
+async def clear_slow_queries(
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """Sekin so'rovlar buferini tozalash"""
+    await check_admin(current_user, db)
+
+    slow_query_log.clear()
+    return {"success": True, "message": "Tozalandi"}
+
+
+@router.post("/profiling/token")
+async def create_profiling_token(
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """Profillash tokeni (X-Profile-Token header yoki ?__profile= bilan yuboriladi)"""
+    await check_admin(current_user, db)
+
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=400, detail="Profillash o'chirilgan")
+    return profiler_service.create_profile_token()
+
+
+@router.get("/profiling")
+async def get_profiles(
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Saqlangan profillar ro'yxati"""
+    await check_admin(current_user, db)
+
+    return profiler_service.list_profiles()
+
+
+@router.get("/profiling/{profile_id}")
+async def download_profile(
+        profile_id: str,
+        format: str = Query(default="pstats", pattern="^(pstats|text)$"),
+        sort: str = Query(default="cumulative", pattern="^(cumulative|tottime|ncalls)$"),
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
+):
+    """Profilni yuklab olish (pstats) yoki matn ko'rinishida ko'rish"""
+    await check_admin(current_user, db)
+
+    path = profiler_service.profile_path(profile_id)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profil topilmadi")
+
+    if format == "text":
+        return PlainTextResponse(profiler_service.render_profile_text(path, sort=sort))
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.pstats")
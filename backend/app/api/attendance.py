@@ -1,21 +1,26 @@
 """
 Attendance API - Davomat
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload
-from datetime import datetime, timedelta
+from sqlalchemy import select, or_
+from datetime import datetime
+from typing import Optional
+import base64
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User
 from app.models.student import Student
-from app.models.lesson import Lesson, LessonStatus
-from app.models.attendance import Attendance, AttendanceStatus
+from app.models.lesson import Lesson
+from app.models.attendance import Attendance
 from app.models.schedule import Schedule
-from app.api.auth import get_current_user
+from app.models.subject import Subject
+from app.api.auth import get_current_user, get_current_user_readonly
 from app.schemas.attendance import MarkAttendanceResponse, AttendanceCreate
-from app.config import settings
+from app.schemas.rows import HistoryRow
+from app.services.report_service import parse_report_date
+from app.services.attendance_service import mark_self
 
 router = APIRouter()
 
@@ -27,135 +32,89 @@ async def mark_attendance(
     db: AsyncSession = Depends(get_db)
 ):
     """Davomat qilish"""
-    # Talabani olish
     result = await db.execute(
         select(Student).where(Student.user_id == current_user.id)
     )
-    student = result.scalar_one_or_none()
-    
-    if not student:
-        return MarkAttendanceResponse(
-            success=False,
-            message="Siz talaba sifatida ro'yxatdan o'tmagansiz"
-        )
-    
-    # Darsni olish
-    result = await db.execute(
-        select(Lesson)
-        .options(selectinload(Lesson.schedule).selectinload(Schedule.subject))
-        .where(Lesson.id == data.lesson_id)
-    )
-    lesson = result.scalar_one_or_none()
-    
-    if not lesson:
-        return MarkAttendanceResponse(
-            success=False,
-            message="Dars topilmadi"
-        )
-    
-    # Tekshiruvlar
-    if lesson.status != LessonStatus.OPEN.value:
-        return MarkAttendanceResponse(
-            success=False,
-            message="Dars hali ochilmagan yoki yopilgan"
-        )
-    
-    if lesson.schedule.group_id != student.group_id:
-        return MarkAttendanceResponse(
-            success=False,
-            message="Bu dars sizning guruhingiz uchun emas"
-        )
-    
-    # Mavjud davomat tekshirish
-    result = await db.execute(
-        select(Attendance).where(
-            and_(
-                Attendance.lesson_id == lesson.id,
-                Attendance.student_id == student.id
-            )
-        )
-    )
-    existing = result.scalar_one_or_none()
-    
-    if existing:
-        return MarkAttendanceResponse(
-            success=False,
-            message="Siz allaqachon davomat qilgansiz"
-        )
-    
-    # Vaqt tekshirish
-    now = datetime.now()
-    lesson_start = datetime.combine(lesson.date, lesson.schedule.start_time)
-    close_time = lesson_start + timedelta(minutes=settings.LESSON_CLOSE_AFTER_MINUTES)
-    
-    if now > close_time:
-        return MarkAttendanceResponse(
-            success=False,
-            message="Davomat vaqti tugagan"
-        )
-    
-    # Kech kelganlik tekshirish
-    late_threshold = lesson_start + timedelta(minutes=15)
-    status = AttendanceStatus.LATE.value if now > late_threshold else AttendanceStatus.PRESENT.value
-    
-    # Davomat yaratish
-    attendance = Attendance(
-        lesson_id=lesson.id,
-        student_id=student.id,
-        status=status,
-        marked_by="self"
-    )
-    db.add(attendance)
-    await db.commit()
-    await db.refresh(attendance)
-    
-    return MarkAttendanceResponse(
-        success=True,
-        message="Davomat muvaffaqiyatli belgilandi!" if status == "present" else "Davomat belgilandi (kech kelish)",
-        attendance={
-            "id": attendance.id,
-            "lesson_id": attendance.lesson_id,
-            "student_id": attendance.student_id,
-            "status": attendance.status,
-            "marked_at": attendance.marked_at,
-            "marked_by": attendance.marked_by,
-            "note": attendance.note
-        }
-    )
+    return await mark_self(db, result.scalar_one_or_none(), data.lesson_id)
+
+
+def _encode_cursor(marked_at: datetime, attendance_id: int) -> str:
+    raw = f"{marked_at.isoformat()}|{attendance_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        marked_at, attendance_id = raw.split("|")
+        return datetime.fromisoformat(marked_at), int(attendance_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Noto'g'ri cursor")
 
 
 @router.get("/history")
 async def get_attendance_history(
-    limit: int = 20,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Oldingi javobdagi X-Next-Cursor"),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    subject_id: Optional[int] = Query(None),
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Davomat tarixi"""
-    result = await db.execute(
-        select(Student).where(Student.user_id == current_user.id)
+    """
+    Davomat tarixi (yangilari birinchi).
+
+    Keyset pagination: keyingi sahifa uchun javobdagi `X-Next-Cursor` header
+    qiymati `cursor` parametriga beriladi. (student_id, marked_at) indeksi
+    tufayli har bir sahifa tarix uzunligidan qat'i nazar O(limit).
+    """
+    student_id = await db.scalar(
+        select(Student.id).where(Student.user_id == current_user.id)
     )
-    student = result.scalar_one_or_none()
-    
-    if not student:
+    if not student_id:
         raise HTTPException(status_code=404, detail="Student not found")
-    
-    result = await db.execute(
-        select(Attendance)
-        .options(
-            selectinload(Attendance.lesson)
-            .selectinload(Lesson.schedule)
-            .selectinload(Schedule.subject)
+
+    query = (
+        select(
+            Attendance.id,
+            Lesson.date,
+            Subject.id,
+            Subject.name,
+            Attendance.status,
+            Attendance.marked_at
         )
-        .where(Attendance.student_id == student.id)
-        .order_by(Attendance.marked_at.desc())
-        .limit(limit)
+        .select_from(Attendance)
+        .join(Lesson, Lesson.id == Attendance.lesson_id)
+        .outerjoin(Schedule, Schedule.id == Lesson.schedule_id)
+        .outerjoin(Subject, Subject.id == Schedule.subject_id)
+        .where(Attendance.student_id == student_id)
     )
-    attendances = result.scalars().all()
-    
-    return [{
-        "id": a.id,
-        "date": a.lesson.date.isoformat(),
-        "subject_name": a.lesson.schedule.subject.name,
-        "status": a.status,
-        "marked_at": a.marked_at.isoformat()
-    } for a in attendances]
+
+    if cursor:
+        marked_at, last_id = _decode_cursor(cursor)
+        query = query.where(
+            Attendance.marked_at <= marked_at,
+            or_(Attendance.marked_at < marked_at, Attendance.id < last_id)
+        )
+    start = parse_report_date(start_date)
+    end = parse_report_date(end_date)
+    if start:
+        query = query.where(Lesson.date >= start)
+    if end:
+        query = query.where(Lesson.date <= end)
+    if subject_id:
+        query = query.where(Schedule.subject_id == subject_id)
+
+    result = await db.execute(
+        query.order_by(Attendance.marked_at.desc(), Attendance.id.desc()).limit(limit + 1)
+    )
+    rows = [HistoryRow(*row) for row in result.all()]
+
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if rows[-1].marked_at is not None:
+            headers["X-Next-Cursor"] = _encode_cursor(rows[-1].marked_at, rows[-1].id)
+
+    return ORJSONResponse(rows, headers=headers)
@@ -12,7 +12,7 @@ import jwt
 from typing import Optional
 import io
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.config import settings
 from app.models.user import User
 from app.models.student import Student
@@ -68,11 +68,8 @@ def create_token(user_id: int) -> str:
     return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
 
 
-async def get_current_user(
-        authorization: str = Header(...),
-        db: AsyncSession = Depends(get_db)
-) -> User:
-    """Joriy foydalanuvchini olish"""
+async def _load_user(authorization: str, db: AsyncSession) -> User:
+    """Token bo'yicha foydalanuvchini topish"""
     if not authorization:
         raise HTTPException(status_code=401, detail="Token kerak")
 
@@ -93,6 +90,22 @@ async def get_current_user(
         raise HTTPException(status_code=401, detail=f"Noto'g'ri token: {str(e)}")
 
 
+async def get_current_user(
+        authorization: str = Header(...),
+        db: AsyncSession = Depends(get_db)
+) -> User:
+    """Joriy foydalanuvchini olish"""
+    return await _load_user(authorization, db)
+
+
+async def get_current_user_readonly(
+        authorization: str = Header(...),
+        db: AsyncSession = Depends(get_read_db)
+) -> User:
+    """Joriy foydalanuvchi - faqat o'qiydigan endpointlar uchun (o'zgartirib bo'lmaydi)"""
+    return await _load_user(authorization, db)
+
+
 @router.post("/telegram")
 async def telegram_auth(
         auth_data: TelegramAuthData,
@@ -164,8 +177,8 @@ async def telegram_auth(
 
 @router.get("/me")
 async def get_me(
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
+        current_user: User = Depends(get_current_user_readonly),
+        db: AsyncSession = Depends(get_read_db)
 ):
     """Joriy user ma'lumotlari"""
     result = await db.execute(
@@ -205,7 +218,7 @@ async def get_me(
 
 
 @router.get("/directions")
-async def get_directions(db: AsyncSession = Depends(get_db)):
+async def get_directions(db: AsyncSession = Depends(get_read_db)):
     """Barcha yo'nalishlar"""
     result = await db.execute(select(Direction).order_by(Direction.name))
     directions = result.scalars().all()
@@ -223,7 +236,7 @@ async def get_directions(db: AsyncSession = Depends(get_db)):
 @router.get("/groups/{direction_id}")
 async def get_groups_by_direction(
         direction_id: int,
-        db: AsyncSession = Depends(get_db)
+        db: AsyncSession = Depends(get_read_db)
 ):
     """Yo'nalish bo'yicha guruhlar"""
     result = await db.execute(
@@ -302,7 +315,7 @@ async def register_teacher(
 
 
 @router.get("/check-admin")
-async def check_admin(current_user: User = Depends(get_current_user)):
+async def check_admin(current_user: User = Depends(get_current_user_readonly)):
     """Admin ekanligini tekshirish"""
     admin_ids = [int(x.strip()) for x in settings.ADMIN_IDS.split(',') if x.strip()]
     is_admin = current_user.telegram_id in admin_ids
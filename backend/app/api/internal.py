@@ -0,0 +1,101 @@
+"""
+Internal API - bot uchun (Telegram foydalanuvchi tokeni emas, umumiy maxfiy kalit)
+
+Barcha endpointlar `X-Internal-Token` sarlavhasini INTERNAL_API_TOKEN bilan
+solishtiradi; sozlama bo'sh bo'lsa ichki API o'chirilgan.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List, Optional
+import hmac
+
+from app.database import get_db, get_read_db
+from app.config import settings
+from app.models.user import User
+from app.models.student import Student
+from app.schemas.attendance import MarkAttendanceResponse, BotAttendanceCreate, SubjectStats
+from app.schemas.notification import NotificationAck
+from app.services import notification_service
+from app.services.attendance_service import mark_self
+from app.services.stats_service import subject_stats
+from app.api.schedule import get_week_schedule
+
+
+async def verify_internal_token(x_internal_token: str = Header("")):
+    """Ichki API kaliti"""
+    if not settings.INTERNAL_API_TOKEN:
+        raise HTTPException(status_code=503, detail="Ichki API o'chirilgan")
+    if not hmac.compare_digest(x_internal_token.encode(), settings.INTERNAL_API_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Noto'g'ri ichki token")
+
+
+router = APIRouter(dependencies=[Depends(verify_internal_token)])
+
+
+async def _student_by_telegram(db: AsyncSession, telegram_id: int) -> Optional[Student]:
+    """Faol foydalanuvchining talaba yozuvi"""
+    result = await db.execute(
+        select(Student)
+        .join(User, User.id == Student.user_id)
+        .where(User.telegram_id == telegram_id, User.is_active == True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def _require_student(db: AsyncSession, telegram_id: int) -> Student:
+    student = await _student_by_telegram(db, telegram_id)
+    if not student:
+        raise HTTPException(status_code=404, detail="Talaba topilmadi")
+    return student
+
+
+@router.post("/notifications/claim")
+async def claim_notifications(
+    limit: int = Query(settings.NOTIFY_BATCH_SIZE, ge=1, le=500),
+    db: AsyncSession = Depends(get_db)
+):
+    """Yuborilishi kerak bo'lgan xabarlar (NOTIFY_LEASE_SECONDS ga band qilinadi)"""
+    rows = await notification_service.claim(db, limit)
+    return ORJSONResponse(rows)
+
+
+@router.post("/notifications/ack")
+async def ack_notifications(
+    data: NotificationAck,
+    db: AsyncSession = Depends(get_db)
+):
+    """Yuborilgan xabarlarni tasdiqlash"""
+    acked = await notification_service.ack(db, data.ids)
+    return {"success": True, "acked": acked}
+
+
+@router.post("/attendance/mark", response_model=MarkAttendanceResponse)
+async def mark_attendance(
+    data: BotAttendanceCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """Bot tugmasi - talaba Telegram ID si bo'yicha (Mini App yuklanmaydi)"""
+    student = await _student_by_telegram(db, data.telegram_id)
+    return await mark_self(db, student, data.lesson_id)
+
+
+@router.get("/students/{telegram_id}/schedule")
+async def get_student_schedule(
+    telegram_id: int,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Talaba guruhining haftalik jadvali (bot /schedule)"""
+    student = await _require_student(db, telegram_id)
+    return await get_week_schedule(student.group_id, db)
+
+
+@router.get("/students/{telegram_id}/stats", response_model=List[SubjectStats])
+async def get_student_stats(
+    telegram_id: int,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Fanlar bo'yicha statistika (bot /stats; stats_cache dan)"""
+    student = await _require_student(db, telegram_id)
+    return await subject_stats(db, student)
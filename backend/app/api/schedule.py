@@ -2,20 +2,22 @@
 Schedule API - Dars jadvali
 """
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from sqlalchemy.orm import selectinload
 from datetime import date
 from typing import List
 
-from app.database import get_db
+from app.database import get_read_db
 from app.models.user import User
 from app.models.schedule import Schedule
 from app.models.subject import Subject
 from app.models.teacher import Teacher
 from app.models.group import Group
 from app.api.auth import get_current_user
-from app.schemas.schedule import WeekScheduleResponse, ScheduleResponse
+from app.schemas.schedule import WeekScheduleResponse
+from app.schemas.rows import ScheduleRow, WeekScheduleRow
 
 router = APIRouter()
 
@@ -25,7 +27,7 @@ DAY_NAMES = ["Dushanba", "Seshanba", "Chorshanba", "Payshanba", "Juma", "Shanba"
 @router.get("/week/{group_id}", response_model=List[WeekScheduleResponse])
 async def get_week_schedule(
     group_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Haftalik jadval"""
     result = await db.execute(
@@ -51,7 +53,7 @@ async def get_week_schedule(
         if day not in days_schedule:
             days_schedule[day] = []
         
-        days_schedule[day].append(ScheduleResponse(
+        days_schedule[day].append(ScheduleRow(
             id=schedule.id,
             group_id=schedule.group_id,
             subject_id=schedule.subject_id,
@@ -65,20 +67,20 @@ async def get_week_schedule(
             teacher_name=schedule.teacher.user.full_name if schedule.teacher else None
         ))
     
-    # Response
+    # Response (WeekScheduleResponse shaklida, orjson bilan kodlanadi)
     week_schedule = []
     for day in range(6):  # 0-5 (Dush-Shan)
-        week_schedule.append(WeekScheduleResponse(
+        week_schedule.append(WeekScheduleRow(
             day_of_week=day,
             day_name=DAY_NAMES[day],
             lessons=days_schedule.get(day, [])
         ))
     
-    return week_schedule
+    return ORJSONResponse(week_schedule)
 
 
 @router.get("/subjects")
-async def get_subjects(db: AsyncSession = Depends(get_db)):
+async def get_subjects(db: AsyncSession = Depends(get_read_db)):
     """Barcha fanlar"""
     result = await db.execute(select(Subject).order_by(Subject.name))
     return result.scalars().all()
@@ -87,7 +89,7 @@ async def get_subjects(db: AsyncSession = Depends(get_db)):
 @router.get("/groups")
 async def get_groups(
     direction_id: int = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Guruhlar"""
     query = select(Group).options(selectinload(Group.direction))
@@ -1,14 +1,14 @@
 """
 Student API - Talabalar uchun
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func, or_
 from sqlalchemy.orm import selectinload
 from datetime import datetime, date, timedelta
-from typing import List
+from typing import List, Optional
 
-from app.database import get_db
+from app.database import get_read_db
 from app.models.user import User
 from app.models.student import Student
 from app.models.schedule import Schedule
@@ -17,7 +17,10 @@ from app.models.attendance import Attendance
 from app.models.subject import Subject
 from app.models.teacher import Teacher
 from app.models.group import Group
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user_readonly
+from app.schemas.attendance import SubjectStats
+from app.services.stats_service import subject_stats, attendance_trend, trend_range
+from app.services.report_service import parse_report_date
 from app.config import settings
 
 router = APIRouter()
@@ -38,8 +41,8 @@ async def get_student(user: User, db: AsyncSession) -> Student:
 
 @router.get("/profile")
 async def get_profile(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Talaba profili"""
     student = await get_student(current_user, db)
@@ -72,8 +75,8 @@ async def get_profile(
 
 @router.get("/today")
 async def get_today_lessons(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Bugungi darslar - OPEN va PENDING statusdagi darslar"""
     student = await get_student(current_user, db)
@@ -161,8 +164,8 @@ async def get_today_lessons(
 
 @router.get("/stats")
 async def get_stats(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Umumiy statistika"""
     student = await get_student(current_user, db)
@@ -206,10 +209,37 @@ async def get_stats(
     }
 
 
+@router.get("/stats/subjects", response_model=List[SubjectStats])
+async def get_subject_stats(
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Fanlar bo'yicha statistika"""
+    student = await get_student(current_user, db)
+    return await subject_stats(db, student)
+
+
+@router.get("/stats/trend")
+async def get_trend(
+    bucket: str = Query("day", pattern="^(day|week)$"),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Davomat trendi (kun yoki hafta bo'yicha)"""
+    student = await get_student(current_user, db)
+    try:
+        start, end = trend_range(parse_report_date(start_date), parse_report_date(end_date))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await attendance_trend(db, start, end, bucket, student_id=student.id)
+
+
 @router.get("/schedule")
 async def get_schedule(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Haftalik jadval"""
     student = await get_student(current_user, db)
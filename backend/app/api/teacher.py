@@ -2,13 +2,14 @@
 Teacher API - O'qituvchilar uchun
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func, delete
 from sqlalchemy.orm import selectinload
 from datetime import datetime, date, timedelta
 from typing import List, Optional
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User
 from app.models.teacher import Teacher
 from app.models.student import Student
@@ -17,7 +18,15 @@ from app.models.lesson import Lesson, LessonStatus
 from app.models.attendance import Attendance
 from app.models.subject import Subject
 from app.models.group import Group
-from app.api.auth import get_current_user
+from app.models.notification import NotificationKind
+from app.models.data_version import (
+    bump_data_version, student_scope, group_scope, ATTENDANCE, LESSONS, HISTORY
+)
+from app.api.auth import get_current_user, get_current_user_readonly
+from app.schemas.rows import LessonStudentRow
+from app.services.stats_service import attendance_trend, trend_range
+from app.services import risk_service, notification_service
+from app.services.report_service import parse_report_date
 from app.config import settings
 
 router = APIRouter()
@@ -36,8 +45,8 @@ async def get_teacher(user: User, db: AsyncSession) -> Teacher:
 
 @router.get("/profile")
 async def get_profile(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """O'qituvchi profili"""
     teacher = await get_teacher(current_user, db)
@@ -55,8 +64,8 @@ async def get_profile(
 
 @router.get("/groups")
 async def get_groups(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Barcha guruhlar ro'yxati"""
     teacher = await get_teacher(current_user, db)
@@ -79,10 +88,28 @@ async def get_groups(
     ]
 
 
+@router.get("/groups/{group_id}/trend")
+async def get_group_trend(
+    group_id: int,
+    bucket: str = Query("day", pattern="^(day|week)$"),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Guruh davomati trendi (kun yoki hafta bo'yicha)"""
+    await get_teacher(current_user, db)
+    try:
+        start, end = trend_range(parse_report_date(start_date), parse_report_date(end_date))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await attendance_trend(db, start, end, bucket, group_id=group_id)
+
+
 @router.get("/subjects")
 async def get_subjects(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Barcha fanlar ro'yxati"""
     teacher = await get_teacher(current_user, db)
@@ -276,6 +303,7 @@ async def open_lesson(
     lesson.status = LessonStatus.OPEN.value
     lesson.opened_at = datetime.utcnow()
     lesson.opened_by = current_user.id
+    await notification_service.enqueue(db, NotificationKind.LESSON_OPENED.value, [lesson.id])
 
     await db.commit()
 
@@ -310,6 +338,8 @@ async def close_lesson(
     lesson.status = LessonStatus.CLOSED.value
     lesson.closed_at = datetime.utcnow()
     lesson.closed_by = current_user.id
+    await bump_data_version(db, LESSONS, group_scope(lesson.schedule.group_id))
+    await risk_service.record_closed_lessons(db, [lesson.id])
 
     await db.commit()
 
@@ -319,8 +349,8 @@ async def close_lesson(
 @router.get("/lesson/{lesson_id}/attendance")
 async def get_lesson_attendance(
     lesson_id: int,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_readonly),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Dars davomati"""
     teacher = await get_teacher(current_user, db)
@@ -356,24 +386,24 @@ async def get_lesson_attendance(
     students_list = []
     for student in students:
         att = attendances.get(student.id)
-        students_list.append({
-            "student_id": student.id,
-            "student_code": student.student_id,
-            "full_name": student.user.full_name,
-            "status": att.status if att else "absent",
-            "marked_at": att.marked_at.isoformat() if att else None
-        })
-
-    return {
+        students_list.append(LessonStudentRow(
+            student_id=student.id,
+            student_code=student.student_id,
+            full_name=student.user.full_name,
+            status=att.status if att else "absent",
+            marked_at=att.marked_at if att else None
+        ))
+
+    return ORJSONResponse({
         "lesson_id": lesson.id,
         "subject_name": lesson.schedule.subject.name,
         "group_name": lesson.schedule.group.name,
-        "date": lesson.date.isoformat(),
+        "date": lesson.date,
         "status": lesson.status,
         "total_students": len(students),
-        "present_count": len([s for s in students_list if s["status"] == "present"]),
+        "present_count": sum(1 for s in students_list if s.status == "present"),
         "students": students_list
-    }
+    })
 
 
 @router.post("/lesson/{lesson_id}/mark/{student_id}")
@@ -431,6 +461,11 @@ async def mark_student_attendance(
         )
         db.add(attendance)
 
+    await bump_data_version(db, ATTENDANCE, student_scope(student_id))
+    if lesson.date < date.today():
+        await bump_data_version(db, HISTORY)
+    if lesson.status == LessonStatus.CLOSED.value:
+        await risk_service.record_mark(db, lesson_id, student_id, status)
     await db.commit()
 
     return {"success": True, "message": f"Davomat saqlandi: {status}"}
@@ -460,6 +495,7 @@ async def delete_lesson(
 
     # Avval attendance o'chirish
     await db.execute(delete(Attendance).where(Attendance.lesson_id == lesson_id))
+    await risk_service.forget_lesson(db, lesson_id, lesson.schedule.group_id)
 
     # Schedule ID ni saqlash
     schedule_id = lesson.schedule_id
@@ -479,6 +515,9 @@ async def delete_lesson(
         if schedule:
             await db.delete(schedule)
 
+    await bump_data_version(db, ATTENDANCE, group_scope(lesson.schedule.group_id))
+    if lesson.date < date.today():
+        await bump_data_version(db, HISTORY)
     await db.commit()
 
     return {"success": True, "message": "Dars o'chirildi"}
\ No newline at end of file
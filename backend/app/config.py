@@ -13,10 +13,15 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./data/attendance.db"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Qulf bo'shashini kutish
+    SQL_ECHO: bool = False  # Barcha SQL ni logga chiqarish (faqat lokal debug uchun)
+    SLOW_QUERY_MS: int = 200  # Shundan sekin statementlar yoziladi (0 - o'chirilgan)
+    SLOW_QUERY_LOG_SIZE: int = 500  # Ring buffer hajmi
     
     # Telegram
     BOT_TOKEN: str = ""
     BOT_USERNAME: str = ""
+    INTERNAL_API_TOKEN: str = ""  # Bot -> backend ichki API (/api/internal); bo'sh - o'chirilgan
     
     # Admin
     ADMIN_IDS: str = ""  # Comma separated
@@ -33,6 +38,76 @@ class Settings(BaseSettings):
     LESSON_OPEN_BEFORE_MINUTES: int = 5  # Darsdan 5 daqiqa oldin ochiladi
     LESSON_CLOSE_AFTER_MINUTES: int = 45  # Dars boshlanganidan 45 daqiqa keyin yopiladi
     
+    # Scheduler (bir nechta workerda faqat leader jarayon joblarni bajaradi)
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_LOCK_PATH: str = "data/scheduler.lock"
+    SCHEDULER_LEADER_RETRY_SECONDS: int = 15
+    RECONCILE_INTERVAL_MINUTES: int = 5  # Darslar holatini moslashtirish (startda ham)
+    
+    # Arxiv (yopilgan semestrlar sovuq jadvallarga)
+    ARCHIVE_ENABLED: bool = True
+    SEMESTER_START_MONTHS: str = "9,2"  # Semestrlar boshlanadigan oylar (1-sana)
+    ARCHIVE_HOUR: int = 3  # Har kuni shu soatda
+    ARCHIVE_BATCH_SIZE: int = 200  # Bitta tranzaksiyadagi darslar
+    ARCHIVE_PAUSE_SECONDS: float = 0.05  # Bo'laklar orasida
+    
+    # Baza maintenance (ANALYZE, incremental vacuum, WAL checkpoint)
+    MAINTENANCE_ENABLED: bool = True
+    MAINTENANCE_HOUR: int = 4  # Har kuni shu soat :30 da (tinch vaqt)
+    MAINTENANCE_BUDGET_SECONDS: int = 60  # incremental vacuum uchun vaqt chegarasi
+    MAINTENANCE_ANALYSIS_LIMIT: int = 1000  # PRAGMA analysis_limit
+    MAINTENANCE_VACUUM_PAGES: int = 1000  # Bitta qadamda qaytariladigan sahifalar
+    MAINTENANCE_CONVERT_AUTO_VACUUM: bool = True  # Eski bazani bir marta to'liq VACUUM bilan INCREMENTAL ga
+    MAINTENANCE_FULL_VACUUM_SECONDS: int = 600  # To'liq VACUUM chegarasi (oshsa - bekor, ertaga qayta)
+    WAL_CHECKPOINT_INTERVAL_MINUTES: int = 30  # PASSIVE checkpoint
+    
+    # Backup (SQLite online backup API, gzip)
+    BACKUP_ENABLED: bool = True
+    BACKUP_DIR: str = "data/backups"
+    BACKUP_HOUR: int = 2  # Har kuni shu soatda
+    BACKUP_KEEP: int = 7  # Saqlanadigan backuplar soni
+    BACKUP_PAGES_PER_STEP: int = 1000  # Bitta qadamda nusxalanadigan sahifalar
+    BACKUP_STEP_SLEEP_MS: int = 10  # Qadamlar orasida (yozuvchilarga navbat)
+    BACKUP_MAX_RESTARTS: int = 5  # Shundan ko'p boshidan boshlansa - bitta qadamda nusxa
+    BACKUP_MAX_SECONDS: int = 300  # Pog'onali nusxa uchun vaqt chegarasi
+    BACKUP_VERIFY: bool = True  # Tiklab integrity_check
+    
+    # Hisobotlar (og'ir eksportlar worker poolda)
+    REPORT_EXECUTOR: str = "process"  # process | thread
+    REPORT_WORKERS: int = 2  # Bir vaqtda bajariladigan eksportlar
+    REPORT_QUEUE_SIZE: int = 8  # Kutayotganlar chegarasi (oshsa - 503)
+    REPORT_DISCONNECT_POLL_SECONDS: float = 0.5
+    REPORT_CACHE_SIZE: int = 256  # Keshdagi hisobot sahifalari (0 - o'chirilgan)
+    STATS_CACHE_SIZE: int = 1024  # Talaba statistikasi keshi (0 - o'chirilgan)
+    MATRIX_CACHE_SIZE: int = 32  # Guruh × fan matritsalari keshi (0 - o'chirilgan)
+    SNAPSHOT_ENABLED: bool = False  # Statistika/trend/matritsa - xotiradagi ustunli nusxadan
+    EXPORT_DIR: str = "data/exports"  # Fon eksport fayllari (kesh)
+    EXPORT_MAX_AGE_HOURS: int = 24
+    EXPORT_MAX_BYTES: int = 500 * 1024 * 1024
+    
+    # Xavf ostidagi talabalar
+    RISK_WINDOW_LESSONS: int = 10  # Oxirgi nechta o'tilgan dars
+    RISK_ABSENCE_THRESHOLD: float = 0.3  # Qoldirish ulushi (0-1)
+    RISK_MIN_LESSONS: int = 5  # Oynada kamida shuncha dars bo'lsa baholanadi
+    RISK_SNAPSHOT_HOUR: int = 5  # Kunlik ro'yxat saqlanadigan soat
+    
+    # Bot xabarlari (dars ochildi / yopilishiga oz qoldi)
+    NOTIFY_ENABLED: bool = True
+    NOTIFY_CLOSING_BEFORE_MINUTES: int = 10  # Yopilishidan shuncha oldin eslatma
+    NOTIFY_BATCH_SIZE: int = 50  # Bot bir so'rovda oladigan xabarlar (maksimal)
+    NOTIFY_LEASE_SECONDS: int = 300  # Tasdiqlanmasa - shundan keyin qayta beriladi
+    NOTIFY_KEEP_DAYS: int = 7  # Yuborilgan xabarlar saqlanadi
+    
+    # Monitoring
+    METRICS_ENABLED: bool = True  # /metrics (Prometheus)
+    QUERY_BUDGET_ENABLED: bool = True  # N+1 va statementlar soni ogohlantirishlari
+    QUERY_BUDGET_PER_REQUEST: int = 25  # So'rov boshiga statementlar
+    QUERY_REPEAT_THRESHOLD: int = 5  # Bir xil statement shu sondan ko'p takrorlansa - N+1
+    PROFILING_ENABLED: bool = True  # Admin tokeni bilan so'rovni cProfile ostida bajarish
+    PROFILE_DIR: str = "data/profiles"
+    PROFILE_TOKEN_TTL_MINUTES: int = 60
+    PROFILE_MAX_FILES: int = 50
+    
     @property
     def admin_ids_list(self) -> List[int]:
         if not self.ADMIN_IDS:
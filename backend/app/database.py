@@ -3,10 +3,19 @@ Database connection va setup
 """
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import event
+from sqlalchemy import event, make_url
+from sqlalchemy.exc import IntegrityError
+from collections import deque
+from datetime import date, datetime
+from functools import lru_cache
 import os
+import re
+import threading
+import time
 
 from app.config import settings
+from app.services.metrics_service import acquire_connection
+from app.services.request_context import get_current_route
 
 # Data papkasini yaratish
 os.makedirs("data", exist_ok=True)
@@ -14,10 +23,61 @@ os.makedirs("data", exist_ok=True)
 # Engine yaratish
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
+    echo=settings.SQL_ECHO,
     future=True
 )
 
+
+
+def _is_file_sqlite(url) -> bool:
+    return url.drivername.startswith("sqlite") and url.database not in (None, "", ":memory:")
+
+
+def _reader_url(database_url: str):
+    """SQLite fayli uchun faqat o'qish (mode=ro) URI; boshqa bazalar uchun o'sha URL"""
+    url = make_url(database_url)
+    if not _is_file_sqlite(url) or url.database.startswith("file:"):
+        return url
+    path = os.path.abspath(url.database)
+    return url.set(database=f"file:{path}?mode=ro", query={**url.query, "uri": "true"})
+
+
+_database_url = make_url(settings.DATABASE_URL)
+
+# SQLite fayli yo'li (maintenance, backup uchun); boshqa bazalarda None
+DATABASE_PATH = os.path.abspath(_database_url.database) if _is_file_sqlite(_database_url) else None
+
+if _is_file_sqlite(_database_url):
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure_writer(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # Yangi (bo'sh) fayl: auto_vacuum jadvallar va WAL dan oldin o'rnatiladi.
+        # Mavjud bazada pragma to'liq VACUUM siz ta'sir qilmaydi - ular maintenance
+        # dagi bir martalik o'tkazish bilan INCREMENTAL ga o'tadi
+        cursor.execute("PRAGMA page_count")
+        if cursor.fetchone()[0] == 0:
+            cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        # WAL - o'quvchilar yozuvchini bloklamaydi (va aksincha)
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+    # Faqat o'qish uchun alohida engine (GET endpointlar)
+    reader_engine = create_async_engine(
+        _reader_url(settings.DATABASE_URL),
+        echo=settings.SQL_ECHO,
+        future=True
+    )
+
+    @event.listens_for(reader_engine.sync_engine, "connect")
+    def _configure_reader(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+else:
+    reader_engine = engine
+
 # Session factory
 async_session = async_sessionmaker(
     engine,
@@ -25,15 +85,180 @@ async_session = async_sessionmaker(
     expire_on_commit=False
 )
 
+read_session = async_sessionmaker(
+    reader_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False
+)
+
 
 class Base(DeclarativeBase):
     pass
 
 
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def sql_fingerprint(statement: str) -> str:
+    """
+    SQL statement shakli: literal va IN (?, ?, ...) ro'yxatlari bir xil ko'rinishga keltiriladi.
+    Bir xil "shakl"dagi statementlar (N+1 sikllari) shu orqali aniqlanadi.
+    """
+    text = _SPACE_RE.sub(" ", statement).strip()
+    text = _STRING_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    return _IN_LIST_RE.sub("(?...)", text)
+
+
+def _redact_value(value):
+    """Foydalanuvchi ma'lumotlarini yashirish: matnlar faqat uzunligi bilan"""
+    if value is None or isinstance(value, (bool, int, float, date, datetime)):
+        return value if not isinstance(value, (date, datetime)) else value.isoformat()
+    if isinstance(value, str):
+        return f"<str:{len(value)}>"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<bytes:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters, executemany: bool = False):
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "first": redact_parameters(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {k: _redact_value(v) for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(v) for v in parameters]
+    return _redact_value(parameters)
+
+
+class SlowQueryLog:
+    """
+    Sekin statementlar uchun cheklangan ring buffer.
+
+    Har bir yozuvda: statement, yashirilgan parametrlar, route va shu
+    ulanishda olingan EXPLAIN QUERY PLAN natijasi.
+    """
+
+    EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH", "INSERT INTO")
+
+    def __init__(self, threshold_ms: float, size: int):
+        self.threshold = threshold_ms / 1000
+        self.entries = deque(maxlen=size)
+        self.lock = threading.Lock()
+
+    def install(self, async_engine):
+        sync_engine = async_engine.sync_engine
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            context._slow_started = time.perf_counter()
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            started = getattr(context, "_slow_started", None)
+            if started is None:
+                return
+            elapsed = time.perf_counter() - started
+            if elapsed >= self.threshold:
+                self.record(conn, statement, parameters, executemany, elapsed)
+
+    def explain(self, conn, statement: str, parameters, executemany: bool):
+        """Xuddi shu ulanishda so'rov rejasini olish (eventlarni chetlab, DBAPI cursor orqali)"""
+        head = statement.lstrip()[:11].upper()
+        if not head.startswith(self.EXPLAINABLE):
+            return None
+        if executemany:
+            parameters = list(parameters)[0] if parameters else ()
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception as e:
+            return [f"EXPLAIN xatosi: {e}"]
+        if conn.dialect.name == "sqlite":
+            # (id, parent, notused, detail)
+            return [row[-1] for row in rows]
+        return [" ".join(str(v) for v in row) for row in rows]
+
+    def record(self, conn, statement: str, parameters, executemany: bool, elapsed: float):
+        entry = {
+            "fingerprint": sql_fingerprint(statement),
+            "statement": statement,
+            "parameters": redact_parameters(parameters, executemany),
+            "route": get_current_route() or "background",
+            "duration_ms": round(elapsed * 1000, 2),
+            "plan": self.explain(conn, statement, parameters, executemany),
+            "at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self.lock:
+            self.entries.append(entry)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def summary(self, limit: int = 50) -> list:
+        """Fingerprint bo'yicha yig'ilgan natija (umumiy vaqt bo'yicha saralangan)"""
+        with self.lock:
+            entries = list(self.entries)
+
+        groups = {}
+        for entry in entries:
+            item = groups.get(entry["fingerprint"])
+            if item is None:
+                item = groups[entry["fingerprint"]] = {
+                    "fingerprint": entry["fingerprint"],
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "routes": set(),
+                    "last_seen": None,
+                    "slowest": None,
+                }
+            item["count"] += 1
+            item["total_ms"] += entry["duration_ms"]
+            item["routes"].add(entry["route"])
+            item["last_seen"] = entry["at"]
+            if entry["duration_ms"] >= item["max_ms"]:
+                item["max_ms"] = entry["duration_ms"]
+                item["slowest"] = {
+                    "statement": entry["statement"],
+                    "parameters": entry["parameters"],
+                    "route": entry["route"],
+                    "plan": entry["plan"],
+                }
+
+        result = sorted(groups.values(), key=lambda i: i["total_ms"], reverse=True)[:limit]
+        for item in result:
+            item["routes"] = sorted(item["routes"])
+            item["total_ms"] = round(item["total_ms"], 2)
+            item["avg_ms"] = round(item["total_ms"] / item["count"], 2)
+        return result
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_MS, settings.SLOW_QUERY_LOG_SIZE)
+if settings.SLOW_QUERY_MS > 0:
+    slow_query_log.install(engine)
+    if reader_engine is not engine:
+        slow_query_log.install(reader_engine)
+
+
 async def get_db():
     """Dependency - database session olish"""
     async with async_session() as session:
         try:
+            if settings.METRICS_ENABLED:
+                await acquire_connection(session)
             yield session
             await session.commit()
         except Exception:
@@ -43,14 +268,38 @@ async def get_db():
             await session.close()
 
 
+async def get_read_db():
+    """Dependency - faqat o'qish uchun session (commit qilinmaydi, yozish tranzaksiyasi ochilmaydi)"""
+    async with read_session() as session:
+        try:
+            if settings.METRICS_ENABLED:
+                await acquire_connection(session, "reader")
+            yield session
+        finally:
+            await session.rollback()
+            await session.close()
+
+
+def _create_missing_indexes(sync_conn):
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(sync_conn, checkfirst=True)
+            except IntegrityError:
+                # UNIQUE indeks: eski bazada takroriy qatorlar bor - ishga tushish to'xtamaydi
+                print(f"⚠️ {index.name} yaratilmadi: {table.name} jadvalida takroriy yozuvlar bor")
+
+
 async def init_db():
     """Database jadvallarini yaratish"""
     async with engine.begin() as conn:
         # Import all models
         from app.models import user, direction, group, student, teacher
-        from app.models import subject, schedule, lesson, attendance
+        from app.models import subject, schedule, lesson, attendance, data_version, archive, risk, notification
         
         await conn.run_sync(Base.metadata.create_all)
+        # Mavjud jadvallarga keyin qo'shilgan indekslar (create_all ularni yaratmaydi)
+        await conn.run_sync(_create_missing_indexes)
     
     # Default ma'lumotlarni qo'shish
     await seed_default_data()
@@ -2,15 +2,23 @@
 Oriental University - Davomat Tizimi
 FastAPI Backend
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import asyncio
 
 from app.config import settings
-from app.database import engine, Base, init_db
-from app.api import auth, student, teacher, schedule, attendance, admin
+from app.database import engine, reader_engine, Base, init_db
+from app.api import auth, student, teacher, schedule, attendance, admin, internal
 from app.services.scheduler_service import start_scheduler, stop_scheduler
+from app.services.executor_service import report_executor
+from app.services import export_service
+from app.services.snapshot_service import snapshot
+from app.services.request_context import RequestContextMiddleware
+from app.services.metrics_service import MetricsMiddleware, instrument_engine, render_metrics
+from app.services import query_budget
+from app.services.profiler_service import ProfilerMiddleware
 
 
 @asynccontextmanager
@@ -19,10 +27,15 @@ async def lifespan(app: FastAPI):
     # Startup
     await init_db()
     await start_scheduler()
+    report_executor.start()
+    snapshot.start()
     print("🚀 Backend ishga tushdi!")
     yield
     # Shutdown
     await stop_scheduler()
+    export_service.shutdown()
+    report_executor.shutdown()
+    snapshot.shutdown()
     print("👋 Backend to'xtatildi!")
 
 
@@ -30,9 +43,25 @@ app = FastAPI(
     title="Oriental Attendance API",
     description="Davomat tizimi uchun API",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Monitoring (RequestContext eng tashqi bo'lishi kerak - oxirida qo'shiladi)
+if settings.METRICS_ENABLED:
+    instrument_engine(engine)
+    if reader_engine is not engine:
+        instrument_engine(reader_engine, "reader")
+    app.add_middleware(MetricsMiddleware)
+if settings.QUERY_BUDGET_ENABLED:
+    query_budget.instrument_engine(engine)
+    if reader_engine is not engine:
+        query_budget.instrument_engine(reader_engine)
+    app.add_middleware(query_budget.QueryBudgetMiddleware)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+app.add_middleware(RequestContextMiddleware)
+
 # CORS sozlamalari
 app.add_middleware(
     CORSMiddleware,
@@ -49,6 +78,7 @@ app.include_router(teacher.router, prefix="/api/teacher", tags=["Teacher"])
 app.include_router(schedule.router, prefix="/api/schedule", tags=["Schedule"])
 app.include_router(attendance.router, prefix="/api/attendance", tags=["Attendance"])
 app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
+app.include_router(internal.router, prefix="/api/internal", tags=["Internal"])
 
 
 @app.get("/")
@@ -63,3 +93,10 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrikalari"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -10,6 +10,10 @@ from app.models.subject import Subject
 from app.models.schedule import Schedule
 from app.models.lesson import Lesson
 from app.models.attendance import Attendance
+from app.models.data_version import DataVersion
+from app.models.archive import LessonArchive, AttendanceArchive
+from app.models.risk import StudentRisk, RiskSnapshot
+from app.models.notification import Notification
 
 __all__ = [
     "User",
@@ -20,5 +24,11 @@ __all__ = [
     "Subject",
     "Schedule",
     "Lesson",
-    "Attendance"
+    "Attendance",
+    "DataVersion",
+    "LessonArchive",
+    "AttendanceArchive",
+    "StudentRisk",
+    "RiskSnapshot",
+    "Notification"
 ]
@@ -0,0 +1,44 @@
+"""
+Archive models - yopilgan semestrlar darslari va davomati (sovuq saqlash)
+
+`lessons` va `attendance` bilan bir xil ustunlar va ID lar; archive_service
+yozuvlarni shu jadvallarga ko'chiradi. Issiq jadvallar va ularning indekslari
+faqat joriy semestr hajmida qoladi.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Date, Text
+
+from app.database import Base
+
+
+class LessonArchive(Base):
+    __tablename__ = "lessons_archive"
+
+    id = Column(Integer, primary_key=True)
+    schedule_id = Column(Integer, nullable=False)
+    date = Column(Date, nullable=False, index=True)
+    status = Column(String(20))
+    opened_at = Column(DateTime, nullable=True)
+    closed_at = Column(DateTime, nullable=True)
+    opened_by = Column(Integer, nullable=True)
+    closed_by = Column(Integer, nullable=True)
+    note = Column(Text, nullable=True)
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<LessonArchive {self.schedule_id} - {self.date}>"
+
+
+class AttendanceArchive(Base):
+    __tablename__ = "attendance_archive"
+
+    id = Column(Integer, primary_key=True)
+    lesson_id = Column(Integer, nullable=False, index=True)
+    student_id = Column(Integer, nullable=False, index=True)
+    status = Column(String(20))
+    marked_at = Column(DateTime)
+    marked_by = Column(String(20))
+    note = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<AttendanceArchive {self.student_id} - {self.lesson_id}>"
@@ -1,7 +1,7 @@
 """
 Attendance model - Davomat yozuvlari
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -24,9 +24,15 @@ class MarkedBy(str, enum.Enum):
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        # Talaba tarixi: keyset pagination (marked_at, id) bo'yicha
+        Index("ix_attendance_student_marked", "student_id", "marked_at"),
+        # Bitta darsga bitta yozuv: bir vaqtdagi ikki bosish ikki qator yarata olmaydi
+        Index("ux_attendance_lesson_student", "lesson_id", "student_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False)
+    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False, index=True)
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
     status = Column(String(20), default=AttendanceStatus.PRESENT.value)
     marked_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,72 @@
+"""
+DataVersion model - ma'lumotlar versiyasi (kesh kalitlari uchun)
+
+Har bir yozish (davomat belgilash, dars o'chirish va h.k.) shu transaksiya
+ichida tegishli nomdagi versiyani oshiradi. Keshlar kalitiga versiya
+qo'shiladi - versiya o'zgarsa eski natija o'z-o'zidan eskiradi.
+
+Umumiy versiyalardan tashqari tor (scoped) versiyalar ham bor: talabaning
+o'z davomati va guruh darslari. Dars paytida umumiy ATTENDANCE har belgida
+oshadi - talaba kesh kaliti faqat o'ziga tegishli o'zgarishda eskirishi uchun.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+
+from app.database import Base
+
+# Davomat yozuvlari va hisobotlarga ta'sir qiluvchi o'zgarishlar
+ATTENDANCE = "attendance"
+# Darslar holati (yopilishi) - "o'tilgan darslar" soniga ta'sir qiladi
+LESSONS = "lessons"
+# O'tgan kunlar davomati (kechagi va undan oldingi darslardagi o'zgarishlar)
+HISTORY = "attendance_history"
+
+
+def student_scope(student_id: int) -> str:
+    """Talabaning o'z davomati (belgilash, tahrirlash)"""
+    return f"{ATTENDANCE}:student:{student_id}"
+
+
+def group_scope(group_id: int) -> str:
+    """Guruh darslari (yopilishi, o'chirilishi)"""
+    return f"{LESSONS}:group:{group_id}"
+
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DataVersion {self.name}={self.version}>"
+
+
+async def bump_data_version(db: AsyncSession, *names: str):
+    """Versiyalarni oshirish - bitta executemany (commit chaqiruvchida)"""
+    if not names:
+        return
+    now = datetime.utcnow()
+    statement = insert(DataVersion).on_conflict_do_update(
+        index_elements=[DataVersion.name],
+        set_={"version": DataVersion.version + 1, "updated_at": now}
+    )
+    await db.execute(statement, [{"name": name, "version": 1, "updated_at": now} for name in names])
+
+
+async def get_data_version(db: AsyncSession, name: str) -> int:
+    """Joriy versiya (hali yozilmagan bo'lsa 0)"""
+    result = await db.execute(select(DataVersion.version).where(DataVersion.name == name))
+    return result.scalar_one_or_none() or 0
+
+
+async def get_data_versions(db: AsyncSession, *names: str) -> tuple:
+    """Bir nechta versiya bitta so'rovda (`names` tartibida)"""
+    result = await db.execute(
+        select(DataVersion.name, DataVersion.version).where(DataVersion.name.in_(names))
+    )
+    versions = dict(result.all())
+    return tuple(versions.get(name, 0) for name in names)
@@ -20,7 +20,7 @@ class Lesson(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     schedule_id = Column(Integer, ForeignKey("schedule.id"), nullable=False)
-    date = Column(Date, nullable=False)
+    date = Column(Date, nullable=False, index=True)
     status = Column(String(20), default=LessonStatus.PENDING.value)
     opened_at = Column(DateTime, nullable=True)
     closed_at = Column(DateTime, nullable=True)
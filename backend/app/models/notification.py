@@ -0,0 +1,36 @@
+"""
+Notification model - bot orqali yuboriladigan xabarlar navbati (outbox)
+
+Dars ochilganda va yopilishiga oz qolganda shu tranzaksiya ichida yozuv
+qo'shiladi; bot ichki API orqali navbatni oladi (lease), talabalarga yuboradi
+va tasdiqlaydi (sent_at). Bitta dars uchun har bir turdagi xabar - bitta.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Index, UniqueConstraint
+from datetime import datetime
+import enum
+
+from app.database import Base
+
+
+class NotificationKind(str, enum.Enum):
+    LESSON_OPENED = "lesson_opened"
+    LESSON_CLOSING = "lesson_closing"
+
+
+class Notification(Base):
+    __tablename__ = "notifications"
+    __table_args__ = (
+        UniqueConstraint("lesson_id", "kind", name="uq_notifications_lesson_kind"),
+        # Navbat: yuborilmaganlar, qo'shilish tartibida
+        Index("ix_notifications_pending", "sent_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(30), nullable=False)
+    lesson_id = Column(Integer, nullable=False)  # Dars o'chirilsa/arxivlansa - muddati o'tgan hisoblanadi
+    created_at = Column(DateTime, default=datetime.utcnow)
+    claimed_until = Column(DateTime, nullable=True)  # Bot yuborayotgan paytda qayta berilmaydi
+    sent_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<Notification {self.kind} lesson={self.lesson_id}>"
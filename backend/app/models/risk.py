@@ -0,0 +1,50 @@
+"""
+Risk models - xavf guruhidagi talabalar (qoldirish darajasi)
+
+StudentRisk - har bir talaba uchun oxirgi RISK_WINDOW_LESSONS ta o'tilgan
+darsning sirpanuvchi oynasi. Dars yopilganda va yopilgan darsga belgi
+qo'yilganda risk_service yangilaydi - butun attendance jadvalini qayta
+hisoblash kerak emas.
+
+RiskSnapshot - kunlik job saqlaydigan xavf ro'yxati (tarix uchun).
+"""
+from sqlalchemy import Column, Integer, Float, Boolean, Date, DateTime, JSON, ForeignKey, Index
+from datetime import datetime
+
+from app.database import Base
+
+
+class StudentRisk(Base):
+    __tablename__ = "student_risk"
+    __table_args__ = (
+        # Ro'yxat (at_risk=1, guruh bo'yicha) - natija hajmiga proporsional
+        Index("ix_student_risk_at_risk_group", "at_risk", "group_id"),
+    )
+
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    group_id = Column(Integer, nullable=True)
+    window = Column(JSON, nullable=False, default=list)  # [[lesson_id, qoldirdi (0/1)], ...] eskisi birinchi
+    lessons = Column(Integer, nullable=False, default=0)
+    absences = Column(Integer, nullable=False, default=0)
+    absence_rate = Column(Float, nullable=False, default=0.0)
+    at_risk = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<StudentRisk {self.student_id} {self.absences}/{self.lessons}>"
+
+
+class RiskSnapshot(Base):
+    __tablename__ = "risk_snapshots"
+
+    id = Column(Integer, primary_key=True)
+    snapshot_date = Column(Date, nullable=False, index=True)
+    student_id = Column(Integer, nullable=False)
+    group_id = Column(Integer, nullable=True)
+    lessons = Column(Integer, nullable=False)
+    absences = Column(Integer, nullable=False)
+    absence_rate = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<RiskSnapshot {self.snapshot_date} {self.student_id}>"
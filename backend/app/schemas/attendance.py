@@ -10,6 +10,12 @@ class AttendanceCreate(BaseModel):
     lesson_id: int
 
 
+class BotAttendanceCreate(BaseModel):
+    """Bot tugmasi orqali (ichki API)"""
+    telegram_id: int
+    lesson_id: int
+
+
 class AttendanceByTeacher(BaseModel):
     student_id: int
     status: str = "present"
@@ -49,6 +55,8 @@ class SubjectStats(BaseModel):
     subject_name: str
     total_lessons: int
     present_count: int
+    late_count: int = 0
+    absent_count: int = 0
     attendance_percentage: float
 
 
@@ -56,7 +64,11 @@ class WeeklyStats(BaseModel):
     """Haftalik statistika"""
     week_start: date
     week_end: date
-    days: List[dict]  # [{date, present, absent}, ...]
+    days: List[dict]  # [{date, present, late, absent, excused}, ...]
+    present: int = 0
+    late: int = 0
+    absent: int = 0
+    excused: int = 0
 
 
 class LessonAttendanceList(BaseModel):
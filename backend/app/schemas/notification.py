@@ -0,0 +1,9 @@
+"""
+Notification schemas - bot ichki API
+"""
+from pydantic import BaseModel
+from typing import List
+
+
+class NotificationAck(BaseModel):
+    ids: List[int]
@@ -0,0 +1,103 @@
+"""
+Row schemas - katta ro'yxat javoblari uchun yengil qatorlar
+
+Pydantic modellar va dictlar `jsonable_encoder` orqali har bir maydonni
+alohida aylantiradi. Bu slots dataclasslarni orjson to'g'ridan-to'g'ri
+(C darajasida) kodlaydi - endpointlar ularni `ORJSONResponse` bilan qaytaradi.
+date/datetime/time qiymatlari isoformat() bilan bir xil ko'rinishda chiqadi.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import List, Optional
+
+
+@dataclass(slots=True)
+class StudentRow:
+    id: int
+    user_id: int
+    full_name: Optional[str]
+    username: Optional[str]
+    student_id: Optional[str]
+    group_name: Optional[str]
+    direction_name: Optional[str]
+    created_at: Optional[datetime]
+
+
+@dataclass(slots=True)
+class AttendanceReportRow:
+    id: int
+    student_name: Optional[str]
+    student_id: Optional[str]
+    group_name: Optional[str]
+    subject_name: Optional[str]
+    date: Optional[date]
+    status: str
+    marked_at: Optional[datetime]
+
+
+@dataclass(slots=True)
+class HistoryRow:
+    id: int
+    date: Optional[date]
+    subject_id: Optional[int]
+    subject_name: Optional[str]
+    status: str
+    marked_at: Optional[datetime]
+
+
+@dataclass(slots=True)
+class LessonStudentRow:
+    student_id: int
+    student_code: Optional[str]
+    full_name: Optional[str]
+    status: str
+    marked_at: Optional[datetime]
+
+
+@dataclass(slots=True)
+class ScheduleRow:
+    id: int
+    group_id: int
+    subject_id: int
+    teacher_id: Optional[int]
+    day_of_week: int
+    start_time: time
+    end_time: time
+    room: Optional[str]
+    is_active: bool
+    subject_name: Optional[str] = None
+    teacher_name: Optional[str] = None
+    group_name: Optional[str] = None
+
+
+@dataclass(slots=True)
+class WeekScheduleRow:
+    day_of_week: int
+    day_name: str
+    lessons: List[ScheduleRow]
+
+
+@dataclass(slots=True)
+class RiskRow:
+    student_id: int
+    full_name: Optional[str]
+    student_number: Optional[str]
+    group_id: Optional[int]
+    group_name: Optional[str]
+    lessons: int
+    absences: int
+    absence_rate: float
+
+
+@dataclass(slots=True)
+class NotificationRow:
+    id: int
+    kind: str
+    lesson_id: int
+    date: date
+    subject_name: Optional[str]
+    group_name: Optional[str]
+    room: Optional[str]
+    start_time: time
+    end_time: time
+    chat_ids: List[int]
@@ -0,0 +1,112 @@
+"""
+Archive Service - yopilgan semestrlarni sovuq jadvallarga ko'chirish
+
+Joriy semestr boshlanishidan (SEMESTER_START_MONTHS) oldingi darslar va
+ularning davomati `lessons_archive` / `attendance_archive` ga ko'chiriladi.
+
+Ko'chirish kichik bo'laklarda (ARCHIVE_BATCH_SIZE ta dars) - har bir bo'lak
+alohida qisqa tranzaksiya, orada ARCHIVE_PAUSE_SECONDS pauza. SQLite da bitta
+yozuvchi bo'lgani uchun bu davomat belgilash so'rovlarini uzoq kuttirmaydi.
+"""
+from sqlalchemy import select, insert, delete, func, literal
+from datetime import date, datetime
+from typing import Optional
+import asyncio
+import time
+
+from app.config import settings
+from app.database import async_session, read_session
+from app.models.lesson import Lesson
+from app.models.schedule import Schedule
+from app.models.attendance import Attendance
+from app.models.archive import LessonArchive, AttendanceArchive
+from app.models.data_version import bump_data_version, group_scope, ATTENDANCE, HISTORY
+
+LESSON_COLUMNS = [
+    "id", "schedule_id", "date", "status", "opened_at", "closed_at",
+    "opened_by", "closed_by", "note", "created_at"
+]
+ATTENDANCE_COLUMNS = ["id", "lesson_id", "student_id", "status", "marked_at", "marked_by", "note"]
+
+
+def semester_start(today: date) -> date:
+    """`today` tushadigan semestr boshlanishi (SEMESTER_START_MONTHS dan)"""
+    months = sorted(int(m) for m in settings.SEMESTER_START_MONTHS.split(",") if m.strip())
+    starts = [date(year, month, 1) for year in (today.year - 1, today.year) for month in months]
+    return max(start for start in starts if start <= today)
+
+
+async def archive_closed_semesters(before: Optional[date] = None) -> dict:
+    """`before` dan oldingi darslarni arxivga ko'chirish (standart - joriy semestr boshi)"""
+    before = before or semester_start(date.today())
+    started = time.perf_counter()
+    lessons_moved = 0
+    attendance_moved = 0
+    batches = 0
+
+    while True:
+        async with async_session() as db:
+            result = await db.execute(
+                select(Lesson.id)
+                .where(Lesson.date < before)
+                .order_by(Lesson.id)
+                .limit(settings.ARCHIVE_BATCH_SIZE)
+            )
+            lesson_ids = result.scalars().all()
+            if not lesson_ids:
+                break
+
+            now = datetime.now()
+            groups = await db.execute(
+                select(Schedule.group_id).distinct()
+                .join(Lesson, Lesson.schedule_id == Schedule.id)
+                .where(Lesson.id.in_(lesson_ids))
+            )
+            groups = groups.scalars().all()
+            await db.execute(
+                insert(LessonArchive).from_select(
+                    LESSON_COLUMNS + ["archived_at"],
+                    select(*[Lesson.__table__.c[name] for name in LESSON_COLUMNS], literal(now))
+                    .where(Lesson.id.in_(lesson_ids))
+                )
+            )
+            result = await db.execute(
+                insert(AttendanceArchive).from_select(
+                    ATTENDANCE_COLUMNS,
+                    select(*[Attendance.__table__.c[name] for name in ATTENDANCE_COLUMNS])
+                    .where(Attendance.lesson_id.in_(lesson_ids))
+                )
+            )
+            attendance_moved += result.rowcount
+            await db.execute(delete(Attendance).where(Attendance.lesson_id.in_(lesson_ids)))
+            await db.execute(delete(Lesson).where(Lesson.id.in_(lesson_ids)))
+            await bump_data_version(db, ATTENDANCE, HISTORY, *map(group_scope, groups))
+            await db.commit()
+
+        lessons_moved += len(lesson_ids)
+        batches += 1
+        # Yozuvchi qulfini boshqa so'rovlarga bo'shatish
+        await asyncio.sleep(settings.ARCHIVE_PAUSE_SECONDS)
+
+    summary = {
+        "before": before.isoformat(),
+        "lessons": lessons_moved,
+        "attendance": attendance_moved,
+        "batches": batches,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+    if lessons_moved:
+        print(f"🗄 Arxivlandi: {lessons_moved} dars, {attendance_moved} davomat ({before} dan oldingi)")
+    return summary
+
+
+async def archive_stats() -> dict:
+    """Issiq va arxiv jadvallardagi yozuvlar soni"""
+    async with read_session() as db:
+        return {
+            "semester_start": semester_start(date.today()).isoformat(),
+            "hot_lessons": await db.scalar(select(func.count(Lesson.id))) or 0,
+            "hot_attendance": await db.scalar(select(func.count(Attendance.id))) or 0,
+            "archived_lessons": await db.scalar(select(func.count(LessonArchive.id))) or 0,
+            "archived_attendance": await db.scalar(select(func.count(AttendanceArchive.id))) or 0
+        }
@@ -0,0 +1,122 @@
+"""
+Attendance Service - talabaning o'zi davomat qilishi
+
+Mini App (/api/attendance/mark) va bot tugmasi (/api/internal/attendance/mark)
+bir xil tekshiruvlardan o'tadi - faqat talabani topish usuli farq qiladi.
+"""
+from sqlalchemy import select, and_
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.config import settings
+from app.models.student import Student
+from app.models.lesson import Lesson, LessonStatus
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.data_version import bump_data_version, student_scope, ATTENDANCE
+from app.schemas.attendance import MarkAttendanceResponse
+
+
+async def mark_self(db: AsyncSession, student: Optional[Student], lesson_id: int) -> MarkAttendanceResponse:
+    """Ochiq darsga davomat qilish (kech kelish - darsdan 15 daqiqa keyin)"""
+    if not student:
+        return MarkAttendanceResponse(
+            success=False,
+            message="Siz talaba sifatida ro'yxatdan o'tmagansiz"
+        )
+    
+    # Darsni olish (jadval bilan bitta so'rovda)
+    result = await db.execute(
+        select(Lesson)
+        .options(joinedload(Lesson.schedule))
+        .where(Lesson.id == lesson_id)
+    )
+    lesson = result.scalar_one_or_none()
+    
+    if not lesson:
+        return MarkAttendanceResponse(
+            success=False,
+            message="Dars topilmadi"
+        )
+    
+    # Tekshiruvlar
+    if lesson.status != LessonStatus.OPEN.value:
+        return MarkAttendanceResponse(
+            success=False,
+            message="Dars hali ochilmagan yoki yopilgan"
+        )
+    
+    if lesson.schedule.group_id != student.group_id:
+        return MarkAttendanceResponse(
+            success=False,
+            message="Bu dars sizning guruhingiz uchun emas"
+        )
+    
+    # Mavjud davomat tekshirish
+    result = await db.execute(
+        select(Attendance.id).where(
+            and_(
+                Attendance.lesson_id == lesson.id,
+                Attendance.student_id == student.id
+            )
+        )
+    )
+    if result.first():
+        return MarkAttendanceResponse(
+            success=False,
+            message="Siz allaqachon davomat qilgansiz"
+        )
+    
+    # Vaqt tekshirish
+    now = datetime.now()
+    lesson_start = datetime.combine(lesson.date, lesson.schedule.start_time)
+    close_time = lesson_start + timedelta(minutes=settings.LESSON_CLOSE_AFTER_MINUTES)
+    
+    if now > close_time:
+        return MarkAttendanceResponse(
+            success=False,
+            message="Davomat vaqti tugagan"
+        )
+    
+    # Kech kelganlik tekshirish
+    late_threshold = lesson_start + timedelta(minutes=15)
+    status = AttendanceStatus.LATE.value if now > late_threshold else AttendanceStatus.PRESENT.value
+    
+    # Davomat yaratish - tekshiruv va yozish orasida parallel bosish (tugmani ikki marta
+    # bosish) ham o'tishi mumkin, shuning uchun takror UNIQUE(lesson_id, student_id) da to'xtaydi
+    result = await db.execute(
+        insert(Attendance)
+        .values(
+            lesson_id=lesson.id,
+            student_id=student.id,
+            status=status,
+            marked_by="self"
+        )
+        .on_conflict_do_nothing(index_elements=["lesson_id", "student_id"])
+        .returning(Attendance)
+    )
+    attendance = result.scalar_one_or_none()
+    if attendance is None:
+        await db.rollback()
+        return MarkAttendanceResponse(
+            success=False,
+            message="Siz allaqachon davomat qilgansiz"
+        )
+    await bump_data_version(db, ATTENDANCE, student_scope(student.id))
+    await db.commit()
+    
+    return MarkAttendanceResponse(
+        success=True,
+        message="Davomat muvaffaqiyatli belgilandi!" if status == "present" else "Davomat belgilandi (kech kelish)",
+        attendance={
+            "id": attendance.id,
+            "lesson_id": attendance.lesson_id,
+            "student_id": attendance.student_id,
+            "status": attendance.status,
+            "marked_at": attendance.marked_at,
+            "marked_by": attendance.marked_by,
+            "note": attendance.note
+        }
+    )
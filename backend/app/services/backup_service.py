@@ -0,0 +1,250 @@
+"""
+Backup Service - ishlab turgan bazadan onlayn (hot) backup
+
+SQLite backup API (`sqlite3.Connection.backup`) bazani BACKUP_PAGES_PER_STEP
+sahifalik qadamlarda nusxalaydi va qadamlar orasida BACKUP_STEP_SLEEP_MS
+uxlaydi. WAL rejimida har bir qadam faqat qisqa o'qish tranzaksiyasi -
+davomat belgilash (yozuvchi) bloklanmaydi. Nusxalash davomida boshqa ulanish
+bazaga yozsa, SQLite nusxalashni boshidan boshlaydi (progress orqaga ketadi).
+Yozuvlar ko'p bo'lsa bu cheksiz davom etishi mumkin - shuning uchun
+BACKUP_MAX_RESTARTS marta qayta boshlansa yoki BACKUP_MAX_SECONDS o'tsa,
+nusxa bitta qadamda (pages=-1, bitta o'qish tranzaksiyasi) olinadi.
+
+Natija gzip bilan siqiladi, tiklab tekshiriladi (PRAGMA integrity_check)
+va eng yangi BACKUP_KEEP tasi saqlanadi. Hammasi alohida threadda.
+"""
+from datetime import datetime
+from functools import partial
+from typing import List, Optional
+import asyncio
+import gzip
+import os
+import re
+import shutil
+import sqlite3
+import time
+
+from app.config import settings
+from app.database import DATABASE_PATH
+from app.services.metrics_service import (
+    backup_duration, backup_progress, backup_size, backup_last_success, backup_failures,
+    backup_fallbacks
+)
+
+BACKUP_NAME_RE = re.compile(r"^attendance-[0-9]{8}-[0-9]{6}\.db\.gz$")
+VERIFY_TABLES = ("users", "students", "lessons", "attendance")
+
+
+class BackupInProgress(Exception):
+    """Backup allaqachon bajarilmoqda"""
+
+
+class BackupStepLimit(Exception):
+    """Pog'onali nusxa qayta boshlanishlar yoki vaqt chegarasidan oshdi"""
+
+
+# Joriy / oxirgi backup holati (admin API uchun)
+state = {
+    "running": False,
+    "pages_total": None,
+    "pages_done": None,
+    "restarts": 0,
+    "fallback": None,
+    "started_at": None,
+    "last": None
+}
+
+
+def _observe(step: str, started: float, timings: dict):
+    elapsed = time.perf_counter() - started
+    timings[step] = round(elapsed * 1000, 1)
+    if settings.METRICS_ENABLED:
+        backup_duration.labels(step).observe(elapsed)
+
+
+def _on_progress(deadline: float, status, remaining, total):
+    done = total - remaining
+    if state["pages_done"] is not None and done <= state["pages_done"]:
+        # Manba o'zgardi - SQLite boshidan boshladi (har qadamda yozilsa, o'sha sahifada qoladi)
+        state["restarts"] += 1
+    state["pages_total"] = total
+    state["pages_done"] = done
+    if settings.METRICS_ENABLED and total:
+        backup_progress.set(done / total)
+    # Istisno backup ni to'xtatadi (sqlite3 uni chaqiruvchiga qaytaradi)
+    if state["restarts"] > settings.BACKUP_MAX_RESTARTS:
+        raise BackupStepLimit(f"{state['restarts']} marta boshidan boshlandi")
+    if remaining and time.monotonic() > deadline:
+        raise BackupStepLimit(f"{settings.BACKUP_MAX_SECONDS} s da tugamadi")
+
+
+def _copy(raw_path: str):
+    """
+    Onlayn nusxa. Pog'onali nusxa cheklovdan oshsa - bitta qadamda:
+    butun baza bitta o'qish tranzaksiyasida nusxalanadi, boshidan boshlanmaydi
+    (WAL da yozuvchilar bloklanmaydi, faqat checkpoint shu vaqtgacha kutadi).
+    """
+    source = sqlite3.connect(DATABASE_PATH, timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000)
+    target = sqlite3.connect(raw_path)
+    try:
+        try:
+            source.backup(
+                target,
+                pages=settings.BACKUP_PAGES_PER_STEP,
+                progress=partial(_on_progress, time.monotonic() + settings.BACKUP_MAX_SECONDS),
+                sleep=settings.BACKUP_STEP_SLEEP_MS / 1000
+            )
+            return
+        except BackupStepLimit as e:
+            state["fallback"] = str(e)
+        print(f"⚠️ Backup: {state['fallback']} - bitta qadamda nusxalanadi")
+        if settings.METRICS_ENABLED:
+            backup_fallbacks.inc()
+        source.backup(target, pages=-1)
+        state["pages_done"] = state["pages_total"]
+    finally:
+        target.close()
+        source.close()
+
+
+def verify_backup(path: str) -> dict:
+    """Backupni vaqtinchalik faylga tiklab, yaxlitligini tekshirish"""
+    restored = f"{path}.verify"
+    try:
+        with gzip.open(path, "rb") as src, open(restored, "wb") as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        conn = sqlite3.connect(restored)
+        try:
+            integrity = conn.execute("PRAGMA integrity_check").fetchone()[0]
+            counts = {
+                table: conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+                for table in VERIFY_TABLES
+            }
+        finally:
+            conn.close()
+    finally:
+        if os.path.exists(restored):
+            os.remove(restored)
+    return {"ok": integrity == "ok", "integrity": integrity, "counts": counts}
+
+
+def _backup_sync() -> dict:
+    os.makedirs(settings.BACKUP_DIR, exist_ok=True)
+    name = f"attendance-{datetime.now().strftime('%Y%m%d-%H%M%S')}.db.gz"
+    path = os.path.join(settings.BACKUP_DIR, name)
+    raw_path = os.path.join(settings.BACKUP_DIR, f".{name[:-3]}.tmp")
+    timings = {}
+
+    try:
+        # 1. Onlayn nusxa (sahifa qadamlari bilan)
+        started = time.perf_counter()
+        _copy(raw_path)
+        _observe("copy", started, timings)
+
+        # 2. Siqish (yarim yozilgan fayl ko'rinmasligi uchun .tmp -> rename)
+        started = time.perf_counter()
+        with open(raw_path, "rb") as src, gzip.open(f"{path}.tmp", "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.replace(f"{path}.tmp", path)
+        _observe("compress", started, timings)
+    finally:
+        for leftover in (raw_path, f"{path}.tmp"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+    # 3. Tiklab tekshirish
+    verify = None
+    if settings.BACKUP_VERIFY:
+        started = time.perf_counter()
+        verify = verify_backup(path)
+        _observe("verify", started, timings)
+        if not verify["ok"]:
+            os.remove(path)
+            raise RuntimeError(f"Backup tekshiruvdan o'tmadi: {verify['integrity']}")
+
+    removed = _apply_retention()
+    return {
+        "name": name,
+        "size": os.path.getsize(path),
+        "database_size": os.path.getsize(DATABASE_PATH),
+        "pages": state["pages_total"],
+        "restarts": state["restarts"],
+        "fallback": state["fallback"],
+        "timings_ms": timings,
+        "verify": verify,
+        "removed": removed
+    }
+
+
+def _apply_retention() -> List[str]:
+    """Eng yangi BACKUP_KEEP tadan boshqalarini o'chirish"""
+    removed = []
+    for backup in list_backups()[settings.BACKUP_KEEP:]:
+        os.remove(os.path.join(settings.BACKUP_DIR, backup["name"]))
+        removed.append(backup["name"])
+    return removed
+
+
+def list_backups() -> List[dict]:
+    """Saqlangan backuplar (yangilari birinchi)"""
+    if not os.path.isdir(settings.BACKUP_DIR):
+        return []
+    backups = []
+    for name in os.listdir(settings.BACKUP_DIR):
+        if not BACKUP_NAME_RE.match(name):
+            continue
+        stat = os.stat(os.path.join(settings.BACKUP_DIR, name))
+        backups.append({
+            "name": name,
+            "size": stat.st_size,
+            "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds")
+        })
+    backups.sort(key=lambda b: b["name"], reverse=True)
+    return backups
+
+
+def backup_path(name: str) -> Optional[str]:
+    """Backup fayli yo'li (noto'g'ri nom bo'lsa None)"""
+    if not BACKUP_NAME_RE.match(name):
+        return None
+    path = os.path.join(settings.BACKUP_DIR, name)
+    return path if os.path.exists(path) else None
+
+
+async def run_backup() -> dict:
+    """Backup yaratish (bir vaqtda bittadan)"""
+    if DATABASE_PATH is None:
+        return {"skipped": "SQLite fayl emas"}
+    if state["running"]:
+        raise BackupInProgress()
+
+    state.update(running=True, pages_total=None, pages_done=None, restarts=0, fallback=None,
+                 started_at=datetime.now().isoformat(timespec="seconds"))
+    started = time.perf_counter()
+    try:
+        result = await asyncio.to_thread(_backup_sync)
+    except Exception as e:
+        if settings.METRICS_ENABLED:
+            backup_failures.inc()
+        state["last"] = {
+            "ok": False,
+            "error": str(e),
+            "restarts": state["restarts"],
+            "fallback": state["fallback"],
+            "finished_at": datetime.now().isoformat(timespec="seconds")
+        }
+        print(f"❌ Backup xatosi: {e}")
+        raise
+    finally:
+        state["running"] = False
+
+    result["ok"] = True
+    result["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    result["finished_at"] = datetime.now().isoformat(timespec="seconds")
+    state["last"] = result
+    if settings.METRICS_ENABLED:
+        backup_size.set(result["size"])
+        backup_last_success.set_to_current_time()
+        backup_progress.set(1)
+    print(f"💾 Backup tayyor: {result['name']} ({result['size'] // 1024} KB, {result['duration_ms']:.0f} ms)")
+    return result
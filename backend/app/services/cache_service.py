@@ -0,0 +1,67 @@
+"""
+Cache Service - jarayon ichidagi LRU keshlar
+
+Kalitga ma'lumotlar versiyasi (DataVersion) qo'shiladi: yozish versiyani
+oshirgach eski yozuvlarga endi murojaat bo'lmaydi va ular LRU tartibida
+chiqib ketadi. Shuning uchun alohida invalidatsiya kerak emas.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Hajmi cheklangan kesh (hit/miss hisoblagichlari bilan)"""
+
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.maxsize = maxsize
+        self.data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None):
+        value = self.data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        self.data[key] = value
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def clear(self):
+        self.data.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self.data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else None
+        }
+
+
+caches: Dict[str, LRUCache] = {}
+
+
+def get_cache(name: str, maxsize: int) -> LRUCache:
+    """Nomlangan keshni olish (birinchi chaqiruvda yaratiladi)"""
+    cache = caches.get(name)
+    if cache is None:
+        cache = caches[name] = LRUCache(name, maxsize)
+    return cache
+
+
+def all_stats() -> dict:
+    return {name: cache.stats() for name, cache in caches.items()}
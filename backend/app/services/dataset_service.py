@@ -0,0 +1,403 @@
+"""
+Dataset Service - Benchmark va query-plan testlari uchun sintetik ma'lumotlar
+
+Deterministik (seed asosida) generator: yo'nalishlar, guruhlar, talabalar,
+o'qituvchilar, haftalik jadval, butun semestr darslari va davomat.
+Yozish ORM orqali emas, to'g'ridan-to'g'ri DBAPI `executemany` bilan
+bo'laklab qilinadi - 10M davomat yozuvi bir necha daqiqada tayyor bo'ladi.
+
+Ishlatish:
+    python -m app.services.dataset_service --groups-per-course 10 --students-per-group 30
+"""
+import argparse
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import create_engine, make_url, text
+
+from app.config import settings
+from app.database import Base
+
+BATCH_SIZE = 50_000
+
+DIRECTION_NAMES = [
+    ("Axborot texnologiyalari", "IT"),
+    ("Iqtisodiyot", "IQ"),
+    ("Huquqshunoslik", "HU"),
+    ("Pedagogika", "PED"),
+    ("Psixologiya", "PSI"),
+    ("Filologiya", "FIL"),
+    ("Menejment", "MEN"),
+    ("Moliya", "MOL"),
+    ("Turizm", "TUR"),
+    ("Arxitektura", "ARX"),
+]
+
+SUBJECT_NAMES = [
+    ("Matematika", "MAT"),
+    ("Fizika", "FIZ"),
+    ("Informatika", "INF"),
+    ("Ingliz tili", "ENG"),
+    ("O'zbek tili", "UZB"),
+    ("Tarix", "TAR"),
+    ("Falsafa", "FAL"),
+    ("Iqtisodiyot nazariyasi", "IQN"),
+    ("Statistika", "STA"),
+    ("Dasturlash", "DAS"),
+    ("Ma'lumotlar bazasi", "MBZ"),
+    ("Rus tili", "RUS"),
+]
+
+# Juftliklar boshlanish vaqtlari (80 daqiqalik)
+SLOT_TIMES = [dtime(8, 30), dtime(10, 0), dtime(11, 30), dtime(13, 30), dtime(15, 0), dtime(16, 30)]
+LESSON_DURATION = timedelta(minutes=80)
+
+
+@dataclass
+class DatasetConfig:
+    """Generator sozlamalari"""
+    seed: int = 42
+    directions: int = 6
+    courses: int = 4
+    groups_per_course: int = 3
+    students_per_group: int = 25
+    teachers: int = 60
+    subjects: int = 12
+    lessons_per_day: int = 3
+    study_days: int = 6  # Dush-Shan
+    semester_start: date = field(default_factory=lambda: date(2025, 9, 1))
+    weeks: int = 16
+    # Davomat aralashmasi (talaba uchun o'rtacha): qolgani - qatnashgan
+    late_rate: float = 0.08
+    absent_rate: float = 0.10
+    excused_rate: float = 0.02
+    # Yo'q bo'lgan talabalarning qancha qismini o'qituvchi "absent" deb belgilaydi
+    absent_marked_rate: float = 0.7
+    # `today` dan keyingi darslar PENDING bo'lib qoladi. Standart - ishga tushirilgan
+    # kun emas, semestr o'rtasi (semester_start + weeks // 2 hafta), shunda natija
+    # sanaga bog'liq bo'lmaydi. "Bugun" kerak bo'lsa (benchmark, testlar) - aniq beriladi
+    today: Optional[date] = None
+
+    def reference_day(self) -> date:
+        return self.today or self.semester_start + timedelta(weeks=self.weeks // 2)
+
+
+@dataclass
+class DatasetSummary:
+    """Generatsiya natijasi"""
+    directions: int = 0
+    groups: int = 0
+    users: int = 0
+    students: int = 0
+    teachers: int = 0
+    subjects: int = 0
+    schedules: int = 0
+    lessons: int = 0
+    attendance: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__dataclass_fields__}
+
+
+def _fmt_date(value: date) -> str:
+    return value.isoformat()
+
+
+def _fmt_time(value: dtime) -> str:
+    # SQLAlchemy SQLite TIME formati
+    return value.strftime("%H:%M:%S.%f")
+
+
+def _fmt_datetime(value: datetime) -> str:
+    # SQLAlchemy SQLite DATETIME formati
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _sync_url(database_url: str) -> str:
+    """Async URL ni sinxron drayverga o'tkazish (sqlite+aiosqlite -> sqlite)"""
+    url = make_url(database_url)
+    if url.drivername.startswith("sqlite"):
+        url = url.set(drivername="sqlite")
+    return url.render_as_string(hide_password=False)
+
+
+class _BulkWriter:
+    """Jadval bo'yicha bo'laklab executemany qiluvchi yozuvchi"""
+
+    def __init__(self, cursor, table: str, columns: Sequence[str], batch_size: int = BATCH_SIZE):
+        self.cursor = cursor
+        self.sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+        self.batch_size = batch_size
+        self.rows: List[tuple] = []
+        self.count = 0
+
+    def add(self, row: tuple):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def extend(self, rows: Iterable[tuple]):
+        for row in rows:
+            self.add(row)
+
+    def flush(self):
+        if self.rows:
+            self.cursor.executemany(self.sql, self.rows)
+            self.count += len(self.rows)
+            self.rows = []
+
+
+def generate_dataset(
+    config: Optional[DatasetConfig] = None,
+    database_url: Optional[str] = None,
+    reset: bool = False,
+) -> DatasetSummary:
+    """
+    Bazani sintetik ma'lumotlar bilan to'ldirish.
+
+    Bir xil `config` (va seed) har doim bir xil ma'lumot beradi.
+    Baza bo'sh bo'lishi kerak, aks holda `reset=True` berilsin.
+    """
+    config = config or DatasetConfig()
+    rng = random.Random(config.seed)
+    started = time.perf_counter()
+    summary = DatasetSummary()
+
+    # Barcha modellarni ro'yxatga olish
+    from app import models  # noqa: F401
+
+    sync_engine = create_engine(_sync_url(database_url or settings.DATABASE_URL))
+    if reset:
+        Base.metadata.drop_all(sync_engine)
+    Base.metadata.create_all(sync_engine)
+
+    with sync_engine.connect() as conn:
+        if conn.execute(text("SELECT COUNT(*) FROM users")).scalar():
+            raise RuntimeError("Baza bo'sh emas - reset=True bilan chaqiring")
+        if conn.execute(text("SELECT COUNT(*) FROM directions")).scalar():
+            # seed_default_data qo'shgan yozuvlar
+            conn.execute(text("DELETE FROM subjects"))
+            conn.execute(text("DELETE FROM directions"))
+            conn.commit()
+
+    raw = sync_engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        # Yuklash paytida jurnal va fsync ni o'chirib turamiz
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("PRAGMA journal_mode = MEMORY")
+        cursor.execute("PRAGMA cache_size = -200000")
+
+        created = _fmt_datetime(datetime.combine(config.semester_start, dtime(0, 0)) - timedelta(days=7))
+        today = config.reference_day()
+
+        # Yo'nalishlar
+        directions = _BulkWriter(cursor, "directions", ("id", "name", "short_name", "created_at"))
+        for i in range(config.directions):
+            base_name, short = DIRECTION_NAMES[i % len(DIRECTION_NAMES)]
+            suffix = f" {i // len(DIRECTION_NAMES) + 1}" if i >= len(DIRECTION_NAMES) else ""
+            directions.add((i + 1, base_name + suffix, f"{short}{suffix.strip()}", created))
+        directions.flush()
+        summary.directions = directions.count
+
+        # Fanlar
+        subjects = _BulkWriter(cursor, "subjects", ("id", "name", "short_name", "created_at"))
+        for i in range(config.subjects):
+            base_name, short = SUBJECT_NAMES[i % len(SUBJECT_NAMES)]
+            suffix = f" {i // len(SUBJECT_NAMES) + 1}" if i >= len(SUBJECT_NAMES) else ""
+            subjects.add((i + 1, base_name + suffix, f"{short}{suffix.strip()}", created))
+        subjects.flush()
+        summary.subjects = subjects.count
+
+        # Guruhlar
+        groups = _BulkWriter(cursor, "groups", ("id", "name", "direction_id", "course", "created_at"))
+        group_ids: List[int] = []
+        group_id = 0
+        for direction_id in range(1, config.directions + 1):
+            short = DIRECTION_NAMES[(direction_id - 1) % len(DIRECTION_NAMES)][1]
+            for course in range(1, config.courses + 1):
+                for n in range(1, config.groups_per_course + 1):
+                    group_id += 1
+                    groups.add((group_id, f"{short}-{course}{n:02d}-{direction_id}", direction_id, course, created))
+                    group_ids.append(group_id)
+        groups.flush()
+        summary.groups = groups.count
+
+        users = _BulkWriter(cursor, "users", (
+            "id", "telegram_id", "full_name", "username", "role", "is_active", "created_at", "updated_at"
+        ))
+        teachers = _BulkWriter(cursor, "teachers", ("id", "user_id", "employee_id", "department", "created_at"))
+        students = _BulkWriter(cursor, "students", ("id", "user_id", "student_id", "group_id", "created_at"))
+
+        # O'qituvchilar
+        user_id = 0
+        for teacher_id in range(1, config.teachers + 1):
+            user_id += 1
+            users.add((user_id, 1_000_000_000 + user_id, f"O'qituvchi {teacher_id}",
+                       f"teacher{teacher_id}", "teacher", 1, created, created))
+            teachers.add((teacher_id, user_id, f"T-{teacher_id:05d}", f"Kafedra {teacher_id % 8 + 1}", created))
+
+        # Talabalar: har biriga o'z "qatnashmaslik" moyilligi beriladi
+        group_students: dict = {}
+        student_absent_rate: dict = {}
+        student_id = 0
+        mean_absent = config.absent_rate + config.excused_rate
+        for gid in group_ids:
+            members = []
+            for _ in range(config.students_per_group):
+                student_id += 1
+                user_id += 1
+                users.add((user_id, 1_000_000_000 + user_id, f"Talaba {student_id}",
+                           f"student{student_id}", "student", 1, created, created))
+                students.add((student_id, user_id, f"S{config.semester_start.year}{student_id:07d}", gid, created))
+                members.append(student_id)
+                # Beta taqsimot: ko'pchilik yaxshi qatnashadi, ozchilik surunkali qoldiradi
+                if mean_absent > 0:
+                    concentration = 12.0
+                    student_absent_rate[student_id] = rng.betavariate(
+                        mean_absent * concentration, (1 - mean_absent) * concentration
+                    )
+                else:
+                    student_absent_rate[student_id] = 0.0
+            group_students[gid] = members
+        users.flush()
+        teachers.flush()
+        students.flush()
+        summary.users = users.count
+        summary.teachers = teachers.count
+        summary.students = students.count
+
+        # Haftalik jadval
+        schedule = _BulkWriter(cursor, "schedule", (
+            "id", "group_id", "subject_id", "teacher_id", "day_of_week",
+            "start_time", "end_time", "room", "is_active", "created_at"
+        ))
+        schedules: List[Tuple[int, int, int, dtime]] = []  # (id, group_id, day, start)
+        schedule_id = 0
+        slots = SLOT_TIMES[:max(1, min(config.lessons_per_day, len(SLOT_TIMES)))]
+        for gid in group_ids:
+            for day in range(config.study_days):
+                for start in slots:
+                    schedule_id += 1
+                    end = (datetime.combine(config.semester_start, start) + LESSON_DURATION).time()
+                    schedule.add((
+                        schedule_id, gid, rng.randint(1, config.subjects), rng.randint(1, config.teachers),
+                        day, _fmt_time(start), _fmt_time(end), f"{rng.randint(1, 5)}{rng.randint(1, 30):02d}",
+                        1, created
+                    ))
+                    schedules.append((schedule_id, gid, day, start))
+        schedule.flush()
+        summary.schedules = schedule.count
+
+        # Darslar va davomat - hafta bo'yicha, xotirani tejash uchun oqim bilan
+        lessons = _BulkWriter(cursor, "lessons", (
+            "id", "schedule_id", "date", "status", "opened_at", "closed_at", "created_at"
+        ))
+        attendance = _BulkWriter(cursor, "attendance", (
+            "id", "lesson_id", "student_id", "status", "marked_at", "marked_by"
+        ))
+        week_start = config.semester_start - timedelta(days=config.semester_start.weekday())
+        close_after = timedelta(minutes=settings.LESSON_CLOSE_AFTER_MINUTES)
+        lesson_id = 0
+        attendance_id = 0
+        for week in range(config.weeks):
+            monday = week_start + timedelta(weeks=week)
+            for sid, gid, day, start in schedules:
+                lesson_date = monday + timedelta(days=day)
+                if lesson_date < config.semester_start:
+                    continue
+                lesson_id += 1
+                lesson_start = datetime.combine(lesson_date, start)
+                if lesson_date >= today:
+                    lessons.add((lesson_id, sid, _fmt_date(lesson_date), "pending", None, None,
+                                 _fmt_datetime(lesson_start)))
+                    continue
+
+                opened_at = lesson_start - timedelta(minutes=settings.LESSON_OPEN_BEFORE_MINUTES)
+                lessons.add((lesson_id, sid, _fmt_date(lesson_date), "closed",
+                             _fmt_datetime(opened_at), _fmt_datetime(lesson_start + close_after),
+                             _fmt_datetime(opened_at)))
+
+                for st_id in group_students[gid]:
+                    absent_rate = student_absent_rate[st_id]
+                    r = rng.random()
+                    if r < absent_rate:
+                        # Sababli yoki sababsiz yo'q
+                        if rng.random() < config.excused_rate / mean_absent:
+                            status, marked_by = "excused", "teacher"
+                        elif rng.random() < config.absent_marked_rate:
+                            status, marked_by = "absent", "teacher"
+                        else:
+                            continue  # belgilanmagan - yozuv yo'q
+                        marked_at = lesson_start + timedelta(minutes=rng.randint(40, 90))
+                    elif r < absent_rate + config.late_rate:
+                        status, marked_by = "late", "self"
+                        marked_at = lesson_start + timedelta(minutes=rng.randint(16, 44), seconds=rng.randint(0, 59))
+                    else:
+                        status, marked_by = "present", "self"
+                        marked_at = opened_at + timedelta(minutes=rng.randint(0, 19), seconds=rng.randint(0, 59))
+                    attendance_id += 1
+                    attendance.add((attendance_id, lesson_id, st_id, status, _fmt_datetime(marked_at), marked_by))
+
+        lessons.flush()
+        attendance.flush()
+        summary.lessons = lessons.count
+        summary.attendance = attendance.count
+
+        raw.commit()
+        cursor.execute("PRAGMA synchronous = FULL")
+        cursor.execute("ANALYZE")
+        raw.commit()
+    finally:
+        raw.close()
+        sync_engine.dispose()
+
+    summary.seconds = round(time.perf_counter() - started, 2)
+    return summary
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Sintetik davomat ma'lumotlarini yaratish")
+    defaults = DatasetConfig()
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--reset", action="store_true", help="Mavjud jadvallarni o'chirib qayta yaratish")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--directions", type=int, default=defaults.directions)
+    parser.add_argument("--courses", type=int, default=defaults.courses)
+    parser.add_argument("--groups-per-course", type=int, default=defaults.groups_per_course)
+    parser.add_argument("--students-per-group", type=int, default=defaults.students_per_group)
+    parser.add_argument("--teachers", type=int, default=defaults.teachers)
+    parser.add_argument("--subjects", type=int, default=defaults.subjects)
+    parser.add_argument("--lessons-per-day", type=int, default=defaults.lessons_per_day)
+    parser.add_argument("--weeks", type=int, default=defaults.weeks)
+    parser.add_argument("--semester-start", type=date.fromisoformat, default=defaults.semester_start)
+    parser.add_argument("--today", type=date.fromisoformat, default=None,
+                        help="Shu kundan boshlab darslar PENDING bo'ladi (standart: semestr o'rtasi)")
+    args = parser.parse_args(argv)
+
+    config = DatasetConfig(
+        seed=args.seed,
+        directions=args.directions,
+        courses=args.courses,
+        groups_per_course=args.groups_per_course,
+        students_per_group=args.students_per_group,
+        teachers=args.teachers,
+        subjects=args.subjects,
+        lessons_per_day=args.lessons_per_day,
+        weeks=args.weeks,
+        semester_start=args.semester_start,
+        today=args.today,
+    )
+    summary = generate_dataset(config, database_url=args.database_url, reset=args.reset)
+    print(f"✅ Dataset yaratildi: {summary.as_dict()}")
+
+
+if __name__ == "__main__":
+    main()
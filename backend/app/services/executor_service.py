@@ -0,0 +1,138 @@
+"""
+Executor Service - og'ir (CPU) hisobot ishlari uchun worker pool
+
+openpyxl kabi CPU ishlari event loopda bajarilsa, shu vaqt ichida barcha
+boshqa so'rovlar (davomat belgilash ham) kutib qoladi. Bu yerda ular
+alohida jarayonlar (yoki threadlar) poolida bajariladi:
+
+- bir vaqtda ko'pi bilan REPORT_WORKERS ta ish bajariladi;
+- navbat REPORT_QUEUE_SIZE bilan cheklangan (to'lsa - ExecutorBusy);
+- mijoz uzilsa, navbatdagi ish bekor qilinadi, bajarilayotgan ish
+  natijasi tashlab yuboriladi (ClientDisconnected). Bajarilayotgan ishni
+  to'xtatib bo'lmaydi - slot pooldagi ish haqiqatan tugaganda bo'shaydi,
+  aks holda REPORT_WORKERS dan ko'p ish bir vaqtda bajarilib ketadi.
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+import asyncio
+import multiprocessing
+
+from app.config import settings
+
+
+class ExecutorBusy(Exception):
+    """Navbat to'la"""
+
+
+class ClientDisconnected(Exception):
+    """Natija kutilayotganda mijoz uzildi"""
+
+
+class ReportExecutor:
+    """Cheklangan navbatli worker pool"""
+
+    def __init__(self):
+        self.pool = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    def start(self):
+        workers = settings.REPORT_WORKERS
+        if settings.REPORT_EXECUTOR == "thread":
+            self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report")
+        else:
+            # fork emas: event loop va aiosqlite threadlari bor jarayondan fork xavfli
+            self.pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        self.semaphore = asyncio.Semaphore(workers)
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def stats(self) -> dict:
+        return {
+            "executor": settings.REPORT_EXECUTOR,
+            "workers": settings.REPORT_WORKERS,
+            "queue_size": settings.REPORT_QUEUE_SIZE,
+            "running": self.running,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected
+        }
+
+    async def _wait(self, task: asyncio.Future, request):
+        """Natijani kutish, mijoz uzilganini vaqti-vaqti bilan tekshirib"""
+        if request is None:
+            return await task
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=settings.REPORT_DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                self.cancelled += 1
+                raise ClientDisconnected()
+
+    async def run(self, func, *args, request=None):
+        """
+        `func(*args)` ni poolda bajarish.
+
+        `func` va argumentlar pickle qilinadigan bo'lishi kerak (modul darajasidagi
+        funksiya va oddiy tuple/list qiymatlar).
+        """
+        if self.pool is None:
+            self.start()
+
+        if self.waiting + self.running >= settings.REPORT_WORKERS + settings.REPORT_QUEUE_SIZE:
+            self.rejected += 1
+            raise ExecutorBusy()
+
+        self.waiting += 1
+        acquire = asyncio.ensure_future(self.semaphore.acquire())
+        try:
+            await self._wait(acquire, request)
+        except BaseException:
+            # Navbatda turganda bekor qilindi (mijoz uzildi yoki so'rov taski cancel):
+            # asyncio.wait ichki taskni bekor qilmaydi - acquire shu yerda bekor qilinadi,
+            # ulgurib slotni olgan bo'lsa, slot qaytariladi
+            if not acquire.cancel() and not acquire.cancelled() and acquire.exception() is None:
+                self.semaphore.release()
+            raise
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        loop = asyncio.get_running_loop()
+        try:
+            future = self.pool.submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+
+        def on_done(_):
+            # Pool threadidan chaqiriladi
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:
+                pass  # Event loop yopilgan (shutdown)
+
+        future.add_done_callback(on_done)
+        result = await self._wait(asyncio.wrap_future(future), request)
+        self.completed += 1
+        return result
+
+    def _release(self):
+        self.running -= 1
+        self.semaphore.release()
+
+
+report_executor = ReportExecutor()
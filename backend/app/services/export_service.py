@@ -0,0 +1,288 @@
+"""
+Export Service - fon rejimidagi eksport ishlari
+
+Katta eksport bitta uzun HTTP so'rovga bog'lanmaydi:
+
+    POST /api/admin/exports              -> ish ID si
+    GET  /api/admin/exports/{id}         -> holat va progress
+    GET  /api/admin/exports/{id}/download -> tayyor fayl (FileResponse)
+
+Ish ID si = filtrlar va davomat versiyasi (DataVersion) hashi. Shuning uchun
+bir xil eksport qayta so'ralsa, diskdagi tayyor fayl darhol qaytadi; davomat
+o'zgarsa versiya oshadi va yangi fayl yaratiladi. Eski fayllar EXPORT_MAX_AGE_HOURS
+va EXPORT_MAX_BYTES bo'yicha o'chiriladi (eng uzoq ishlatilmaganlari birinchi).
+
+Ish holati har bir o'zgarishda `<id>.json` meta fayliga yoziladi - `uvicorn
+--workers N` da holatni so'rov qaysi workerga tushishidan qat'i nazar ko'radi.
+Bajarilayotgan ish meta faylini HEARTBEAT_SECONDS da yangilab turadi; jarayon
+o'lsa (restart) fayl eskiradi va ish `failed` hisoblanadi - qayta so'rash uni
+yangidan boshlaydi.
+"""
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, date
+from typing import Dict, Optional, Set
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+
+from app.config import settings
+from app.database import read_session
+from app.models.data_version import get_data_version, ATTENDANCE
+from app.services.executor_service import report_executor, ExecutorBusy
+from app.services.report_service import attendance_report_query
+from app.services.report_render import build_attendance_xlsx, build_attendance_csv
+
+FORMATS = {
+    "xlsx": (build_attendance_xlsx, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": (build_attendance_csv, "text/csv"),
+}
+JOB_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+PROGRESS = {"queued": 0.0, "querying": 0.1, "rendering": 0.4, "done": 1.0, "failed": 1.0}
+FINISHED = ("done", "failed")
+HEARTBEAT_SECONDS = 10
+STALE_SECONDS = 60  # Shuncha vaqt yangilanmagan tugallanmagan ish - jarayon o'lgan
+
+
+@dataclass
+class ExportJob:
+    id: str
+    format: str
+    filters: dict
+    version: int
+    status: str = "queued"  # queued | querying | rendering | done | failed
+    rows: Optional[int] = None
+    size: Optional[int] = None
+    error: Optional[str] = None
+    cached: bool = False
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+    finished_at: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        return os.path.join(settings.EXPORT_DIR, f"{self.id}.{self.format}")
+
+    @property
+    def media_type(self) -> str:
+        return FORMATS[self.format][1]
+
+    @property
+    def filename(self) -> str:
+        stamp = self.created_at.replace("-", "").replace(":", "").replace("T", "_")
+        return f"davomat_{stamp}.{self.format}"
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["progress"] = PROGRESS.get(self.status, 0.0)
+        return data
+
+
+# Shu jarayonda bajarilayotgan ishlar (boshqalari - meta fayllardan)
+jobs: Dict[str, ExportJob] = {}
+_tasks: Set[asyncio.Task] = set()
+
+
+def export_key(filters: dict, fmt: str, version: int) -> str:
+    """Filtrlar + format + versiya hashi"""
+    payload = json.dumps({"filters": filters, "format": fmt, "version": version}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def normalize_filters(
+    start: Optional[date],
+    end: Optional[date],
+    group_id: Optional[int],
+    source: str = "hot"
+) -> dict:
+    return {
+        "start_date": start.isoformat() if start else None,
+        "end_date": end.isoformat() if end else None,
+        "group_id": group_id or None,
+        "source": source,
+    }
+
+
+def _meta_path(job_id: str) -> str:
+    return os.path.join(settings.EXPORT_DIR, f"{job_id}.json")
+
+
+def _save_job(job: ExportJob):
+    """Ish holatini meta faylga yozish (tmp -> rename: o'quvchi yarim faylni ko'rmaydi)"""
+    os.makedirs(settings.EXPORT_DIR, exist_ok=True)
+    path = _meta_path(job.id)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(asdict(job), f)
+    os.replace(f"{path}.tmp", path)
+
+
+def _load_job(job_id: str) -> Optional[ExportJob]:
+    """Meta fayldagi ish (boshqa worker yoki qayta ishga tushishdan oldingi)"""
+    path = _meta_path(job_id)
+    try:
+        with open(path) as f:
+            job = ExportJob(**json.load(f))
+        updated = os.path.getmtime(path)
+    except (FileNotFoundError, ValueError, TypeError):
+        return None
+    if job.format not in FORMATS:
+        return None
+    if job.status == "done" and not os.path.exists(job.path):
+        return None
+    if job.status not in FINISHED and time.time() - updated > STALE_SECONDS:
+        job.status = "failed"
+        job.error = "Eksport jarayoni to'xtab qoldi, qayta so'rang"
+    return job
+
+
+def get_job(job_id: str) -> Optional[ExportJob]:
+    if not JOB_ID_RE.match(job_id):
+        return None
+    job = jobs.get(job_id)
+    if job is not None:
+        return job
+    return _load_job(job_id)
+
+
+def touch(job: ExportJob):
+    """Oxirgi ishlatilgan vaqt (eviction tartibi uchun)"""
+    try:
+        os.utime(job.path)
+    except FileNotFoundError:
+        pass
+
+
+async def submit(filters: dict, fmt: str) -> ExportJob:
+    """Eksport ishini yaratish yoki mavjud (tayyor/bajarilayotgan) ishni qaytarish"""
+    async with read_session() as db:
+        version = await get_data_version(db, ATTENDANCE)
+
+    job_id = export_key(filters, fmt, version)
+    job = get_job(job_id)
+    if job is not None and job.status != "failed":
+        if job.status == "done":
+            if os.path.exists(job.path):
+                job.cached = True
+                touch(job)
+                return job
+        else:
+            return job
+
+    job = ExportJob(id=job_id, format=fmt, filters=filters, version=version)
+    jobs[job_id] = job
+    _save_job(job)
+    task = asyncio.create_task(_run(job))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+async def _heartbeat(job: ExportJob):
+    """Meta faylni yangilab turish - boshqa workerlar ish tirikligini ko'radi"""
+    while True:
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        try:
+            os.utime(_meta_path(job.id))
+        except FileNotFoundError:
+            pass
+
+
+async def _run(job: ExportJob):
+    render = FORMATS[job.format][0]
+    started = time.perf_counter()
+    heartbeat = asyncio.create_task(_heartbeat(job))
+    try:
+        job.status = "querying"
+        _save_job(job)
+        async with read_session() as db:
+            result = await db.execute(attendance_report_query(
+                date.fromisoformat(job.filters["start_date"]) if job.filters["start_date"] else None,
+                date.fromisoformat(job.filters["end_date"]) if job.filters["end_date"] else None,
+                job.filters["group_id"],
+                job.filters.get("source", "hot")
+            ))
+            rows = [tuple(row) for row in result.all()]
+        job.rows = len(rows)
+
+        job.status = "rendering"
+        _save_job(job)
+        content = await report_executor.run(render, rows)
+        del rows
+
+        os.makedirs(settings.EXPORT_DIR, exist_ok=True)
+        tmp_path = f"{job.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, job.path)
+
+        job.size = len(content)
+        job.status = "done"
+        job.finished_at = datetime.now().isoformat(timespec="seconds")
+        print(f"📦 Eksport tayyor: {job.id} ({job.rows} qator, {time.perf_counter() - started:.1f}s)")
+    except ExecutorBusy:
+        job.status = "failed"
+        job.error = "Hisobotlar navbati to'la, keyinroq urinib ko'ring"
+    except Exception as e:
+        job.status = "failed"
+        job.error = str(e)
+        print(f"❌ Eksport xatosi: {job.id} - {e}")
+    finally:
+        heartbeat.cancel()
+        if job.finished_at is None:
+            job.finished_at = datetime.now().isoformat(timespec="seconds")
+        if job.status in FINISHED:
+            _save_job(job)
+        jobs.pop(job.id, None)
+        evict(keep=job.id)
+
+
+def evict(keep: Optional[str] = None):
+    """Muddati o'tgan va hajm chegarasidan ortiq eksportlarni o'chirish"""
+    if not os.path.isdir(settings.EXPORT_DIR):
+        return
+    now = time.time()
+    max_age = settings.EXPORT_MAX_AGE_HOURS * 3600
+    artifacts = []  # (oxirgi ishlatilgan, hajm, id)
+    metas = {}  # id -> meta fayl vaqti
+    for name in os.listdir(settings.EXPORT_DIR):
+        job_id, _, ext = name.partition(".")
+        try:
+            stat = os.stat(os.path.join(settings.EXPORT_DIR, name))
+        except FileNotFoundError:
+            continue
+        if ext in FORMATS:
+            artifacts.append((stat.st_mtime, stat.st_size, job_id))
+        elif ext == "json":
+            metas[job_id] = stat.st_mtime
+
+    artifacts.sort()
+    total = sum(size for _, size, _ in artifacts)
+    for mtime, size, job_id in artifacts:
+        if job_id == keep:
+            continue
+        if now - mtime > max_age or total > settings.EXPORT_MAX_BYTES:
+            _remove(job_id)
+            total -= size
+
+    # Fayli yo'q (xato yoki to'xtab qolgan) eskirgan ishlarning meta fayllari
+    kept = {job_id for _, _, job_id in artifacts}
+    for job_id, mtime in metas.items():
+        if job_id not in kept and job_id not in jobs and job_id != keep and now - mtime > max_age:
+            _remove(job_id)
+
+
+def _remove(job_id: str):
+    for name in os.listdir(settings.EXPORT_DIR):
+        if name.startswith(f"{job_id}."):
+            try:
+                os.remove(os.path.join(settings.EXPORT_DIR, name))
+            except FileNotFoundError:
+                pass
+    jobs.pop(job_id, None)
+
+
+def shutdown():
+    """Tugallanmagan ishlarni bekor qilish"""
+    for task in list(_tasks):
+        task.cancel()
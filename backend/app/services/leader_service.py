@@ -0,0 +1,65 @@
+"""
+Leader Service - bir nechta worker orasida bitta leader tanlash
+
+`uvicorn --workers N` da har bir jarayon lifespan ni bajaradi. Scheduler
+joblari faqat bitta jarayonda ishlashi uchun OS fayl qulfi (flock) ishlatiladi:
+
+- qulfni olgan jarayon - leader, qolganlar har SCHEDULER_LEADER_RETRY_SECONDS
+  da qayta urinadi;
+- leader jarayon o'lsa (crash, SIGKILL), OS qulfni o'zi bo'shatadi va keyingi
+  urinishda boshqa worker leader bo'ladi - heartbeat yoki lease jadvali kerak emas.
+
+Qulf bitta hostdagi jarayonlar uchun ishlaydi (SQLite bazasi ham shu hostda).
+fcntl bo'lmagan platformalarda (Windows) jarayon har doim leader hisoblanadi.
+"""
+from typing import Optional
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows - lokal ishlab chiqish, bitta jarayon
+    fcntl = None
+
+
+class LeaderLock:
+    """Bloklanmaydigan eksklyuziv fayl qulfi"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd: Optional[int] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self.fd is not None
+
+    def acquire(self) -> bool:
+        """Qulfni olishga urinish (kutmasdan)"""
+        if self.fd is not None:
+            return True
+        if fcntl is None:
+            self.fd = -1
+            return True
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        # Diagnostika uchun: qaysi jarayon leader
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())
+        self.fd = fd
+        return True
+
+    def release(self):
+        if self.fd is None:
+            return
+        if self.fd >= 0:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+        self.fd = None
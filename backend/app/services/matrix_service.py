@@ -0,0 +1,183 @@
+"""
+Matrix Service - guruh × fan davomat matritsasi (admin heatmap)
+
+Har bir (guruh, fan) juftligi uchun alohida hisobot so'rovi o'rniga ikkita
+oqimli (stream) so'rov va numpy:
+- darslar: (dars, guruh, fan, o'tilganmi) - dars id -> matritsa katagi;
+- davomat: dars bo'yicha (belgilar soni, qatnashganlar soni) - SQLite
+  ix_attendance_lesson_id indeksi tartibida guruhlaydi, Python ga har bir
+  davomat qatori emas, har bir dars uchun bitta qator keladi;
+- kataklar bo'yicha yig'ish `numpy.bincount` bilan - Python sikli yo'q.
+
+Davomat foizi = (present + late) / (o'tilgan darslar × guruhdagi talabalar).
+Natija versiyali keshda (ATTENDANCE, LESSONS, HISTORY). SNAPSHOT_ENABLED bo'lsa
+ikkala massiv SQLite o'rniga snapshot_service dan olinadi.
+"""
+from sqlalchemy import select, union_all, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from itertools import chain
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.models.student import Student
+from app.models.group import Group
+from app.models.subject import Subject
+from app.models.schedule import Schedule
+from app.models.lesson import Lesson, LessonStatus
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.archive import LessonArchive, AttendanceArchive
+from app.models.data_version import get_data_versions, ATTENDANCE, LESSONS, HISTORY
+from app.services.cache_service import get_cache
+from app.services.snapshot_service import snapshot
+
+STREAM_CHUNK_ROWS = 20000
+ATTENDED_STATUSES = (AttendanceStatus.PRESENT.value, AttendanceStatus.LATE.value)
+
+matrix_cache = get_cache("attendance_matrix", settings.MATRIX_CACHE_SIZE)
+
+
+def _sources(source: str):
+    if source == "archive":
+        return [(LessonArchive.__table__, AttendanceArchive.__table__)]
+    if source == "all":
+        return [(Lesson.__table__, Attendance.__table__), (LessonArchive.__table__, AttendanceArchive.__table__)]
+    return [(Lesson.__table__, Attendance.__table__)]
+
+
+def _lessons_select(lessons, start: date, end: date):
+    """(dars, guruh, fan, 1 - o'tilgan / 0 - yo'q)"""
+    return (
+        select(
+            lessons.c.id,
+            Schedule.group_id,
+            Schedule.subject_id,
+            case((lessons.c.status == LessonStatus.CLOSED.value, 1), else_=0)
+        )
+        .select_from(lessons)
+        .join(Schedule, Schedule.id == lessons.c.schedule_id)
+        .where(lessons.c.date.between(start, end))
+    )
+
+
+def _attendance_select(lessons, attendance, start: date, end: date):
+    """(dars, belgilar soni, qatnashganlar soni)"""
+    return (
+        select(
+            attendance.c.lesson_id,
+            func.count(),
+            func.count(case((attendance.c.status.in_(ATTENDED_STATUSES), 1)))
+        )
+        .where(attendance.c.lesson_id.in_(
+            select(lessons.c.id).where(lessons.c.date.between(start, end))
+        ))
+        .group_by(attendance.c.lesson_id)
+    )
+
+
+async def _stream_array(db: AsyncSession, selects, columns: int) -> np.ndarray:
+    """Butun sonli qatorlarni bo'laklab o'qib, bitta (n, columns) massivga"""
+    query = union_all(*selects) if len(selects) > 1 else selects[0]
+    # Core ulanish (ORM qator yuklash yo'q); Row -> numpy chain orqali (C da)
+    connection = await db.connection()
+    result = await connection.stream(query.execution_options(yield_per=STREAM_CHUNK_ROWS))
+    chunks = [np.empty((0, columns), dtype=np.int64)]
+    async for partition in result.partitions():
+        chunks.append(
+            np.fromiter(chain.from_iterable(partition), dtype=np.int64, count=len(partition) * columns)
+            .reshape(-1, columns)
+        )
+    return np.concatenate(chunks)
+
+
+def _dense_lookup(ids: np.ndarray) -> np.ndarray:
+    """id -> zich indeks massivi (yo'q id lar uchun -1)"""
+    lookup = np.full(int(ids.max()) + 1 if len(ids) else 1, -1, dtype=np.int64)
+    lookup[ids] = np.arange(len(ids))
+    return lookup
+
+
+def _to_dense(lookup: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    dense = np.full(len(ids), -1, dtype=np.int64)
+    known = (ids >= 0) & (ids < len(lookup))
+    dense[known] = lookup[ids[known]]
+    return dense
+
+
+async def attendance_matrix(db: AsyncSession, start: date, end: date, source: str = "hot") -> dict:
+    """Guruh × fan matritsasi (darsi bo'lmagan guruh/fanlar tashlab yuboriladi)"""
+    versions = await get_data_versions(db, ATTENDANCE, LESSONS, HISTORY)
+    key = (start, end, source, versions)
+    cached = matrix_cache.get(key)
+    if cached is not None:
+        return cached
+
+    started = time.perf_counter()
+    groups = (await db.execute(select(Group.id, Group.name).order_by(Group.name))).all()
+    subjects = (await db.execute(select(Subject.id, Subject.name).order_by(Subject.name))).all()
+    group_lookup = _dense_lookup(np.array([row[0] for row in groups], dtype=np.int64))
+    subject_lookup = _dense_lookup(np.array([row[0] for row in subjects], dtype=np.int64))
+    shape = (len(groups), len(subjects))
+    size = shape[0] * shape[1]
+
+    sizes = np.zeros(len(groups), dtype=np.int64)
+    result = await db.execute(
+        select(Student.group_id, func.count(Student.id))
+        .where(Student.group_id.is_not(None))
+        .group_by(Student.group_id)
+    )
+    counts = np.array(result.all(), dtype=np.int64).reshape(-1, 2)
+    index = _to_dense(group_lookup, counts[:, 0])
+    sizes[index[index >= 0]] = counts[index >= 0, 1]
+
+    sources = _sources(source)
+
+    # Snapshot (yoqilgan bo'lsa) faqat issiq jadvallar nusxasi
+    current = await snapshot.current(db) if source == "hot" else None
+    if current is not None:
+        lessons, per_lesson = current.matrix_arrays(start, end)
+    else:
+        lessons = await _stream_array(db, [_lessons_select(l, start, end) for l, _ in sources], 4)
+        per_lesson = await _stream_array(db, [_attendance_select(l, a, start, end) for l, a in sources], 3)
+
+    # Darslar -> katak (guruh * fanlar + fan)
+    group_index = _to_dense(group_lookup, lessons[:, 1])
+    subject_index = _to_dense(subject_lookup, lessons[:, 2])
+    known = (group_index >= 0) & (subject_index >= 0)
+    lessons = lessons[known]
+    cells = group_index[known] * shape[1] + subject_index[known]
+    held = np.bincount(cells, weights=lessons[:, 3], minlength=size).astype(np.int64).reshape(shape)
+    scheduled = np.bincount(cells, minlength=size).reshape(shape)
+
+    # Dars bo'yicha davomat -> katak (faqat o'tilgan darslar - kutilgan ham shular bo'yicha)
+    lesson_cell = np.full(int(lessons[:, 0].max()) + 1 if len(lessons) else 1, -1, dtype=np.int64)
+    held_mask = lessons[:, 3] == 1
+    lesson_cell[lessons[held_mask, 0]] = cells[held_mask]
+    cell = _to_dense(lesson_cell, per_lesson[:, 0])
+    mapped = cell >= 0
+    attended = np.bincount(cell[mapped], weights=per_lesson[mapped, 2], minlength=size).astype(np.int64).reshape(shape)
+
+    expected = held * sizes[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(expected > 0, np.round(attended * 100 / expected, 1), np.nan)
+
+    # Darsi yo'q qator/ustunlarni olib tashlash
+    rows = np.flatnonzero((scheduled > 0).any(axis=1))
+    columns = np.flatnonzero((scheduled > 0).any(axis=0))
+    cut = np.ix_(rows, columns)
+
+    matrix = {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "source": source,
+        "groups": [{"id": groups[i][0], "name": groups[i][1], "students": int(sizes[i])} for i in rows],
+        "subjects": [{"id": subjects[j][0], "name": subjects[j][1]} for j in columns],
+        "rate": [[None if np.isnan(value) else value for value in row] for row in rate[cut].tolist()],
+        "attended": attended[cut].tolist(),
+        "expected": expected[cut].tolist(),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+    matrix_cache.set(key, matrix)
+    return matrix
@@ -0,0 +1,222 @@
+"""
+Metrics Service - Prometheus formatidagi metrikalar
+
+- HTTP: route shabloni va status bo'yicha latency histogrammasi, in-flight so'rovlar
+- SQL: route bo'yicha statementlar soni va davomiyligi (before/after_cursor_execute)
+- Pool: ulanish olish vaqti va band ulanishlar soni
+- Scheduler: job davomiyligi, kechikishi (lag) va xatolar
+- Maintenance: qadamlar davomiyligi, baza/WAL hajmi, bo'sh sahifalar
+- Backup: progress, davomiylik, hajm, oxirgi muvaffaqiyat
+- Snapshot: xotira va yangilash davomiyligi
+
+Overhead: so'rov boshiga bitta pure ASGI middleware, statement boshiga
+ikkita perf_counter() va histogram observe - production da yoqiq turishi mumkin.
+"""
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from apscheduler.events import EVENT_JOB_SUBMITTED, EVENT_JOB_MISSED
+from sqlalchemy import event
+from datetime import datetime
+import functools
+import time
+
+from app.services.request_context import RequestContext, current_request
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP so'rov davomiyligi",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress", "Bajarilayotgan HTTP so'rovlar", ["method"]
+)
+db_statements = Counter(
+    "db_statements_total", "Bajarilgan SQL statementlar", ["route"]
+)
+db_statement_duration = Histogram(
+    "db_statement_duration_seconds", "SQL statement davomiyligi", ["route"], buckets=SQL_BUCKETS
+)
+db_statements_per_request = Histogram(
+    "db_statements_per_request", "Bitta so'rovdagi SQL statementlar soni", ["route"], buckets=COUNT_BUCKETS
+)
+db_connection_acquire = Histogram(
+    "db_connection_acquire_seconds", "Pooldan ulanish olish (kutish) vaqti", ["engine"], buckets=SQL_BUCKETS
+)
+db_connections_in_use = Gauge(
+    "db_connections_in_use", "Band ulanishlar soni", ["engine"]
+)
+scheduler_job_duration = Histogram(
+    "scheduler_job_duration_seconds", "Scheduler job davomiyligi", ["job"], buckets=LATENCY_BUCKETS
+)
+scheduler_job_lag = Histogram(
+    "scheduler_job_lag_seconds", "Rejalashtirilgan va haqiqiy ishga tushish orasidagi farq",
+    ["job"], buckets=LATENCY_BUCKETS
+)
+scheduler_job_failures = Counter(
+    "scheduler_job_failures_total", "Xato bilan tugagan joblar", ["job"]
+)
+scheduler_job_missed = Counter(
+    "scheduler_job_missed_total", "O'tkazib yuborilgan job ishga tushishlari", ["job"]
+)
+scheduler_job_last_success = Gauge(
+    "scheduler_job_last_success_timestamp_seconds", "Oxirgi muvaffaqiyatli ishga tushish", ["job"]
+)
+db_maintenance_duration = Histogram(
+    "db_maintenance_duration_seconds", "Baza maintenance qadamlari davomiyligi", ["step"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+)
+db_file_size = Gauge(
+    "db_file_size_bytes", "SQLite fayllari hajmi", ["file"]
+)
+db_freelist_pages = Gauge(
+    "db_freelist_pages", "Bo'sh (qayta ishlatilmagan) sahifalar"
+)
+backup_duration = Histogram(
+    "backup_duration_seconds", "Backup davomiyligi (nusxa, siqish, tekshirish)", ["step"],
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+)
+backup_progress = Gauge(
+    "backup_progress_ratio", "Joriy backup nusxalash progressi (0-1)"
+)
+backup_size = Gauge(
+    "backup_size_bytes", "Oxirgi backup hajmi (siqilgan)"
+)
+backup_last_success = Gauge(
+    "backup_last_success_timestamp_seconds", "Oxirgi muvaffaqiyatli backup"
+)
+backup_failures = Counter(
+    "backup_failures_total", "Xato bilan tugagan backuplar"
+)
+backup_fallbacks = Counter(
+    "backup_fallbacks_total", "Pog'onali nusxa cheklovdan oshib, bitta qadamda nusxalangan backuplar"
+)
+scheduler_leader = Gauge(
+    "scheduler_leader", "1 - shu jarayon scheduler joblarini bajaradi (leader)"
+)
+snapshot_memory = Gauge(
+    "snapshot_memory_bytes", "Ustunli davomat snapshoti egallagan xotira"
+)
+snapshot_refresh_duration = Histogram(
+    "snapshot_refresh_duration_seconds", "Snapshot yuklash/yangilash davomiyligi", ["kind"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+)
+
+
+class MetricsMiddleware:
+    """HTTP latency va in-flight metrikalari (pure ASGI)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        in_progress = http_requests_in_progress.labels(method)
+        in_progress.inc()
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            ctx = current_request.get()
+            route = ctx.route if ctx else RequestContext(scope).route
+            http_request_duration.labels(method, route, str(status_code)).observe(
+                time.perf_counter() - started
+            )
+            if ctx:
+                db_statements_per_request.labels(route).observe(ctx.query_count)
+
+
+def instrument_engine(engine, name: str = "primary"):
+    """Engine ga SQL va pool metrikalarini ulash"""
+    sync_engine = engine.sync_engine
+    in_use = db_connections_in_use.labels(name)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        ctx = current_request.get()
+        if ctx is not None:
+            ctx.query_count += 1
+            ctx.query_seconds += elapsed
+            route = ctx.route
+        else:
+            route = "background"
+        db_statements.labels(route).inc()
+        db_statement_duration.labels(route).observe(elapsed)
+
+    @event.listens_for(sync_engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        in_use.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        in_use.dec()
+
+
+async def acquire_connection(session, name: str = "primary"):
+    """Sessiya uchun ulanishni oldindan olish va kutish vaqtini yozish"""
+    started = time.perf_counter()
+    await session.connection()
+    db_connection_acquire.labels(name).observe(time.perf_counter() - started)
+
+
+def timed_job(name: str, func):
+    """Scheduler job ni davomiylik va SQL metrikalari bilan o'rash"""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = current_request.set(RequestContext(name=f"job:{name}"))
+        started = time.perf_counter()
+        try:
+            result = await func(*args, **kwargs)
+            scheduler_job_last_success.labels(name).set_to_current_time()
+            return result
+        except Exception:
+            scheduler_job_failures.labels(name).inc()
+            raise
+        finally:
+            scheduler_job_duration.labels(name).observe(time.perf_counter() - started)
+            current_request.reset(token)
+
+    return wrapper
+
+
+def instrument_scheduler(scheduler):
+    """Job kechikishi (lag) va o'tkazib yuborilgan ishga tushishlarni kuzatish"""
+
+    def _on_submitted(evt):
+        for run_time in evt.scheduled_run_times:
+            lag = (datetime.now(run_time.tzinfo) - run_time).total_seconds()
+            scheduler_job_lag.labels(evt.job_id).observe(max(lag, 0.0))
+
+    def _on_missed(evt):
+        scheduler_job_missed.labels(evt.job_id).inc()
+
+    scheduler.add_listener(_on_submitted, EVENT_JOB_SUBMITTED)
+    scheduler.add_listener(_on_missed, EVENT_JOB_MISSED)
+
+
+def render_metrics():
+    """Prometheus text formatidagi javob (body, content_type)"""
+    return generate_latest(), CONTENT_TYPE_LATEST
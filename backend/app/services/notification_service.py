@@ -0,0 +1,149 @@
+"""
+Notification Service - bot xabarlari navbati (outbox)
+
+Yozish yo'llari (dars ochilishi, yopilishiga oz qolgani) `enqueue` ni o'z
+tranzaksiyasida chaqiradi - dars ochilib, xabar yo'qolib qolmaydi.
+Bot navbatni `claim` bilan oladi: yozuvlar NOTIFY_LEASE_SECONDS ga band
+qilinadi, bot yuborib bo'lgach `ack` qiladi. Tasdiqlanmagan (bot qulagan)
+yozuvlar lease tugagach qayta beriladi - kamida bir marta yetkazish.
+
+Qabul qiluvchilar - guruhning faol talabalari, shu darsga hali belgi
+qo'ymaganlar. Dars endi ochiq bo'lmasa, xabar yuborilmaydi (muddati o'tgan).
+"""
+from sqlalchemy import select, update, delete, exists, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List
+
+from app.config import settings
+from app.database import async_session
+from app.models.notification import Notification
+from app.models.lesson import Lesson, LessonStatus
+from app.models.schedule import Schedule
+from app.models.subject import Subject
+from app.models.group import Group
+from app.models.student import Student
+from app.models.user import User
+from app.models.attendance import Attendance
+from app.schemas.rows import NotificationRow
+
+
+async def enqueue(db: AsyncSession, kind: str, lesson_ids: Iterable[int]):
+    """Darslar uchun xabar qo'shish (takrorlansa - e'tiborsiz; commit chaqiruvchida)"""
+    if not settings.NOTIFY_ENABLED:
+        return
+    values = [{"kind": kind, "lesson_id": lesson_id} for lesson_id in lesson_ids]
+    if values:
+        await db.execute(insert(Notification).on_conflict_do_nothing(), values)
+
+
+async def claim(db: AsyncSession, limit: int) -> List[NotificationRow]:
+    """
+    Navbatdan `limit` ta xabarni band qilib qaytarish.
+    Dars yopilgan/o'chirilgan xabarlar shu yerda yuborilgan deb belgilanadi.
+    """
+    now = datetime.utcnow()
+    result = await db.execute(
+        select(
+            Notification.id, Notification.kind, Notification.lesson_id,
+            Lesson.date, Lesson.status, Subject.name.label("subject_name"),
+            Group.name.label("group_name"), Schedule.group_id,
+            Schedule.room, Schedule.start_time, Schedule.end_time
+        )
+        .outerjoin(Lesson, Lesson.id == Notification.lesson_id)
+        .outerjoin(Schedule, Schedule.id == Lesson.schedule_id)
+        .outerjoin(Subject, Subject.id == Schedule.subject_id)
+        .outerjoin(Group, Group.id == Schedule.group_id)
+        .where(
+            Notification.sent_at.is_(None),
+            (Notification.claimed_until.is_(None)) | (Notification.claimed_until < now)
+        )
+        .order_by(Notification.id)
+        .limit(limit)
+    )
+    rows = result.all()
+    live = [row for row in rows if row.status == LessonStatus.OPEN.value]
+    expired = [row.id for row in rows if row.status != LessonStatus.OPEN.value]
+
+    if expired:
+        await db.execute(
+            update(Notification).where(Notification.id.in_(expired)).values(sent_at=now)
+        )
+    if not live:
+        await db.commit()
+        return []
+
+    await db.execute(
+        update(Notification)
+        .where(Notification.id.in_([row.id for row in live]))
+        .values(claimed_until=now + timedelta(seconds=settings.NOTIFY_LEASE_SECONDS))
+    )
+
+    # Qabul qiluvchilar - barcha darslar uchun bitta so'rov
+    lesson_groups = {row.lesson_id: row.group_id for row in live}
+    result = await db.execute(
+        select(Lesson.id, User.telegram_id)
+        .join(Schedule, Schedule.id == Lesson.schedule_id)
+        .join(Student, Student.group_id == Schedule.group_id)
+        .join(User, User.id == Student.user_id)
+        .where(
+            Lesson.id.in_(lesson_groups),
+            User.is_active == True,
+            ~exists().where(Attendance.lesson_id == Lesson.id, Attendance.student_id == Student.id)
+        )
+    )
+    recipients: Dict[int, List[int]] = {}
+    for lesson_id, telegram_id in result.all():
+        recipients.setdefault(lesson_id, []).append(telegram_id)
+    await db.commit()
+
+    return [
+        NotificationRow(
+            id=row.id,
+            kind=row.kind,
+            lesson_id=row.lesson_id,
+            date=row.date,
+            subject_name=row.subject_name,
+            group_name=row.group_name,
+            room=row.room,
+            start_time=row.start_time,
+            end_time=row.end_time,
+            chat_ids=recipients.get(row.lesson_id, [])
+        )
+        for row in live
+    ]
+
+
+async def ack(db: AsyncSession, ids: List[int]) -> int:
+    """Yuborilgan xabarlarni tasdiqlash"""
+    if not ids:
+        return 0
+    result = await db.execute(
+        update(Notification)
+        .where(Notification.id.in_(ids), Notification.sent_at.is_(None))
+        .values(sent_at=datetime.utcnow())
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def queue_stats(db: AsyncSession) -> dict:
+    """Navbat holati (admin statistikasi uchun)"""
+    pending = await db.scalar(
+        select(func.count(Notification.id)).where(Notification.sent_at.is_(None))
+    )
+    return {"pending": pending or 0}
+
+
+async def purge_sent() -> int:
+    """NOTIFY_KEEP_DAYS dan eski yuborilgan xabarlarni o'chirish (kunlik job)"""
+    cutoff = datetime.utcnow() - timedelta(days=settings.NOTIFY_KEEP_DAYS)
+    async with async_session() as db:
+        result = await db.execute(
+            delete(Notification).where(Notification.sent_at < cutoff)
+        )
+        await db.commit()
+    if result.rowcount:
+        print(f"🔔 Eski xabarlar o'chirildi: {result.rowcount}")
+    return result.rowcount
@@ -0,0 +1,184 @@
+"""
+Profiler Service - adminlar uchun so'rovni talab bo'yicha profillash
+
+Admin `/api/admin/profiling/token` dan imzolangan token oladi va uni
+`X-Profile-Token` header (yoki `?__profile=<token>`) bilan yuboradi.
+Bunday so'rov cProfile ostida bajariladi, natija `PROFILE_DIR` ga .pstats
+fayl sifatida yoziladi va javobda `X-Profile-Id` header qaytadi.
+Faylni snakeviz / flameprof / `python -m pstats` bilan ochish mumkin.
+
+Token yo'q so'rovlar uchun xarajat - headerlarni bir marta ko'rib chiqish.
+Eslatma: cProfile thread darajasida ishlaydi, shuning uchun profil shu
+vaqtda event loopda bajarilgan boshqa korutinlarni ham o'z ichiga oladi.
+"""
+from datetime import datetime
+from typing import List, Optional
+from urllib.parse import parse_qs
+import asyncio
+import cProfile
+import hashlib
+import hmac
+import io
+import os
+import pstats
+import re
+import time
+import uuid
+
+from app.config import settings
+from app.services.request_context import RequestContext
+
+HEADER_NAME = b"x-profile-token"
+QUERY_FLAG = b"__profile="
+PROFILE_ID_RE = re.compile(r"^[0-9]{8}-[0-9]{6}-[0-9a-f]{8}$")
+
+
+def _sign(expires: int) -> str:
+    return hmac.new(
+        settings.SECRET_KEY.encode(),
+        f"profile:{expires}".encode(),
+        hashlib.sha256
+    ).hexdigest()[:32]
+
+
+def create_profile_token() -> dict:
+    """Muddatli profil tokeni yaratish"""
+    expires = int(time.time()) + settings.PROFILE_TOKEN_TTL_MINUTES * 60
+    return {
+        "token": f"{expires}.{_sign(expires)}",
+        "header": HEADER_NAME.decode(),
+        "query_param": QUERY_FLAG.decode().rstrip("="),
+        "expires_at": datetime.fromtimestamp(expires).isoformat(timespec="seconds")
+    }
+
+
+def verify_profile_token(token: str) -> bool:
+    try:
+        expires_raw, signature = token.split(".", 1)
+        expires = int(expires_raw)
+    except ValueError:
+        return False
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(signature, _sign(expires))
+
+
+def _extract_token(scope) -> Optional[str]:
+    for name, value in scope.get("headers", ()):
+        if name == HEADER_NAME:
+            return value.decode("latin-1")
+    query_string = scope.get("query_string", b"")
+    if QUERY_FLAG in query_string:
+        values = parse_qs(query_string.decode("latin-1")).get(QUERY_FLAG.decode().rstrip("="))
+        return values[0] if values else None
+    return None
+
+
+def profile_path(profile_id: str) -> Optional[str]:
+    """Profil fayli yo'li (noto'g'ri ID bo'lsa None)"""
+    if not PROFILE_ID_RE.match(profile_id):
+        return None
+    path = os.path.join(settings.PROFILE_DIR, f"{profile_id}.pstats")
+    return path if os.path.exists(path) else None
+
+
+def list_profiles() -> List[dict]:
+    """Saqlangan profillar (yangilari birinchi)"""
+    if not os.path.isdir(settings.PROFILE_DIR):
+        return []
+    profiles = []
+    for name in os.listdir(settings.PROFILE_DIR):
+        if not name.endswith(".pstats"):
+            continue
+        profile_id = name[:-len(".pstats")]
+        meta_path = os.path.join(settings.PROFILE_DIR, f"{profile_id}.txt")
+        meta = {}
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                for line in f:
+                    key, _, value = line.rstrip("\n").partition("=")
+                    meta[key] = value
+        stat = os.stat(os.path.join(settings.PROFILE_DIR, name))
+        profiles.append({
+            "id": profile_id,
+            "size": stat.st_size,
+            "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds"),
+            **meta
+        })
+    profiles.sort(key=lambda p: p["id"], reverse=True)
+    return profiles
+
+
+def render_profile_text(path: str, sort: str = "cumulative", limit: int = 60) -> str:
+    """pstats ni matn ko'rinishida (eng og'ir funksiyalar)"""
+    output = io.StringIO()
+    stats = pstats.Stats(path, stream=output)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+
+def _cleanup():
+    profiles = list_profiles()
+    for profile in profiles[settings.PROFILE_MAX_FILES:]:
+        for ext in (".pstats", ".txt"):
+            try:
+                os.remove(os.path.join(settings.PROFILE_DIR, profile["id"] + ext))
+            except FileNotFoundError:
+                pass
+
+
+def _save_profile(profiler: cProfile.Profile, profile_id: str, meta: dict):
+    """Profil va meta faylni yozish (threadda - katta pstats yozilishi event loopni to'xtatmasin)"""
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    profiler.dump_stats(os.path.join(settings.PROFILE_DIR, f"{profile_id}.pstats"))
+    with open(os.path.join(settings.PROFILE_DIR, f"{profile_id}.txt"), "w") as f:
+        for key, value in meta.items():
+            f.write(f"{key}={value}\n")
+    _cleanup()
+
+
+class ProfilerMiddleware:
+    """Imzolangan token bilan kelgan so'rovni cProfile ostida bajarish (pure ASGI)"""
+
+    def __init__(self, app):
+        self.app = app
+        self.busy = False  # Bir vaqtda faqat bitta profil (cProfile thread uchun yagona)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.busy:
+            await self.app(scope, receive, send)
+            return
+
+        token = _extract_token(scope)
+        if token is None or not verify_profile_token(token):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        self.busy = True
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            self.busy = False
+            elapsed = time.perf_counter() - started
+            await asyncio.to_thread(_save_profile, profiler, profile_id, {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": RequestContext(scope).route,
+                "status": status_code,
+                "duration_ms": f"{elapsed * 1000:.1f}"
+            })
@@ -0,0 +1,160 @@
+"""
+Query Budget - so'rov boshiga SQL statementlar soni va N+1 aniqlash
+
+- Production: middleware so'rov tugagach statementlar sonini byudjet bilan
+  solishtiradi va bir xil shakldagi statement ko'p takrorlansa (for sikli
+  ichida so'rov - N+1) route va statement bilan warning yozadi.
+- Testlar: `query_budget(n)` dekorator/context manager - n dan ko'p
+  statement bajarilsa AssertionError (QueryBudgetExceeded) beradi.
+
+    @query_budget(6)
+    def test_student_today(client): ...
+
+    async with query_budget(3):
+        await student.get_stats(current_user=user, db=db)
+"""
+from sqlalchemy import event
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+import functools
+import inspect
+import logging
+
+from app.config import settings
+from app.database import sql_fingerprint
+from app.services.request_context import current_request
+
+logger = logging.getLogger(__name__)
+
+# Route shabloni bo'yicha alohida byudjetlar (umumiy QUERY_BUDGET_PER_REQUEST o'rniga)
+ROUTE_BUDGETS: Dict[str, int] = {}
+
+# Joriy task/so'rovning faol test byudjetlari. ContextVar - scheduler joblari va
+# boshqa so'rovlarning statementlari hisobga kirmaydi (TestClient kontekstni
+# ilova threadiga nusxalab o'tkazadi, SQLAlchemy greenleti ham)
+_active_budgets: ContextVar[Tuple["query_budget", ...]] = ContextVar("query_budgets", default=())
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Test uchun belgilangan statementlar soni oshib ketdi"""
+
+
+def instrument_engine(engine):
+    """Har bir statementni joriy so'rov va faol test byudjetlariga yozish"""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        ctx = current_request.get()
+        if ctx is not None:
+            shape = sql_fingerprint(statement)
+            entry = ctx.statements.get(shape)
+            if entry is None:
+                ctx.statements[shape] = [1, statement]
+            else:
+                entry[0] += 1
+        for budget in _active_budgets.get():
+            budget.statements.append(statement)
+
+
+def check_request(ctx) -> List[str]:
+    """So'rov statistikasini tekshirib, ogohlantirishlar ro'yxatini qaytarish"""
+    if not ctx.statements:
+        return []
+    route = ctx.route
+    warnings = []
+    total = sum(entry[0] for entry in ctx.statements.values())
+    budget = ROUTE_BUDGETS.get(route, settings.QUERY_BUDGET_PER_REQUEST)
+    if total > budget:
+        top_shape, (top_count, top_statement) = max(ctx.statements.items(), key=lambda item: item[1][0])
+        warnings.append(
+            f"Query budget oshdi: {ctx.method} {route} - {total} statement (byudjet {budget}); "
+            f"eng ko'p ({top_count}x): {top_statement}"
+        )
+    for shape, (count, statement) in ctx.statements.items():
+        if count >= settings.QUERY_REPEAT_THRESHOLD:
+            warnings.append(
+                f"N+1 gumon: {ctx.method} {route} - bir xil statement {count} marta: {statement}"
+            )
+    return warnings
+
+
+class QueryBudgetMiddleware:
+    """So'rov tugagach byudjet va takrorlanuvchi statementlarni tekshirish (pure ASGI)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            ctx = current_request.get()
+            if ctx is not None:
+                for message in check_request(ctx):
+                    logger.warning(message)
+
+
+class query_budget:
+    """
+    Testlar uchun: blok/funksiya ichida `max_queries` dan ko'p statement bo'lsa xato.
+
+    Dekorator (sync va async funksiyalar), `with` va `async with` sifatida ishlaydi.
+    """
+
+    def __init__(self, max_queries: int, label: Optional[str] = None):
+        self.max_queries = max_queries
+        self.label = label
+        self.statements: List[str] = []
+        self._token = None
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self):
+        self.statements = []
+        self._token = _active_budgets.set(_active_budgets.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _active_budgets.reset(self._token)
+        self._token = None
+        if exc_type is None and self.count > self.max_queries:
+            shapes: Dict[str, int] = {}
+            for statement in self.statements:
+                shape = sql_fingerprint(statement)
+                shapes[shape] = shapes.get(shape, 0) + 1
+            details = "\n".join(
+                f"  {count}x {shape}" for shape, count in sorted(shapes.items(), key=lambda i: -i[1])
+            )
+            raise QueryBudgetExceeded(
+                f"{self.label or 'query_budget'}: {self.count} statement, ruxsat {self.max_queries}\n{details}"
+            )
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+    def __call__(self, func):
+        label = self.label or func.__name__
+        max_queries = self.max_queries
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                async with query_budget(max_queries, label):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with query_budget(max_queries, label):
+                return func(*args, **kwargs)
+        return wrapper
@@ -0,0 +1,105 @@
+"""
+Report Render - hisobot fayllarini yaratish
+
+Bu modul worker jarayonlarda (executor_service) bajariladi, shuning uchun
+faqat oddiy tuple qatorlar bilan ishlaydi va app.database ni import qilmaydi.
+
+Qator formati (report_service.ATTENDANCE_COLUMNS):
+    (id, student_name, student_code, group_name, subject_name, date, status, marked_at)
+"""
+from typing import Callable, Iterable, Optional, Sequence
+import csv
+import io
+
+HEADERS = ["#", "Talaba", "Talaba ID", "Guruh", "Fan", "Sana", "Status", "Vaqt"]
+COLUMN_WIDTHS = {"A": 5, "B": 25, "C": 12, "D": 12, "E": 20, "F": 12, "G": 10, "H": 10}
+STATUS_COLORS = {
+    "present": "C6EFCE",
+    "late": "FFEB9C",
+    "absent": "FFC7CE"
+}
+
+# Har necha qatorda progress callback chaqiriladi
+PROGRESS_STEP = 5000
+
+
+def _date_text(value) -> str:
+    if not value:
+        return "-"
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)[:10]
+
+
+def _time_text(value) -> str:
+    if not value:
+        return "-"
+    return value.strftime("%H:%M") if hasattr(value, "strftime") else str(value)[11:16]
+
+
+def _display_rows(rows: Iterable[Sequence]):
+    for number, (_, student_name, student_code, group_name, subject_name, lesson_date, status, marked_at) \
+            in enumerate(rows, 1):
+        yield [
+            number,
+            student_name or "-",
+            student_code or "-",
+            group_name or "-",
+            subject_name or "-",
+            _date_text(lesson_date),
+            status,
+            _time_text(marked_at),
+        ]
+
+
+def build_attendance_xlsx(rows: Sequence[Sequence], progress: Optional[Callable[[int], None]] = None) -> bytes:
+    """Davomat qatorlaridan XLSX (write-only rejim - katta hisobotlar uchun tez)"""
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, Alignment, PatternFill
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Davomat")
+    for column, width in COLUMN_WIDTHS.items():
+        ws.column_dimensions[column].width = width
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+    header_alignment = Alignment(horizontal="center")
+    header = []
+    for title in HEADERS:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = header_alignment
+        header.append(cell)
+    ws.append(header)
+
+    status_fills = {
+        status: PatternFill(start_color=color, end_color=color, fill_type="solid")
+        for status, color in STATUS_COLORS.items()
+    }
+
+    for index, values in enumerate(_display_rows(rows), 1):
+        fill = status_fills.get(values[6])
+        if fill is not None:
+            status_cell = WriteOnlyCell(ws, value=values[6])
+            status_cell.fill = fill
+            values[6] = status_cell
+        ws.append(values)
+        if progress and index % PROGRESS_STEP == 0:
+            progress(index)
+
+    output = io.BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+
+def build_attendance_csv(rows: Sequence[Sequence], progress: Optional[Callable[[int], None]] = None) -> bytes:
+    """Davomat qatorlaridan CSV (Excel uchun UTF-8 BOM bilan)"""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(HEADERS)
+    for index, values in enumerate(_display_rows(rows), 1):
+        writer.writerow(values)
+        if progress and index % PROGRESS_STEP == 0:
+            progress(index)
+    return ("\ufeff" + output.getvalue()).encode("utf-8")
@@ -0,0 +1,98 @@
+"""
+Report Service - davomat hisobotlari uchun so'rovlar
+
+ORM obyektlari va uch darajali selectinload o'rniga bitta tekis (flat)
+projection so'rov - qatorlar oddiy tuple bo'lib, worker jarayonga
+yuborish va serializatsiya qilish arzon.
+
+Hisobot sahifalari `report_cache` da saqlanadi; kalit davomat versiyasini
+o'z ichiga oladi, shuning uchun kesh hech qachon eskirgan natija bermaydi.
+"""
+from sqlalchemy import select, union_all, desc
+from datetime import date
+from typing import Optional
+
+from app.models.user import User
+from app.models.student import Student
+from app.models.group import Group
+from app.models.subject import Subject
+from app.models.schedule import Schedule
+from app.models.lesson import Lesson
+from app.models.attendance import Attendance
+from app.models.archive import LessonArchive, AttendanceArchive
+from app.config import settings
+from app.services.cache_service import get_cache
+
+ATTENDANCE_COLUMNS = (
+    "id", "student_name", "student_id", "group_name", "subject_name", "date", "status", "marked_at"
+)
+REPORT_PAGE_SIZE = 500
+REPORT_SOURCES = ("hot", "archive", "all")
+
+# (start, end, group_id, source, page, version) -> javob (JSON baytlar)
+report_cache = get_cache("attendance_report", settings.REPORT_CACHE_SIZE)
+
+
+def parse_report_date(value: Optional[str]) -> Optional[date]:
+    """Hisobot filtri uchun sana (noto'g'ri qiymat e'tiborsiz qoldiriladi)"""
+    if not value or not value.strip():
+        return None
+    try:
+        return date.fromisoformat(value.strip())
+    except ValueError:
+        return None
+
+
+def _report_select(lessons, attendance, start, end, group_id):
+    """Bitta juft jadval (issiq yoki arxiv) uchun tekis so'rov"""
+    query = (
+        select(
+            attendance.c.id.label("id"),
+            User.full_name.label("student_name"),
+            Student.student_id.label("student_id"),
+            Group.name.label("group_name"),
+            Subject.name.label("subject_name"),
+            lessons.c.date.label("date"),
+            attendance.c.status.label("status"),
+            attendance.c.marked_at.label("marked_at")
+        )
+        .select_from(attendance)
+        .join(lessons, lessons.c.id == attendance.c.lesson_id)
+        .join(Student, Student.id == attendance.c.student_id)
+        .outerjoin(User, User.id == Student.user_id)
+        .outerjoin(Group, Group.id == Student.group_id)
+        .outerjoin(Schedule, Schedule.id == lessons.c.schedule_id)
+        .outerjoin(Subject, Subject.id == Schedule.subject_id)
+    )
+
+    if start:
+        query = query.where(lessons.c.date >= start)
+    if end:
+        query = query.where(lessons.c.date <= end)
+    if group_id:
+        query = query.where(Student.group_id == group_id)
+    return query
+
+
+def attendance_report_query(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    group_id: Optional[int] = None,
+    source: str = "hot"
+):
+    """
+    Davomat hisoboti uchun tekis so'rov (ATTENDANCE_COLUMNS tartibida).
+
+    source: hot - joriy jadvallar, archive - arxivlangan semestrlar, all - ikkalasi.
+    """
+    if source == "archive":
+        query = _report_select(LessonArchive.__table__, AttendanceArchive.__table__, start, end, group_id)
+    elif source == "all":
+        combined = union_all(
+            _report_select(Lesson.__table__, Attendance.__table__, start, end, group_id),
+            _report_select(LessonArchive.__table__, AttendanceArchive.__table__, start, end, group_id)
+        ).subquery()
+        return select(*combined.c).order_by(combined.c.id.desc())
+    else:
+        query = _report_select(Lesson.__table__, Attendance.__table__, start, end, group_id)
+    return query.order_by(desc("id"))
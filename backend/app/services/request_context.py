@@ -0,0 +1,63 @@
+"""
+Request Context - joriy so'rov (yoki scheduler job) haqida ma'lumot
+
+SQLAlchemy event hooklari qaysi route uchun ishlayotganini shu yerdan
+biladi. Pure ASGI middleware - contextvar endpoint ichiga ham yetib boradi.
+"""
+from contextvars import ContextVar
+from typing import Optional
+import time
+
+
+class RequestContext:
+    """Bitta so'rov davomidagi yig'ma ma'lumotlar"""
+    __slots__ = ("scope", "name", "started", "query_count", "query_seconds", "statements")
+
+    def __init__(self, scope: Optional[dict] = None, name: Optional[str] = None):
+        self.scope = scope
+        self.name = name
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.query_seconds = 0.0
+        # fingerprint -> [soni, birinchi statement] (query_budget to'ldiradi)
+        self.statements: dict = {}
+
+    @property
+    def route(self) -> str:
+        """Route shabloni (/api/teacher/lesson/{lesson_id}/open), path emas"""
+        if self.name:
+            return self.name
+        route = self.scope.get("route") if self.scope else None
+        path = getattr(route, "path", None)
+        return path or "unmatched"
+
+    @property
+    def method(self) -> str:
+        return self.scope.get("method", "") if self.scope else ""
+
+
+current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
+
+
+def get_current_route() -> Optional[str]:
+    """Joriy route (so'rovdan tashqarida - None)"""
+    ctx = current_request.get()
+    return ctx.route if ctx else None
+
+
+class RequestContextMiddleware:
+    """Har bir HTTP so'rov uchun RequestContext o'rnatish"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = current_request.set(RequestContext(scope))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request.reset(token)
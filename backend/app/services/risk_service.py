@@ -0,0 +1,233 @@
+"""
+Risk Service - qoldirish darajasi yuqori talabalarni aniqlash
+
+Har bir talabaning oxirgi RISK_WINDOW_LESSONS ta o'tilgan darsi StudentRisk
+oynasida saqlanadi va yozish yo'llarida yangilanadi:
+- dars yopilganda - guruhdagi har bir talaba oynasiga bitta natija qo'shiladi
+  (O(guruh hajmi));
+- yopilgan darsga o'qituvchi belgi qo'ysa - oynadagi shu dars natijasi almashadi.
+
+Qoldirish - belgisi yo'q yoki `absent`; present/late/excused - qatnashgan.
+Xavf: oynada kamida RISK_MIN_LESSONS dars va qoldirish ulushi
+>= RISK_ABSENCE_THRESHOLD.
+
+O'zgarishlar chaqiruvchi tranzaksiyasida (commit chaqiruvchida).
+"""
+from sqlalchemy import select, delete, insert, update, func, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+import time
+
+from app.config import settings
+from app.database import async_session
+from app.models.student import Student
+from app.models.schedule import Schedule
+from app.models.lesson import Lesson, LessonStatus
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.risk import StudentRisk, RiskSnapshot
+
+ATTENDED_STATUSES = (
+    AttendanceStatus.PRESENT.value, AttendanceStatus.LATE.value, AttendanceStatus.EXCUSED.value
+)
+
+
+def _is_absent(status: Optional[str]) -> int:
+    return 0 if status in ATTENDED_STATUSES else 1
+
+
+def _risk_values(student_id: int, group_id: Optional[int], window: List[list]) -> dict:
+    """Oyna va undan hosil bo'ladigan ustunlar (oxirgi RISK_WINDOW_LESSONS ta)"""
+    window = window[-settings.RISK_WINDOW_LESSONS:]
+    lessons = len(window)
+    absences = sum(absent for _, absent in window)
+    rate = round(absences / lessons, 3) if lessons else 0.0
+    return {
+        "student_id": student_id,
+        "group_id": group_id,
+        "window": window,
+        "lessons": lessons,
+        "absences": absences,
+        "absence_rate": rate,
+        "at_risk": lessons >= settings.RISK_MIN_LESSONS and rate >= settings.RISK_ABSENCE_THRESHOLD,
+        "updated_at": datetime.utcnow()
+    }
+
+
+async def _save(db: AsyncSession, existing: List[dict], new: List[dict]):
+    """Bitta executemany: mavjudlari - PK bo'yicha bulk UPDATE, yangilari - INSERT"""
+    if existing:
+        await db.execute(update(StudentRisk), existing)
+    if new:
+        await db.execute(insert(StudentRisk), new)
+
+
+async def record_closed_lessons(db: AsyncSession, lesson_ids: Iterable[int]):
+    """Yopilgan darslar natijalarini guruh talabalari oynalariga qo'shish (vaqt tartibida)"""
+    lesson_ids = list(lesson_ids)
+    if not lesson_ids:
+        return
+
+    result = await db.execute(
+        select(Lesson.id, Schedule.group_id)
+        .join(Schedule, Schedule.id == Lesson.schedule_id)
+        .where(Lesson.id.in_(lesson_ids))
+        .order_by(Lesson.date, Schedule.start_time, Lesson.id)
+    )
+    lessons = result.all()
+    group_ids = {group_id for _, group_id in lessons}
+
+    result = await db.execute(
+        select(Student.id, Student.group_id).where(Student.group_id.in_(group_ids))
+    )
+    members: Dict[int, List[int]] = {}
+    for student_id, group_id in result.all():
+        members.setdefault(group_id, []).append(student_id)
+
+    result = await db.execute(
+        select(Attendance.lesson_id, Attendance.student_id, Attendance.status)
+        .where(Attendance.lesson_id.in_(lesson_ids))
+    )
+    statuses = {(lesson_id, student_id): status for lesson_id, student_id, status in result.all()}
+
+    student_ids = [student_id for students in members.values() for student_id in students]
+    result = await db.execute(
+        select(StudentRisk.student_id, StudentRisk.window).where(StudentRisk.student_id.in_(student_ids))
+    )
+    stored = {student_id: window or [] for student_id, window in result.all()}
+
+    windows: Dict[int, List[list]] = {}
+    groups: Dict[int, int] = {}
+    for lesson_id, group_id in lessons:
+        for student_id in members.get(group_id, []):
+            window = windows.setdefault(student_id, list(stored.get(student_id, [])))
+            groups[student_id] = group_id
+            if any(entry[0] == lesson_id for entry in window):
+                continue  # Qayta yopish (idempotent)
+            window.append([lesson_id, _is_absent(statuses.get((lesson_id, student_id)))])
+
+    values = [_risk_values(student_id, groups[student_id], window) for student_id, window in windows.items()]
+    await _save(
+        db,
+        [row for row in values if row["student_id"] in stored],
+        [row for row in values if row["student_id"] not in stored]
+    )
+
+
+async def record_mark(db: AsyncSession, lesson_id: int, student_id: int, status: str):
+    """Yopilgan darsga qo'yilgan belgi - oynadagi natijani almashtirish"""
+    result = await db.execute(
+        select(StudentRisk.group_id, StudentRisk.window).where(StudentRisk.student_id == student_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return
+    window = [list(entry) for entry in row.window or []]
+    for entry in window:
+        if entry[0] == lesson_id:
+            entry[1] = _is_absent(status)
+            await _save(db, [_risk_values(student_id, row.group_id, window)], [])
+            return
+
+
+async def forget_lesson(db: AsyncSession, lesson_id: int, group_id: int):
+    """O'chirilgan darsni guruh oynalaridan olib tashlash"""
+    result = await db.execute(
+        select(StudentRisk.student_id, StudentRisk.window).where(StudentRisk.group_id == group_id)
+    )
+    changed = []
+    for student_id, window in result.all():
+        kept = [entry for entry in window or [] if entry[0] != lesson_id]
+        if len(kept) != len(window or []):
+            changed.append(_risk_values(student_id, group_id, kept))
+    await _save(db, changed, [])
+
+
+async def rebuild_risk() -> dict:
+    """
+    Barcha oynalarni attendance dan qayta qurish (birinchi ishga tushish,
+    sozlamalar o'zgarganda). Guruh bo'yicha oxirgi N ta yopilgan dars -
+    window function bilan bitta so'rovda.
+    """
+    started = time.perf_counter()
+    window_size = settings.RISK_WINDOW_LESSONS
+    recent = (
+        select(
+            Lesson.id.label("lesson_id"),
+            Schedule.group_id.label("group_id"),
+            func.row_number().over(
+                partition_by=Schedule.group_id,
+                order_by=(Lesson.date.desc(), Schedule.start_time.desc(), Lesson.id.desc())
+            ).label("position")
+        )
+        .join(Schedule, Schedule.id == Lesson.schedule_id)
+        .where(Lesson.status == LessonStatus.CLOSED.value)
+        .subquery()
+    )
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(Student.id, Student.group_id, recent.c.lesson_id, Attendance.status)
+            .join(recent, (recent.c.group_id == Student.group_id) & (recent.c.position <= window_size))
+            .outerjoin(
+                Attendance,
+                (Attendance.lesson_id == recent.c.lesson_id) & (Attendance.student_id == Student.id)
+            )
+            .order_by(Student.id, recent.c.position.desc())
+        )
+        windows: Dict[int, list] = {}
+        groups: Dict[int, int] = {}
+        for student_id, group_id, lesson_id, status in result.all():
+            windows.setdefault(student_id, []).append([lesson_id, _is_absent(status)])
+            groups[student_id] = group_id
+
+        values = [_risk_values(student_id, groups[student_id], window) for student_id, window in windows.items()]
+        await db.execute(delete(StudentRisk))
+        await _save(db, [], values)
+        await db.commit()
+
+    at_risk = sum(1 for row in values if row["at_risk"])
+    summary = {
+        "students": len(values),
+        "at_risk": at_risk,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+    print(f"⚠️ Risk oynalari qayta qurildi: {len(values)} talaba, {at_risk} xavf ostida")
+    return summary
+
+
+async def ensure_risk_windows():
+    """Jadval bo'sh bo'lsa (yangi o'rnatish yoki migratsiya) - qayta qurish"""
+    async with async_session() as db:
+        exists = await db.scalar(select(StudentRisk.student_id).limit(1))
+    if exists is None:
+        await rebuild_risk()
+
+
+async def snapshot_risk(day: Optional[date] = None) -> dict:
+    """Joriy xavf ro'yxatini RiskSnapshot ga yozish (kunlik job; shu kun qayta yozilsa - almashtiriladi)"""
+    day = day or date.today()
+    async with async_session() as db:
+        await db.execute(delete(RiskSnapshot).where(RiskSnapshot.snapshot_date == day))
+        result = await db.execute(
+            insert(RiskSnapshot).from_select(
+                ["snapshot_date", "student_id", "group_id", "lessons", "absences", "absence_rate", "created_at"],
+                select(
+                    literal(day),
+                    StudentRisk.student_id,
+                    StudentRisk.group_id,
+                    StudentRisk.lessons,
+                    StudentRisk.absences,
+                    StudentRisk.absence_rate,
+                    literal(datetime.utcnow())
+                ).where(StudentRisk.at_risk == True)
+            )
+        )
+        await db.commit()
+    print(f"⚠️ Xavf ro'yxati saqlandi: {day} - {result.rowcount} talaba")
+    return {"date": day.isoformat(), "students": result.rowcount}
+
+
+async def daily_risk_job() -> dict:
+    await ensure_risk_windows()
+    return await snapshot_risk()
@@ -1,40 +1,72 @@
 """
 Scheduler Service - Avtomatik dars ochish/yopish
+
+Joblar faqat leader jarayonda ishlaydi (leader_service) - `uvicorn --workers N`
+da qolgan workerlar faqat HTTP so'rovlarga xizmat qiladi.
 """
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from sqlalchemy import select, and_
+from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import select, and_, or_, exists, update, insert, true, false, literal
 from datetime import datetime, date, timedelta
+from typing import Optional
+import asyncio
+import os
+import sqlite3
+import time
 
-from app.database import async_session
+from app.database import async_session, DATABASE_PATH
 from app.models.schedule import Schedule
 from app.models.lesson import Lesson, LessonStatus
+from app.models.data_version import bump_data_version, group_scope, LESSONS
 from app.config import settings
+from app.services.metrics_service import (
+    timed_job, instrument_scheduler, scheduler_leader,
+    db_maintenance_duration, db_file_size, db_freelist_pages
+)
+from app.services.leader_service import LeaderLock
+from app.services.archive_service import archive_closed_semesters
+from app.services.backup_service import run_backup
+from app.services.risk_service import record_closed_lessons, ensure_risk_windows, daily_risk_job
+from app.services import notification_service
+from app.models.notification import Notification, NotificationKind
 
 scheduler = AsyncIOScheduler()
+leader_lock = LeaderLock(settings.SCHEDULER_LOCK_PATH)
+_election_task: Optional[asyncio.Task] = None
 
 
 async def auto_open_lessons():
     """Darslarni avtomatik ochish (darsdan 5 daqiqa oldin)"""
     async with async_session() as db:
         now = datetime.now()
-        today = date.today()
+        today = now.date()
         day_of_week = today.weekday()
         
-        # 5 daqiqadan keyin boshlanadigan darslar
-        target_time = (now + timedelta(minutes=settings.LESSON_OPEN_BEFORE_MINUTES)).time()
+        # Ochilish oynasi: 5 daqiqadan keyingacha boshlanadigan, hali yopilmasligi kerak
+        # bo'lgan darslar. Aniq daqiqa tengligi emas - start_time soniyalarsiz, job esa
+        # soniya/mikrosoniyalar bilan ishlaydi (va kechikishi mumkin)
+        open_cutoff = now + timedelta(minutes=settings.LESSON_OPEN_BEFORE_MINUTES)
+        close_cutoff = now - timedelta(minutes=settings.LESSON_CLOSE_AFTER_MINUTES)
         
-        # Bugungi, target vaqtda boshlanadigan jadvallar
+        # Bugungi, oynadagi va hali ochilmagan jadvallar
         result = await db.execute(
             select(Schedule).where(
                 and_(
                     Schedule.day_of_week == day_of_week,
-                    Schedule.start_time == target_time,
-                    Schedule.is_active == True
+                    _schedule_starts_by(today, open_cutoff),
+                    ~_schedule_starts_by(today, close_cutoff),
+                    Schedule.is_active == True,
+                    ~exists().where(
+                        Lesson.schedule_id == Schedule.id,
+                        Lesson.date == today,
+                        Lesson.status != LessonStatus.PENDING.value
+                    )
                 )
             )
         )
         schedules = result.scalars().all()
+        opened = []
         
         for schedule in schedules:
             # Lesson mavjudmi tekshirish
@@ -57,13 +89,21 @@ async def auto_open_lessons():
                     opened_at=now
                 )
                 db.add(lesson)
+                opened.append(lesson)
                 print(f"✅ Dars ochildi: Schedule #{schedule.id}")
             elif lesson.status == LessonStatus.PENDING.value:
                 lesson.status = LessonStatus.OPEN.value
                 lesson.opened_at = now
+                opened.append(lesson)
                 print(f"✅ Dars ochildi: Lesson #{lesson.id}")
         
+        if opened:
+            await db.flush()
+            await notification_service.enqueue(
+                db, NotificationKind.LESSON_OPENED.value, [lesson.id for lesson in opened]
+            )
         await db.commit()
+        return len(opened)
 
 
 async def auto_close_lessons():
@@ -84,6 +124,8 @@ async def auto_close_lessons():
             )
         )
         lessons = result.scalars().all()
+        closed = []
+        groups = set()
         
         for lesson in lessons:
             # Schedule olish
@@ -100,33 +142,397 @@ async def auto_close_lessons():
                 if now >= close_time:
                     lesson.status = LessonStatus.CLOSED.value
                     lesson.closed_at = now
+                    closed.append(lesson.id)
+                    groups.add(schedule.group_id)
                     print(f"🔴 Dars yopildi: Lesson #{lesson.id}")
         
+        if closed:
+            await bump_data_version(db, LESSONS, *map(group_scope, groups))
+            await record_closed_lessons(db, closed)
         await db.commit()
 
 
-async def start_scheduler():
-    """Schedulerni ishga tushirish"""
+def _starts_by(moment: datetime):
+    """Dars boshlanishi (Lesson.date + Schedule.start_time) <= moment"""
+    return or_(
+        Lesson.date < moment.date(),
+        and_(Lesson.date == moment.date(), Schedule.start_time <= moment.time())
+    )
+
+
+def _schedule_starts_by(day: date, moment: datetime):
+    """`day` kuni Schedule.start_time da boshlanadigan dars <= moment"""
+    if day < moment.date():
+        return true()
+    if day > moment.date():
+        return false()
+    return Schedule.start_time <= moment.time()
+
+
+async def reconcile_lessons(now: Optional[datetime] = None) -> dict:
+    """
+    Darslar holatini vaqtga moslashtirish (restart/downtime dan keyin).
+
+    Har qanday sana uchun, to'plam (set-based) so'rovlar bilan:
+    - yopilish vaqti o'tgan ochiq/kutilayotgan darslar -> closed
+    - hozir ochiq bo'lishi kerak bo'lgan kutilayotgan darslar -> open
+    - hozir ochiq bo'lishi kerak, lekin yaratilmagan darslar -> yangi (open)
+    Hammasi bitta tranzaksiyada.
+    """
+    now = now or datetime.now()
+    started = time.perf_counter()
+    open_cutoff = now + timedelta(minutes=settings.LESSON_OPEN_BEFORE_MINUTES)
+    close_cutoff = now - timedelta(minutes=settings.LESSON_CLOSE_AFTER_MINUTES)
+
+    async with async_session() as db:
+        result = await db.execute(
+            update(Lesson)
+            .where(
+                Lesson.status.in_([LessonStatus.PENDING.value, LessonStatus.OPEN.value]),
+                exists().where(Schedule.id == Lesson.schedule_id, _starts_by(close_cutoff))
+            )
+            .values(status=LessonStatus.CLOSED.value, closed_at=now)
+            .returning(Lesson.id)
+            .execution_options(synchronize_session=False)
+        )
+        closed_ids = result.scalars().all()
+        closed = len(closed_ids)
+        if closed:
+            groups = await db.execute(
+                select(Schedule.group_id).distinct()
+                .join(Lesson, Lesson.schedule_id == Schedule.id)
+                .where(Lesson.id.in_(closed_ids))
+            )
+            await bump_data_version(db, LESSONS, *map(group_scope, groups.scalars()))
+            await record_closed_lessons(db, closed_ids)
+
+        result = await db.execute(
+            update(Lesson)
+            .where(
+                Lesson.status == LessonStatus.PENDING.value,
+                exists().where(
+                    Schedule.id == Lesson.schedule_id,
+                    Schedule.is_active == True,
+                    _starts_by(open_cutoff)
+                )
+            )
+            .values(status=LessonStatus.OPEN.value, opened_at=now)
+            .returning(Lesson.id)
+            .execution_options(synchronize_session=False)
+        )
+        opened_ids = list(result.scalars().all())
+        opened = len(opened_ids)
+
+        # Ochiq bo'lishi kerak bo'lgan, lekin hali yaratilmagan darslar
+        # (oyna yarim tundan o'tsa - bir nechta sana)
+        created = 0
+        for day in sorted({close_cutoff.date(), now.date(), open_cutoff.date()}):
+            missing = (
+                select(
+                    Schedule.id,
+                    literal(day),
+                    literal(LessonStatus.OPEN.value),
+                    literal(now),
+                    literal(now)
+                )
+                .where(
+                    Schedule.is_active == True,
+                    Schedule.day_of_week == day.weekday(),
+                    _schedule_starts_by(day, open_cutoff),
+                    ~_schedule_starts_by(day, close_cutoff),
+                    ~exists().where(Lesson.schedule_id == Schedule.id, Lesson.date == day)
+                )
+            )
+            result = await db.execute(
+                insert(Lesson).from_select(
+                    ["schedule_id", "date", "status", "opened_at", "created_at"], missing
+                ).returning(Lesson.id)
+            )
+            created_ids = result.scalars().all()
+            created += len(created_ids)
+            opened_ids.extend(created_ids)
+
+        await notification_service.enqueue(db, NotificationKind.LESSON_OPENED.value, opened_ids)
+        await db.commit()
+
+    summary = {
+        "closed": closed,
+        "opened": opened,
+        "created": created,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+    if closed or opened or created:
+        print(f"🔄 Darslar moslashtirildi: {closed} yopildi, {opened} ochildi, {created} yaratildi")
+    return summary
+
+
+async def notify_closing_lessons(now: Optional[datetime] = None) -> int:
+    """Yopilishiga NOTIFY_CLOSING_BEFORE_MINUTES qolgan ochiq darslar uchun eslatma"""
+    if not settings.NOTIFY_ENABLED:
+        return 0
+    now = now or datetime.now()
+    remind_after = settings.LESSON_CLOSE_AFTER_MINUTES - settings.NOTIFY_CLOSING_BEFORE_MINUTES
+    async with async_session() as db:
+        result = await db.execute(
+            select(Lesson.id)
+            .join(Schedule, Schedule.id == Lesson.schedule_id)
+            .where(
+                Lesson.status == LessonStatus.OPEN.value,
+                _starts_by(now - timedelta(minutes=remind_after)),
+                ~exists().where(
+                    Notification.lesson_id == Lesson.id,
+                    Notification.kind == NotificationKind.LESSON_CLOSING.value
+                )
+            )
+        )
+        lesson_ids = result.scalars().all()
+        await notification_service.enqueue(db, NotificationKind.LESSON_CLOSING.value, lesson_ids)
+        await db.commit()
+    return len(lesson_ids)
+
+
+def _file_sizes() -> dict:
+    sizes = {}
+    for name, path in (("db", DATABASE_PATH), ("wal", f"{DATABASE_PATH}-wal")):
+        try:
+            sizes[name] = os.path.getsize(path)
+        except OSError:
+            sizes[name] = 0
+        if settings.METRICS_ENABLED:
+            db_file_size.labels(name).set(sizes[name])
+    return sizes
+
+
+def _convert_auto_vacuum(conn: sqlite3.Connection) -> dict:
+    """
+    auto_vacuum ni INCREMENTAL ga o'tkazish - bir martalik to'liq VACUUM.
+
+    VACUUM butun bazani qayta yozadi va shu vaqt davomida yozuvchilar kutadi,
+    shuning uchun faqat tinch soatda (maintenance) yoki admin buyrug'i bilan.
+    MAINTENANCE_FULL_VACUUM_SECONDS dan oshsa progress handler uni to'xtatadi -
+    tranzaksiya bekor qilinadi, baza o'zgarmaydi, keyingi maintenance da qayta.
+    """
+    free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    deadline = time.monotonic() + settings.MAINTENANCE_FULL_VACUUM_SECONDS
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+    try:
+        conn.execute("VACUUM")
+    except sqlite3.OperationalError as e:
+        print(f"⚠️ To'liq VACUUM bajarilmadi: {e}")
+        return {"converted": False, "error": str(e), "freed_pages": 0}
+    finally:
+        conn.set_progress_handler(None, 0)
+    converted = conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    if converted:
+        print("🧹 Baza auto_vacuum=INCREMENTAL ga o'tkazildi (to'liq VACUUM)")
+    return {"converted": converted, "freed_pages": free}
+
+
+def _maintenance_sync(checkpoint_only: bool, checkpoint_mode: str, full_vacuum: bool = False) -> dict:
+    """
+    Maintenance qadamlari (alohida sqlite3 ulanishida, threadda).
+
+    incremental_vacuum executescript orqali - oddiy execute() pragma ni faqat
+    bir qadam bajaradi (bitta sahifa). Baza hali INCREMENTAL bo'lmasa, avval
+    bir martalik to'liq VACUUM (MAINTENANCE_CONVERT_AUTO_VACUUM yoki full_vacuum).
+    """
+    report = {"steps": {}}
+    deadline = time.monotonic() + settings.MAINTENANCE_BUDGET_SECONDS
+    conn = sqlite3.connect(DATABASE_PATH, timeout=settings.SQLITE_BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+
+    def step(name, func):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        report["steps"][name] = round(elapsed * 1000, 1)
+        if settings.METRICS_ENABLED:
+            db_maintenance_duration.labels(name).observe(elapsed)
+        return result
+
+    try:
+        if not checkpoint_only:
+            # 1. Planner statistikasi (analysis_limit - katta jadvallarda ham tez)
+            def analyze():
+                conn.execute(f"PRAGMA analysis_limit={settings.MAINTENANCE_ANALYSIS_LIMIT}")
+                analyzed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+                conn.execute("PRAGMA optimize" if analyzed else "ANALYZE")
+                return "optimize" if analyzed else "analyze"
+            report["analyze"] = step("analyze", analyze)
+
+            # 2. Bo'sh sahifalarni qaytarish - vaqt byudjeti ichida, bo'laklab
+            def vacuum():
+                freed = 0
+                if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                    if full_vacuum or settings.MAINTENANCE_CONVERT_AUTO_VACUUM:
+                        return _convert_auto_vacuum(conn)
+                    return {"skipped": "auto_vacuum INCREMENTAL emas (to'liq VACUUM kerak)", "freed_pages": 0}
+                free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                while free and time.monotonic() < deadline:
+                    conn.executescript(f"PRAGMA incremental_vacuum({settings.MAINTENANCE_VACUUM_PAGES})")
+                    remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                    freed += free - remaining
+                    free = remaining
+                return {"freed_pages": freed}
+            report["vacuum"] = step("incremental_vacuum", vacuum)
+
+        # 3. WAL ni asosiy faylga ko'chirish
+        def checkpoint():
+            busy, wal_pages, moved = conn.execute(f"PRAGMA wal_checkpoint({checkpoint_mode})").fetchone()
+            return {"mode": checkpoint_mode, "busy": bool(busy), "wal_pages": wal_pages, "checkpointed": moved}
+        report["checkpoint"] = step("wal_checkpoint", checkpoint)
+
+        freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        report["freelist_pages"] = freelist
+        if settings.METRICS_ENABLED:
+            db_freelist_pages.set(freelist)
+    finally:
+        conn.close()
+
+    report["sizes"] = _file_sizes()
+    return report
+
+
+async def database_maintenance(full_vacuum: bool = False) -> dict:
+    """
+    Kunlik maintenance: ANALYZE/optimize, incremental vacuum, WAL checkpoint (TRUNCATE).
+    full_vacuum - auto_vacuum o'tkazish sozlamada o'chirilgan bo'lsa ham (admin)
+    """
+    if DATABASE_PATH is None:
+        return {"skipped": "SQLite fayl emas"}
+    report = await asyncio.to_thread(_maintenance_sync, False, "TRUNCATE", full_vacuum)
+    print(f"🧹 Baza maintenance: {report['steps']} bo'sh sahifalar: {report['freelist_pages']}")
+    return report
+
+
+async def checkpoint_wal() -> dict:
+    """WAL checkpoint (PASSIVE - yozuvchi va o'quvchilarni kutmaydi)"""
+    if DATABASE_PATH is None:
+        return {"skipped": "SQLite fayl emas"}
+    return await asyncio.to_thread(_maintenance_sync, True, "PASSIVE")
+
+
+def _start_jobs():
+    """Leader jarayonda joblarni ro'yxatdan o'tkazish va schedulerni ishga tushirish"""
+    if settings.METRICS_ENABLED:
+        instrument_scheduler(scheduler)
+        scheduler_leader.set(1)
+
     # Har daqiqada tekshirish
     scheduler.add_job(
-        auto_open_lessons,
+        timed_job("auto_open_lessons", auto_open_lessons),
         IntervalTrigger(minutes=1),
         id="auto_open_lessons",
         replace_existing=True
     )
     
     scheduler.add_job(
-        auto_close_lessons,
+        timed_job("auto_close_lessons", auto_close_lessons),
         IntervalTrigger(minutes=1),
         id="auto_close_lessons",
         replace_existing=True
     )
+
+    # Moslashtirish - darhol (restartdan keyin) va vaqti-vaqti bilan
+    scheduler.add_job(
+        timed_job("reconcile_lessons", reconcile_lessons),
+        IntervalTrigger(minutes=settings.RECONCILE_INTERVAL_MINUTES),
+        id="reconcile_lessons",
+        next_run_time=datetime.now(),
+        replace_existing=True
+    )
+
+    if settings.NOTIFY_ENABLED:
+        scheduler.add_job(
+            timed_job("notify_closing_lessons", notify_closing_lessons),
+            IntervalTrigger(minutes=1),
+            id="notify_closing_lessons",
+            replace_existing=True
+        )
+        scheduler.add_job(
+            timed_job("purge_notifications", notification_service.purge_sent),
+            CronTrigger(hour=settings.MAINTENANCE_HOUR, minute=0),
+            id="purge_notifications",
+            replace_existing=True
+        )
+
+    if settings.MAINTENANCE_ENABLED:
+        scheduler.add_job(
+            timed_job("database_maintenance", database_maintenance),
+            CronTrigger(hour=settings.MAINTENANCE_HOUR, minute=30),
+            id="database_maintenance",
+            replace_existing=True
+        )
+        scheduler.add_job(
+            timed_job("wal_checkpoint", checkpoint_wal),
+            IntervalTrigger(minutes=settings.WAL_CHECKPOINT_INTERVAL_MINUTES),
+            id="wal_checkpoint",
+            replace_existing=True
+        )
+
+    if settings.BACKUP_ENABLED:
+        scheduler.add_job(
+            timed_job("backup", run_backup),
+            CronTrigger(hour=settings.BACKUP_HOUR, minute=0),
+            id="backup",
+            replace_existing=True
+        )
+
+    # Xavf oynalari: bo'sh bo'lsa - darhol qurish; har kuni ro'yxatni saqlash
+    scheduler.add_job(
+        timed_job("ensure_risk_windows", ensure_risk_windows),
+        id="ensure_risk_windows",
+        next_run_time=datetime.now(),
+        replace_existing=True
+    )
+    scheduler.add_job(
+        timed_job("risk_snapshot", daily_risk_job),
+        CronTrigger(hour=settings.RISK_SNAPSHOT_HOUR, minute=0),
+        id="risk_snapshot",
+        replace_existing=True
+    )
+
+    if settings.ARCHIVE_ENABLED:
+        scheduler.add_job(
+            timed_job("archive_closed_semesters", archive_closed_semesters),
+            CronTrigger(hour=settings.ARCHIVE_HOUR, minute=0),
+            id="archive_closed_semesters",
+            replace_existing=True
+        )
     
     scheduler.start()
-    print("⏰ Scheduler ishga tushdi")
+    print(f"⏰ Scheduler ishga tushdi (leader, pid {os.getpid()})")
+
+
+async def _wait_for_leadership():
+    """Leader bo'lguncha vaqti-vaqti bilan qulfni olishga urinish"""
+    while not leader_lock.acquire():
+        await asyncio.sleep(settings.SCHEDULER_LEADER_RETRY_SECONDS)
+    _start_jobs()
+
+
+async def start_scheduler():
+    """Schedulerni ishga tushirish (faqat leader jarayonda)"""
+    global _election_task
+    if not settings.SCHEDULER_ENABLED:
+        return
+    if settings.METRICS_ENABLED:
+        scheduler_leader.set(0)
+
+    if leader_lock.acquire():
+        _start_jobs()
+    else:
+        print(f"⏰ Scheduler boshqa jarayonda ishlayapti (pid {os.getpid()} kutmoqda)")
+        _election_task = asyncio.create_task(_wait_for_leadership())
 
 
 async def stop_scheduler():
     """Schedulerni to'xtatish"""
-    scheduler.shutdown()
-    print("⏰ Scheduler to'xtatildi")
+    global _election_task
+    if _election_task is not None:
+        _election_task.cancel()
+        _election_task = None
+    if scheduler.running:
+        scheduler.shutdown()
+        print("⏰ Scheduler to'xtatildi")
+    leader_lock.release()
@@ -0,0 +1,353 @@
+"""
+Snapshot Service - davomatning jarayon ichidagi ustunli (columnar) nusxasi
+
+SNAPSHOT_ENABLED=True bo'lsa statistika, trend, matritsa va admin umumiy
+hisoblari SQLite o'rniga numpy ustunlarida (vektorli filtr + bincount) bajariladi.
+Xavf ro'yxati bu yerdan o'qilmaydi - u yozish yo'llarida yangilanadigan
+StudentRisk jadvalidan (risk_service) to'g'ridan-to'g'ri olinadi:
+
+- davomat: id, lesson_id, student_id, day (1970-01-01 dan kunlar), subject_id,
+  group_id, status (kod); dars: id, day, group_id, subject_id, closed.
+- Birinchi yuklash (va HISTORY versiyasi o'zgarsa - to'liq qayta yuklash)
+  fonda bajariladi; tayyor bo'lguncha so'rovlar SQL ga qaytadi.
+- ATTENDANCE o'zgarsa - delta: oxirgi yangilangan kundan beri darslar
+  davomati (va yangi id lar) qayta o'qiladi; o'tgan kunlardagi o'zgarishlar
+  HISTORY ni oshiradi, shuning uchun ular delta ga kirmaydi.
+- LESSONS o'zgarsa (dars yopildi) - darslar ustunlari qayta yuklanadi.
+
+Xotira: davomat qatori ~29 bayt (1.7M qator ~ 48 MB), dars qatori 17 bayt.
+Har bir uvicorn worker o'z nusxasini saqlaydi. Hajm va yangilash vaqti -
+admin stats (`snapshot`) va /metrics (snapshot_*).
+"""
+from sqlalchemy import select, func, case, cast, or_, Integer
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from itertools import chain
+from typing import Dict, Optional
+import asyncio
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.database import read_session
+from app.models.schedule import Schedule
+from app.models.lesson import Lesson, LessonStatus
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.data_version import get_data_versions, ATTENDANCE, LESSONS, HISTORY
+from app.services.metrics_service import snapshot_memory, snapshot_refresh_duration
+
+STREAM_CHUNK_ROWS = 20000
+EPOCH = date(1970, 1, 1)
+JULIAN_EPOCH = 2440587.5
+
+# Holat kodlari: ustunlar tartibi (present, late, absent, excused)
+STATUSES = [status.value for status in AttendanceStatus]
+PRESENT, LATE, ABSENT, EXCUSED = range(len(STATUSES))
+
+ATTENDANCE_COLUMNS = {
+    "id": np.int64, "lesson_id": np.int32, "student_id": np.int32, "day": np.int32,
+    "subject_id": np.int32, "group_id": np.int32, "status": np.int8
+}
+LESSON_COLUMNS = {
+    "id": np.int32, "day": np.int32, "group_id": np.int32, "subject_id": np.int32, "closed": np.int8
+}
+
+
+def to_day(value: date) -> int:
+    return (value - EPOCH).days
+
+
+def _day_column(column):
+    return cast(func.julianday(column) - JULIAN_EPOCH, Integer)
+
+
+def _attendance_select():
+    return (
+        select(
+            Attendance.id,
+            Attendance.lesson_id,
+            Attendance.student_id,
+            _day_column(Lesson.date),
+            Schedule.subject_id,
+            Schedule.group_id,
+            case(*[(Attendance.status == status, code) for code, status in enumerate(STATUSES)], else_=-1)
+        )
+        .select_from(Attendance)
+        .join(Lesson, Lesson.id == Attendance.lesson_id)
+        .join(Schedule, Schedule.id == Lesson.schedule_id)
+    )
+
+
+def _lessons_select():
+    return (
+        select(
+            Lesson.id,
+            _day_column(Lesson.date),
+            Schedule.group_id,
+            Schedule.subject_id,
+            case((Lesson.status == LessonStatus.CLOSED.value, 1), else_=0)
+        )
+        .select_from(Lesson)
+        .join(Schedule, Schedule.id == Lesson.schedule_id)
+    )
+
+
+def _empty(columns: dict) -> Dict[str, np.ndarray]:
+    return {name: np.empty(0, dtype=dtype) for name, dtype in columns.items()}
+
+
+async def _load_columns(db: AsyncSession, query, columns: dict) -> Dict[str, np.ndarray]:
+    """Oqimli o'qish: har bir bo'lak darhol ustunlarga (kerakli dtype da) ajratiladi"""
+    connection = await db.connection()
+    result = await connection.stream(query.execution_options(yield_per=STREAM_CHUNK_ROWS))
+    parts = {name: [array] for name, array in _empty(columns).items()}
+    async for partition in result.partitions():
+        chunk = np.fromiter(
+            chain.from_iterable(partition), dtype=np.int64, count=len(partition) * len(columns)
+        ).reshape(-1, len(columns))
+        for i, (name, dtype) in enumerate(columns.items()):
+            parts[name].append(chunk[:, i].astype(dtype))
+    return {name: np.concatenate(arrays) for name, arrays in parts.items()}
+
+
+def _concat(first: dict, second: dict) -> dict:
+    return {name: np.concatenate([first[name], second[name]]) for name in first}
+
+
+def _select_rows(columns: dict, mask: np.ndarray) -> dict:
+    return {name: array[mask] for name, array in columns.items()}
+
+
+class AttendanceSnapshot:
+    """Ustunli nusxa: yuklash, delta yangilash va vektorli agregatlar"""
+
+    def __init__(self):
+        self.attendance = _empty(ATTENDANCE_COLUMNS)
+        self.lessons = _empty(LESSON_COLUMNS)
+        self.closed = np.zeros(1, dtype=bool)  # lesson_id -> yopilganmi
+        self.versions = None  # (ATTENDANCE, LESSONS, HISTORY)
+        self.delta_day = 0  # Shu kundan boshlab qatorlar delta da qayta o'qiladi
+        self.max_attendance_id = 0
+        self.max_lesson_id = 0
+        self.lock = asyncio.Lock()
+        self.loading: Optional[asyncio.Task] = None
+        self.refreshes = {"full": 0, "delta": 0, "lessons": 0}
+        self.last_refresh: Dict[str, dict] = {}
+
+    # ============ YUKLASH / YANGILASH ============
+
+    def start(self):
+        """Fonda to'liq yuklashni boshlash (allaqachon ketayotgan bo'lsa - hech narsa)"""
+        if not settings.SNAPSHOT_ENABLED or (self.loading and not self.loading.done()):
+            return
+        self.loading = asyncio.create_task(self._full_load())
+
+    def shutdown(self):
+        if self.loading and not self.loading.done():
+            self.loading.cancel()
+
+    async def _full_load(self):
+        started = time.perf_counter()
+        try:
+            async with read_session() as db:
+                versions = await get_data_versions(db, ATTENDANCE, LESSONS, HISTORY)
+                attendance = await _load_columns(db, _attendance_select(), ATTENDANCE_COLUMNS)
+                lessons = await _load_columns(db, _lessons_select(), LESSON_COLUMNS)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ Snapshot yuklash xatosi: {e}")
+            return
+
+        async with self.lock:
+            self.attendance = attendance
+            self._set_lessons(lessons)
+            self.versions = versions
+            self.delta_day = to_day(date.today())
+            self.max_attendance_id = int(attendance["id"].max()) if len(attendance["id"]) else 0
+        self._observe("full", started, len(attendance["id"]))
+        print(f"📸 Snapshot yuklandi: {len(attendance['id'])} davomat, "
+              f"{self.memory_bytes() // 1024 // 1024} MB, {self.last_refresh['full']['duration_ms']:.0f} ms")
+
+    def _set_lessons(self, lessons: dict):
+        self.lessons = lessons
+        self.max_lesson_id = int(lessons["id"].max()) if len(lessons["id"]) else 0
+        closed = np.zeros(self.max_lesson_id + 1, dtype=bool)
+        closed[lessons["id"]] = lessons["closed"].astype(bool)
+        self.closed = closed
+
+    async def _delta(self, db: AsyncSession, versions: tuple):
+        """Oxirgi yangilangan kundan beri (va yangi id li) qatorlarni qayta o'qish"""
+        started = time.perf_counter()
+        cut = self.delta_day
+        cut_date = date.fromordinal(EPOCH.toordinal() + cut)
+
+        rows = 0
+        if versions[0] != self.versions[0]:
+            fresh = await _load_columns(
+                db,
+                _attendance_select().where(or_(
+                    Lesson.date >= cut_date, Attendance.id > self.max_attendance_id
+                )),
+                ATTENDANCE_COLUMNS
+            )
+            self.attendance = _concat(_select_rows(self.attendance, self.attendance["day"] < cut), fresh)
+            if len(fresh["id"]):
+                self.max_attendance_id = max(self.max_attendance_id, int(fresh["id"].max()))
+            rows = len(fresh["id"])
+
+        if versions[1] != self.versions[1]:
+            # Dars yopilishi istalgan kunda bo'lishi mumkin (reconcile) - to'liq
+            lesson_started = time.perf_counter()
+            self._set_lessons(await _load_columns(db, _lessons_select(), LESSON_COLUMNS))
+            self._observe("lessons", lesson_started, len(self.lessons["id"]))
+        elif versions[0] != self.versions[0]:
+            # Bugungi dars o'chirilgan yoki yangi yaratilgan bo'lishi mumkin
+            fresh = await _load_columns(
+                db,
+                _lessons_select().where(or_(Lesson.date >= cut_date, Lesson.id > self.max_lesson_id)),
+                LESSON_COLUMNS
+            )
+            self._set_lessons(_concat(_select_rows(self.lessons, self.lessons["day"] < cut), fresh))
+
+        self.versions = versions
+        self.delta_day = to_day(date.today())
+        self._observe("delta", started, rows)
+
+    def _observe(self, kind: str, started: float, rows: int):
+        elapsed = time.perf_counter() - started
+        self.refreshes[kind] += 1
+        self.last_refresh[kind] = {
+            "duration_ms": round(elapsed * 1000, 1),
+            "rows": rows,
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+        if settings.METRICS_ENABLED:
+            snapshot_refresh_duration.labels(kind).observe(elapsed)
+            snapshot_memory.set(self.memory_bytes())
+
+    async def current(self, db: AsyncSession) -> Optional["AttendanceSnapshot"]:
+        """
+        So'rov uchun yangilangan snapshot; o'chirilgan yoki hali tayyor
+        bo'lmasa None (chaqiruvchi SQL ga qaytadi)
+        """
+        if not settings.SNAPSHOT_ENABLED:
+            return None
+        versions = await get_data_versions(db, ATTENDANCE, LESSONS, HISTORY)
+        if self.versions is None or versions[2] != self.versions[2]:
+            self.start()
+            return None
+        if versions != self.versions:
+            async with self.lock:
+                if self.versions is None or versions[2] != self.versions[2]:
+                    return None
+                if versions != self.versions:
+                    await self._delta(db, versions)
+        return self
+
+    # ============ AGREGATLAR ============
+
+    def day_status_counts(
+        self, start: date, end: date,
+        student_id: Optional[int] = None, group_id: Optional[int] = None
+    ) -> np.ndarray:
+        """(kunlar, holatlar) matritsasi: start..end har bir kuni uchun holatlar soni"""
+        first, last = to_day(start), to_day(end)
+        columns = self.attendance
+        mask = (columns["day"] >= first) & (columns["day"] <= last) & (columns["status"] >= 0)
+        if student_id is not None:
+            mask &= columns["student_id"] == student_id
+        if group_id is not None:
+            mask &= columns["group_id"] == group_id
+        days = last - first + 1
+        index = (columns["day"][mask] - first) * len(STATUSES) + columns["status"][mask]
+        return np.bincount(index, minlength=days * len(STATUSES)).reshape(days, len(STATUSES))
+
+    def _closed_mask(self, lesson_ids: np.ndarray) -> np.ndarray:
+        """Har bir davomat yozuvi uchun: darsi yopilganmi"""
+        closed = np.zeros(len(lesson_ids), dtype=bool)
+        known = lesson_ids < len(self.closed)
+        closed[known] = self.closed[lesson_ids[known]]
+        return closed
+
+    def subject_counts(self, student_id: int, group_id: int) -> Dict[int, tuple]:
+        """fan -> (o'tilgan darslar, present, late, present+late+excused) - yopilgan darslar bo'yicha"""
+        lessons = self.lessons
+        held_mask = (lessons["group_id"] == group_id) & (lessons["closed"] == 1)
+        subjects, held = np.unique(lessons["subject_id"][held_mask], return_counts=True)
+
+        columns = self.attendance
+        closed = self._closed_mask(columns["lesson_id"])
+        mask = (columns["student_id"] == student_id) & (columns["group_id"] == group_id) & closed
+        position = np.searchsorted(subjects, columns["subject_id"][mask])
+        status = columns["status"][mask]
+        valid = (position < len(subjects)) & (status >= 0)
+        index = position[valid] * len(STATUSES) + status[valid]
+        counts = np.bincount(index, minlength=len(subjects) * len(STATUSES)).reshape(-1, len(STATUSES))
+
+        return {
+            int(subject_id): (
+                int(held[i]), int(counts[i, PRESENT]), int(counts[i, LATE]),
+                int(counts[i, PRESENT] + counts[i, LATE] + counts[i, EXCUSED])
+            )
+            for i, subject_id in enumerate(subjects)
+        }
+
+    def matrix_arrays(self, start: date, end: date):
+        """
+        matrix_service uchun: darslar (id, guruh, fan, o'tilgan) va dars bo'yicha
+        davomat (dars, belgilar, qatnashganlar) - SQL variant bilan bir xil shakl.
+        Davomat faqat yopilgan darslar bo'yicha (kutilgan qiymat ham faqat ular bo'yicha)
+        """
+        first, last = to_day(start), to_day(end)
+        lessons = self.lessons
+        mask = (lessons["day"] >= first) & (lessons["day"] <= last)
+        lesson_rows = np.column_stack([
+            lessons[name][mask].astype(np.int64) for name in ("id", "group_id", "subject_id", "closed")
+        ]).reshape(-1, 4)
+
+        columns = self.attendance
+        mask = (columns["day"] >= first) & (columns["day"] <= last)
+        mask &= self._closed_mask(columns["lesson_id"])
+        lesson_ids = columns["lesson_id"][mask]
+        attended = (columns["status"][mask] == PRESENT) | (columns["status"][mask] == LATE)
+        marks = np.bincount(lesson_ids, minlength=1)
+        present = np.bincount(lesson_ids, weights=attended, minlength=1).astype(np.int64)
+        ids = np.flatnonzero(marks)
+        return lesson_rows, np.column_stack([ids, marks[ids], present[ids]]).reshape(-1, 3)
+
+    def counts(self, day: date) -> dict:
+        """Admin umumiy statistikasi: jami va `day` kungi darslar/davomat soni"""
+        today = to_day(day)
+        return {
+            "lessons": len(self.lessons["id"]),
+            "attendance": len(self.attendance["id"]),
+            "today_lessons": int(np.count_nonzero(self.lessons["day"] == today)),
+            "today_attendance": int(np.count_nonzero(self.attendance["day"] == today))
+        }
+
+    # ============ HOLAT ============
+
+    def memory_bytes(self) -> int:
+        return (
+            sum(array.nbytes for array in self.attendance.values())
+            + sum(array.nbytes for array in self.lessons.values())
+            + self.closed.nbytes
+        )
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.SNAPSHOT_ENABLED,
+            "ready": self.versions is not None,
+            "loading": bool(self.loading and not self.loading.done()),
+            "attendance_rows": len(self.attendance["id"]),
+            "lesson_rows": len(self.lessons["id"]),
+            "memory_bytes": self.memory_bytes(),
+            "versions": self.versions,
+            "refreshes": self.refreshes,
+            "last_refresh": self.last_refresh
+        }
+
+
+snapshot = AttendanceSnapshot()
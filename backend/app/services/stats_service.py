@@ -0,0 +1,211 @@
+"""
+Stats Service - davomat statistikasi (guruhlangan so'rovlar + versiyali kesh)
+
+- Fanlar bo'yicha: kesh kaliti (talaba, talabaning o'z davomati va guruh
+  darslari versiyalari). Boshqa talabalarning belgilari kalitga
+  ta'sir qilmaydi; talabaning yangi belgisi yoki guruhda dars yopilishi
+  versiyani oshiradi - natija keyingi so'rovda qayta hisoblanadi (cache_service).
+- Trend (kun/hafta): tugagan haftalar HISTORY versiyasi bilan keshlanadi -
+  bugungi belgilashlar ularga ta'sir qilmaydi, faqat joriy hafta qayta
+  hisoblanadi.
+
+SNAPSHOT_ENABLED bo'lsa hisoblar SQLite o'rniga snapshot_service ustunlarida.
+"""
+from sqlalchemy import select, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.models.student import Student
+from app.models.schedule import Schedule
+from app.models.lesson import Lesson, LessonStatus
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.subject import Subject
+from app.models.data_version import get_data_version, get_data_versions, student_scope, group_scope, HISTORY
+from app.schemas.attendance import SubjectStats, WeeklyStats
+from app.services.cache_service import get_cache
+from app.services.snapshot_service import snapshot
+
+stats_cache = get_cache("student_stats", settings.STATS_CACHE_SIZE)
+
+TREND_BUCKETS = ("day", "week")
+TREND_DEFAULT_DAYS = 28
+TREND_MAX_DAYS = 366
+TREND_STATUSES = [status.value for status in AttendanceStatus]
+
+
+def _count_status(*statuses: AttendanceStatus):
+    return func.count(case((Attendance.status.in_([s.value for s in statuses]), 1)))
+
+
+async def subject_stats(db: AsyncSession, student: Student) -> List[SubjectStats]:
+    """
+    Fanlar bo'yicha statistika - bitta GROUP BY so'rov.
+
+    O'tilgan dars - yopilgan (closed) dars. Belgisi yo'q yoki `absent`
+    bo'lgan dars - qoldirilgan; foiz = (present + late) / o'tilgan darslar.
+    """
+    versions = await get_data_versions(db, student_scope(student.id), group_scope(student.group_id))
+    key = ("subjects", student.id, student.group_id, versions)
+    cached = stats_cache.get(key)
+    if cached is not None:
+        return cached
+
+    current = await snapshot.current(db)
+    if current is not None:
+        stats = await _subject_stats_from_snapshot(db, current, student)
+        stats_cache.set(key, stats)
+        return stats
+
+    total = func.count(Lesson.id)
+    present = _count_status(AttendanceStatus.PRESENT)
+    late = _count_status(AttendanceStatus.LATE)
+    attended = _count_status(AttendanceStatus.PRESENT, AttendanceStatus.LATE, AttendanceStatus.EXCUSED)
+    result = await db.execute(
+        select(Subject.id, Subject.name, total, present, late, total - attended)
+        .select_from(Lesson)
+        .join(Schedule, Schedule.id == Lesson.schedule_id)
+        .join(Subject, Subject.id == Schedule.subject_id)
+        .outerjoin(
+            Attendance,
+            (Attendance.lesson_id == Lesson.id) & (Attendance.student_id == student.id)
+        )
+        .where(
+            Schedule.group_id == student.group_id,
+            Lesson.status == LessonStatus.CLOSED.value
+        )
+        .group_by(Subject.id, Subject.name)
+        .order_by(Subject.name)
+    )
+
+    stats = [
+        SubjectStats(
+            subject_id=subject_id,
+            subject_name=name,
+            total_lessons=total_lessons,
+            present_count=present_count,
+            late_count=late_count,
+            absent_count=absent_count,
+            attendance_percentage=round((present_count + late_count) / total_lessons * 100, 1)
+        )
+        for subject_id, name, total_lessons, present_count, late_count, absent_count in result.all()
+    ]
+    stats_cache.set(key, stats)
+    return stats
+
+
+async def _subject_stats_from_snapshot(db: AsyncSession, current, student: Student) -> List[SubjectStats]:
+    counts = current.subject_counts(student.id, student.group_id)
+    result = await db.execute(
+        select(Subject.id, Subject.name).where(Subject.id.in_(list(counts))).order_by(Subject.name)
+    )
+    stats = []
+    for subject_id, name in result.all():
+        total, present, late, attended = counts[subject_id]
+        stats.append(SubjectStats(
+            subject_id=subject_id,
+            subject_name=name,
+            total_lessons=total,
+            present_count=present,
+            late_count=late,
+            absent_count=total - attended,
+            attendance_percentage=round((present + late) / total * 100, 1)
+        ))
+    return stats
+
+
+def trend_range(start: Optional[date], end: Optional[date]) -> Tuple[date, date]:
+    """Trend oralig'i (standart - oxirgi 4 hafta); noto'g'ri bo'lsa ValueError"""
+    end = end or date.today()
+    start = start or end - timedelta(days=TREND_DEFAULT_DAYS - 1)
+    if start > end:
+        raise ValueError("start_date end_date dan keyin bo'lmasligi kerak")
+    if (end - start).days >= TREND_MAX_DAYS:
+        raise ValueError(f"Oraliq {TREND_MAX_DAYS} kundan oshmasligi kerak")
+    return start, end
+
+
+def _empty_day(day: date) -> dict:
+    return {"date": day, **{status: 0 for status in TREND_STATUSES}}
+
+
+async def _count_days(
+    db: AsyncSession, start: date, end: date,
+    student_id: Optional[int], group_id: Optional[int]
+) -> Dict[date, dict]:
+    """Kunlar bo'yicha holatlar soni - bitta GROUP BY (lessons.date indeksi) yoki snapshot"""
+    current = await snapshot.current(db)
+    if current is not None:
+        counts = current.day_status_counts(start, end, student_id, group_id).tolist()
+        return {
+            start + timedelta(days=i): {"date": start + timedelta(days=i), **dict(zip(TREND_STATUSES, row))}
+            for i, row in enumerate(counts)
+        }
+
+    query = (
+        select(Lesson.date, Attendance.status, func.count(Attendance.id))
+        .select_from(Attendance)
+        .join(Lesson, Lesson.id == Attendance.lesson_id)
+        .where(Lesson.date.between(start, end))
+        .group_by(Lesson.date, Attendance.status)
+    )
+    if student_id is not None:
+        query = query.where(Attendance.student_id == student_id)
+    if group_id is not None:
+        query = query.join(Schedule, Schedule.id == Lesson.schedule_id).where(Schedule.group_id == group_id)
+
+    days = {start + timedelta(days=i): _empty_day(start + timedelta(days=i)) for i in range((end - start).days + 1)}
+    for day, status, count in (await db.execute(query)).all():
+        if status in days[day]:
+            days[day][status] += count
+    return days
+
+
+async def attendance_trend(
+    db: AsyncSession, start: date, end: date, bucket: str = "day",
+    student_id: Optional[int] = None, group_id: Optional[int] = None
+) -> list:
+    """
+    Davomat trendi: `day` - kunlar ro'yxati, `week` - WeeklyStats ro'yxati.
+
+    Hisob haftalar (dushanba-yakshanba) bo'yicha: tugagan haftalar keshdan,
+    keshda yo'qlari va joriy hafta bitta so'rovda hisoblanadi.
+    """
+    today = date.today()
+    end = min(end, today)
+    history = await get_data_version(db, HISTORY)
+
+    weeks = {}
+    missing = []
+    week = start - timedelta(days=start.weekday())
+    while week <= end:
+        key = ("trend", student_id, group_id, week, history)
+        cached = stats_cache.get(key) if week + timedelta(days=6) < today else None
+        if cached is not None:
+            weeks[week] = cached
+        else:
+            missing.append(week)
+        week += timedelta(days=7)
+
+    if missing:
+        last = min(missing[-1] + timedelta(days=6), today)
+        days = await _count_days(db, missing[0], last, student_id, group_id)
+        for week in missing:
+            weeks[week] = [days[week + timedelta(days=i)] for i in range(7) if week + timedelta(days=i) <= last]
+            if week + timedelta(days=6) < today:
+                stats_cache.set(("trend", student_id, group_id, week, history), weeks[week])
+
+    result = []
+    for week in sorted(weeks):
+        week_days = [day for day in weeks[week] if start <= day["date"] <= end]
+        if bucket == "day":
+            result.extend(week_days)
+            continue
+        result.append(WeeklyStats(
+            week_start=week,
+            week_end=week + timedelta(days=6),
+            days=week_days,
+            **{status: sum(day[status] for day in week_days) for status in TREND_STATUSES}
+        ))
+    return result
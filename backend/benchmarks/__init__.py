@@ -0,0 +1,3 @@
+"""
+Benchmark suite - issiq so'rovlar va endpointlar uchun
+"""
@@ -0,0 +1,111 @@
+"""
+JSON kodlash benchmarki - katta ro'yxat javoblari
+
+Bir xil 10k qatorli javobni uch usulda kodlaydi:
+    dict + jsonable_encoder + json   (FastAPI standart yo'li, JSONResponse)
+    pydantic model + jsonable_encoder + json   (response_model yo'li)
+    slots dataclass + orjson   (ORJSONResponse, app.schemas.rows)
+
+Ishlatish (backend papkasidan):
+    python -m benchmarks.encoding --rows 10000 --repeat 7
+"""
+import argparse
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+
+from app.schemas.rows import AttendanceReportRow
+
+STATUSES = ("present", "late", "absent")
+
+
+class AttendanceReportModel(BaseModel):
+    id: int
+    student_name: Optional[str]
+    student_id: Optional[str]
+    group_name: Optional[str]
+    subject_name: Optional[str]
+    date: Optional[date]
+    status: str
+    marked_at: Optional[datetime]
+
+
+def make_rows(count: int) -> List[tuple]:
+    start = datetime(2026, 9, 1, 9, 0, 0)
+    return [
+        (
+            i,
+            f"Talaba {i % 900}",
+            f"S2026{i % 900:07d}",
+            f"IT-10{i % 4}-{i % 3}",
+            "Dasturlash asoslari",
+            (start + timedelta(days=i % 90)).date(),
+            STATUSES[i % 3],
+            start + timedelta(days=i % 90, minutes=i % 50, seconds=i % 60),
+        )
+        for i in range(count)
+    ]
+
+
+def encode_dicts(rows) -> bytes:
+    content = [{
+        "id": r[0], "student_name": r[1], "student_id": r[2], "group_name": r[3],
+        "subject_name": r[4], "date": r[5].isoformat(), "status": r[6], "marked_at": r[7].isoformat()
+    } for r in rows]
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def encode_pydantic(rows) -> bytes:
+    content = [AttendanceReportModel(
+        id=r[0], student_name=r[1], student_id=r[2], group_name=r[3],
+        subject_name=r[4], date=r[5], status=r[6], marked_at=r[7]
+    ) for r in rows]
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def encode_orjson_rows(rows) -> bytes:
+    return ORJSONResponse([AttendanceReportRow(*r) for r in rows]).body
+
+
+CASES = {
+    "dict+jsonable_encoder+json": encode_dicts,
+    "pydantic+jsonable_encoder+json": encode_pydantic,
+    "dataclass(slots)+orjson": encode_orjson_rows,
+}
+
+
+def measure(func: Callable, rows, repeat: int) -> dict:
+    func(rows)  # isitish
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(func(rows))
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "bytes": size}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JSON kodlash benchmarki")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rows = make_rows(args.rows)
+    results = {name: measure(func, rows, args.repeat) for name, func in CASES.items()}
+    baseline = results["dict+jsonable_encoder+json"]["median_ms"]
+
+    print(f"{args.rows} qator, {args.repeat} marta")
+    print(f"{'usul':<34}{'median ms':>11}{'min ms':>10}{'bayt':>11}{'tezlik':>9}")
+    for name, r in results.items():
+        print(f"{name:<34}{r['median_ms']:>11.2f}{r['min_ms']:>10.2f}{r['bytes']:>11}"
+              f"{baseline / r['median_ms']:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
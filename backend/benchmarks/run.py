@@ -0,0 +1,415 @@
+"""
+Benchmark runner - har bir issiq yo'l uchun bitta holat
+
+Har bir holat bir necha o'lchamdagi sintetik bazada (dataset_service)
+ishlaydi va vaqt (median/p95), SQL so'rovlar soni va ajratilgan xotira
+(tracemalloc peak) ni yozadi.
+
+Ishlatish (backend papkasidan):
+    python -m benchmarks.run --sizes small,medium
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --tolerance 0.25
+
+Har bir o'lcham alohida jarayonda ishlaydi, chunki `app.database` engine
+import paytida `DATABASE_URL` dan yaratiladi.
+"""
+import argparse
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.services.dataset_service import DatasetConfig, generate_dataset
+
+BENCH_DIR = Path(__file__).resolve().parent
+DATA_DIR = BENCH_DIR / ".data"
+
+# Generator o'lchamlari: user_id=1 - birinchi o'qituvchi (admin sifatida ishlatiladi)
+ADMIN_TELEGRAM_ID = 1_000_000_001
+
+SIZES: Dict[str, DatasetConfig] = {
+    "small": DatasetConfig(directions=2, courses=2, groups_per_course=2, students_per_group=20,
+                           teachers=10, weeks=8),
+    "medium": DatasetConfig(directions=6, courses=4, groups_per_course=3, students_per_group=25,
+                            teachers=60, weeks=16),
+    "large": DatasetConfig(directions=10, courses=4, groups_per_course=8, students_per_group=30,
+                           teachers=200, weeks=16),
+}
+
+
+def dataset_config(size: str) -> DatasetConfig:
+    """Bugungi kun semestr ichida bo'ladigan konfiguratsiya"""
+    config = SIZES[size]
+    today = date.today()
+    monday = today - timedelta(days=today.weekday())
+    weeks_back = min(10, max(0, config.weeks - 2))
+    return replace(config, semester_start=monday - timedelta(weeks=weeks_back), today=today)
+
+
+def schema_hash() -> str:
+    """
+    Modellar DDL (jadvallar va indekslar) xeshi - keshlangan baza nomiga
+    qo'shiladi: model yoki indeks o'zgarsa eski baza ishlatilmaydi, qayta yaratiladi
+    """
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.schema import CreateIndex, CreateTable
+
+    from app import models  # noqa: F401
+    from app.database import Base
+
+    dialect = sqlite.dialect()
+    ddl = []
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        ddl += sorted(str(CreateIndex(index).compile(dialect=dialect)) for index in table.indexes)
+    return hashlib.sha1("\n".join(ddl).encode()).hexdigest()[:10]
+
+
+def dataset_path(size: str) -> Path:
+    config = dataset_config(size)
+    return DATA_DIR / f"{size}-{config.seed}-{config.semester_start.isoformat()}-{schema_hash()}.db"
+
+
+def ensure_dataset(size: str) -> Path:
+    """Bazani kerak bo'lsa yaratish (keshlanadi)"""
+    path = dataset_path(size)
+    if path.exists():
+        return path
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    for stale in DATA_DIR.glob(f"{size}-*.db"):
+        stale.unlink()
+    tmp = path.with_suffix(".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    print(f"⏳ Dataset yaratilmoqda: {size}")
+    summary = generate_dataset(dataset_config(size), database_url=f"sqlite+aiosqlite:///{tmp}")
+    tmp.rename(path)
+    print(f"✅ {size}: {summary.as_dict()}")
+    return path
+
+
+# ============ WORKER (alohida jarayon) ============
+
+@dataclass
+class Context:
+    """Holatlar uchun tayyorlangan foydalanuvchilar va ID lar"""
+    student_user: object
+    teacher_user: object
+    admin_user: object
+    student_id: int
+    group_id: int
+    closed_lesson_id: int
+    open_lesson_id: int
+
+
+@dataclass
+class Case:
+    name: str
+    run: Callable[[Context, object], Awaitable]
+    prepare: Optional[Callable[[Context, object], Awaitable]] = None
+
+
+async def call_endpoint(func, **kwargs):
+    """Endpointni to'g'ridan-to'g'ri chaqirish (Query(...) defaultlarini qiymatga aylantirib)"""
+    for name, param in inspect.signature(func).parameters.items():
+        if name in kwargs:
+            continue
+        default = param.default
+        if hasattr(default, "default") and default.__class__.__module__.startswith("fastapi"):
+            kwargs[name] = default.default
+    return await func(**kwargs)
+
+
+def build_cases() -> List[Case]:
+    from sqlalchemy import delete
+
+    from app.api import admin, attendance, schedule, student, teacher
+    from app.models.attendance import Attendance
+    from app.schemas.attendance import AttendanceCreate
+    from app.services import scheduler_service
+
+    async def reset_mark(ctx: Context, db):
+        await db.execute(delete(Attendance).where(
+            Attendance.lesson_id == ctx.open_lesson_id,
+            Attendance.student_id == ctx.student_id,
+        ))
+        await db.commit()
+
+    return [
+        Case("student.get_today_lessons", lambda ctx, db: call_endpoint(
+            student.get_today_lessons, current_user=ctx.student_user, db=db)),
+        Case("student.get_stats", lambda ctx, db: call_endpoint(
+            student.get_stats, current_user=ctx.student_user, db=db)),
+        Case("teacher.get_today_lessons", lambda ctx, db: call_endpoint(
+            teacher.get_today_lessons, current_user=ctx.teacher_user, db=db)),
+        Case("teacher.get_lesson_attendance", lambda ctx, db: call_endpoint(
+            teacher.get_lesson_attendance, lesson_id=ctx.closed_lesson_id,
+            current_user=ctx.teacher_user, db=db)),
+        Case("attendance.mark_attendance", lambda ctx, db: call_endpoint(
+            attendance.mark_attendance, data=AttendanceCreate(lesson_id=ctx.open_lesson_id),
+            current_user=ctx.student_user, db=db), prepare=reset_mark),
+        Case("admin.get_stats", lambda ctx, db: call_endpoint(
+            admin.get_stats, current_user=ctx.admin_user, db=db)),
+        Case("admin.get_attendance_report", lambda ctx, db: call_endpoint(
+            admin.get_attendance_report, current_user=ctx.admin_user, db=db)),
+        Case("admin.get_attendance_matrix", lambda ctx, db: call_endpoint(
+            admin.get_attendance_matrix, current_user=ctx.admin_user, db=db)),
+        Case("schedule.get_week_schedule", lambda ctx, db: call_endpoint(
+            schedule.get_week_schedule, group_id=ctx.group_id, db=db)),
+        Case("scheduler.auto_open_lessons", lambda ctx, db: scheduler_service.auto_open_lessons()),
+        Case("scheduler.auto_close_lessons", lambda ctx, db: scheduler_service.auto_close_lessons()),
+    ]
+
+
+async def prepare_context(db) -> Context:
+    from sqlalchemy import select
+
+    from app.models.lesson import Lesson, LessonStatus
+    from app.models.schedule import Schedule
+    from app.models.student import Student
+    from app.models.teacher import Teacher
+    from app.models.user import User
+
+    student = (await db.execute(select(Student).order_by(Student.id).limit(1))).scalar_one()
+    student_user = await db.get(User, student.user_id)
+    admin_user = (await db.execute(select(User).where(User.telegram_id == ADMIN_TELEGRAM_ID))).scalar_one()
+
+    # Bugun darsi bor o'qituvchi (yakshanba bo'lsa - istalgani)
+    today = date.today()
+    teacher_id = await db.scalar(
+        select(Schedule.teacher_id).where(Schedule.day_of_week == today.weekday()).limit(1)
+    ) or 1
+    teacher = await db.get(Teacher, teacher_id)
+    teacher_user = await db.get(User, teacher.user_id)
+
+    closed_lesson_id = await db.scalar(
+        select(Lesson.id)
+        .join(Schedule, Schedule.id == Lesson.schedule_id)
+        .where(Schedule.teacher_id == teacher_id, Lesson.status == LessonStatus.CLOSED.value)
+        .order_by(Lesson.id.desc())
+        .limit(1)
+    )
+
+    # Davomat qilish uchun hozir ochiq dars
+    now = datetime.now()
+    bench_schedule = Schedule(
+        group_id=student.group_id, subject_id=1, teacher_id=teacher_id, day_of_week=today.weekday(),
+        start_time=now.time(), end_time=(now + timedelta(minutes=80)).time(), room="BENCH", is_active=False,
+    )
+    db.add(bench_schedule)
+    await db.flush()
+    open_lesson = Lesson(schedule_id=bench_schedule.id, date=today,
+                         status=LessonStatus.OPEN.value, opened_at=now)
+    db.add(open_lesson)
+    await db.commit()
+
+    return Context(
+        student_user=student_user,
+        teacher_user=teacher_user,
+        admin_user=admin_user,
+        student_id=student.id,
+        group_id=student.group_id,
+        closed_lesson_id=closed_lesson_id,
+        open_lesson_id=open_lesson.id,
+    )
+
+
+async def cleanup_context(db, ctx: Context):
+    from sqlalchemy import delete
+
+    from app.models.attendance import Attendance
+    from app.models.lesson import Lesson
+    from app.models.schedule import Schedule
+
+    await db.execute(delete(Attendance).where(Attendance.lesson_id == ctx.open_lesson_id))
+    await db.execute(delete(Schedule).where(Schedule.room == "BENCH"))
+    await db.execute(delete(Lesson).where(Lesson.id == ctx.open_lesson_id))
+    await db.commit()
+
+
+async def run_worker(iterations: int, case_filter: Optional[List[str]]) -> Dict[str, dict]:
+    from sqlalchemy import event
+
+    from app.database import async_session, engine
+
+    query_count = 0
+
+    def count_query(*_args):
+        nonlocal query_count
+        query_count += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+
+    async with async_session() as db:
+        ctx = await prepare_context(db)
+
+    results = {}
+    try:
+        for case in build_cases():
+            if case_filter and case.name not in case_filter:
+                continue
+
+            async def once(traced: bool = False):
+                nonlocal query_count
+                if case.prepare:
+                    async with async_session() as db:
+                        await case.prepare(ctx, db)
+                async with async_session() as db:
+                    query_count = 0
+                    if traced:
+                        tracemalloc.start()
+                    started = time.perf_counter()
+                    await case.run(ctx, db)
+                    elapsed = time.perf_counter() - started
+                    peak = 0
+                    if traced:
+                        peak = tracemalloc.get_traced_memory()[1]
+                        tracemalloc.stop()
+                    await db.commit()
+                return elapsed, query_count, peak
+
+            await once()  # isitish
+            timings = []
+            queries = 0
+            for _ in range(iterations):
+                elapsed, queries, _ = await once()
+                timings.append(elapsed * 1000)
+            _, _, peak = await once(traced=True)
+
+            timings.sort()
+            results[case.name] = {
+                "iterations": iterations,
+                "median_ms": round(statistics.median(timings), 3),
+                "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+                "min_ms": round(timings[0], 3),
+                "queries": queries,
+                "peak_kib": round(peak / 1024, 1),
+            }
+            print(f"  {case.name:<32} {results[case.name]['median_ms']:>10.2f} ms "
+                  f"{queries:>5} q {results[case.name]['peak_kib']:>10.1f} KiB", flush=True)
+    finally:
+        async with async_session() as db:
+            await cleanup_context(db, ctx)
+        await engine.dispose()
+
+    return results
+
+
+# ============ ASOSIY JARAYON ============
+
+def run_size(size: str, iterations: int, case_filter: Optional[List[str]]) -> Dict[str, dict]:
+    db_path = ensure_dataset(size)
+    print(f"▶️  {size} ({db_path.name})", flush=True)
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite+aiosqlite:///{db_path}",
+        "ADMIN_IDS": str(ADMIN_TELEGRAM_ID),
+        "DEBUG": "False",
+    })
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+        output = tmp.name
+    try:
+        cmd = [sys.executable, "-m", "benchmarks.run", "--worker", "--iterations", str(iterations),
+               "--worker-output", output]
+        if case_filter:
+            cmd += ["--cases", ",".join(case_filter)]
+        subprocess.run(cmd, env=env, cwd=BENCH_DIR.parent, check=True)
+        with open(output) as f:
+            return json.load(f)
+    finally:
+        os.unlink(output)
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> List[str]:
+    """Bazaviy natijaga nisbatan regressiyalarni topish"""
+    regressions = []
+    for size, cases in current["results"].items():
+        base_cases = baseline.get("results", {}).get(size, {})
+        for name, result in cases.items():
+            base = base_cases.get(name)
+            if not base:
+                continue
+            delta = result["median_ms"] - base["median_ms"]
+            if delta > min_delta_ms and result["median_ms"] > base["median_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{size}/{name}: {base['median_ms']:.2f} -> {result['median_ms']:.2f} ms "
+                    f"(+{delta / base['median_ms'] * 100:.0f}%)"
+                )
+            if result["queries"] > base["queries"]:
+                regressions.append(f"{size}/{name}: so'rovlar {base['queries']} -> {result['queries']}")
+            if result["peak_kib"] > base["peak_kib"] * (1 + tolerance) + 64:
+                regressions.append(
+                    f"{size}/{name}: xotira {base['peak_kib']:.0f} -> {result['peak_kib']:.0f} KiB"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Oriental Attendance benchmark suite")
+    parser.add_argument("--sizes", default="small,medium", help=f"Vergul bilan: {','.join(SIZES)}")
+    parser.add_argument("--cases", default=None, help="Faqat shu holatlar (vergul bilan)")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--output", default=None, help="Natijani JSON faylga yozish")
+    parser.add_argument("--save-baseline", default=None, help="Natijani bazaviy fayl sifatida saqlash")
+    parser.add_argument("--compare", default=None, help="Bazaviy fayl bilan solishtirish")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Ruxsat etilgan sekinlashish (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="Shovqin chegarasi (ms)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    case_filter = [c.strip() for c in args.cases.split(",")] if args.cases else None
+
+    if args.worker:
+        results = asyncio.run(run_worker(args.iterations, case_filter))
+        with open(args.worker_output, "w") as f:
+            json.dump(results, f)
+        return 0
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"Noma'lum o'lcham: {', '.join(unknown)}")
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "iterations": args.iterations,
+        },
+        "results": {size: run_size(size, args.iterations, case_filter) for size in sizes},
+    }
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Saqlandi: {path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("❌ Regressiyalar:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("✅ Regressiya yo'q")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
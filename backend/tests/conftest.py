@@ -0,0 +1,75 @@
+"""
+Test sozlamalari - sessiya uchun vaqtinchalik sintetik baza
+
+`app.database` engine import paytida `DATABASE_URL` dan yaratiladi, shuning
+uchun muhit o'zgaruvchilari `app` import qilinishidan oldin o'rnatiladi.
+
+Ishlatish (backend papkasidan):
+    python -m pytest -q
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+TEST_DIR = Path(tempfile.mkdtemp(prefix="davomat-tests-"))
+DATASET_PATH = TEST_DIR / "dataset.db"
+APP_DB_PATH = TEST_DIR / "app.db"
+ADMIN_TELEGRAM_ID = 1_000_000_001
+
+os.environ.update(
+    DATABASE_URL=f"sqlite+aiosqlite:///{APP_DB_PATH}",
+    ADMIN_IDS=str(ADMIN_TELEGRAM_ID),
+    DEBUG="false",
+    SCHEDULER_ENABLED="false",
+    SCHEDULER_LOCK_PATH=str(TEST_DIR / "scheduler.lock"),
+    BACKUP_DIR=str(TEST_DIR / "backups"),
+    EXPORT_DIR=str(TEST_DIR / "exports"),
+    PROFILE_DIR=str(TEST_DIR / "profiles"),
+)
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def dataset() -> Path:
+    """Toza sintetik baza (benchmark "small" o'lchami); testlar nusxasi bilan ishlaydi"""
+    from benchmarks.run import dataset_config
+    from app.services.dataset_service import generate_dataset
+
+    generate_dataset(dataset_config("small"), database_url=f"sqlite+aiosqlite:///{DATASET_PATH}")
+    shutil.copy(DATASET_PATH, APP_DB_PATH)
+    return DATASET_PATH
+
+
+@pytest.fixture(scope="session")
+def client(dataset):
+    """Ilova (lifespan bilan) - APP_DB_PATH ustida"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def db(dataset):
+    """Ilova bazasiga to'g'ridan-to'g'ri sqlite3 ulanish (tayyorlash va tekshirish uchun)"""
+    conn = sqlite3.connect(APP_DB_PATH)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope="session")
+def student_user_id(db) -> int:
+    return db.execute("SELECT user_id FROM students ORDER BY id LIMIT 1").fetchone()[0]
+
+
+def auth_headers(user_id: int) -> dict:
+    from app.api.auth import create_token
+    return {"Authorization": f"Bearer {create_token(user_id)}"}
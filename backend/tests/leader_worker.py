@@ -0,0 +1,49 @@
+"""
+Leader testi uchun worker jarayon (uvicorn workerining o'rnida)
+
+`scheduler_service` ni import qiladi va haqiqiy saylov (`start_scheduler`)
+orqali leader bo'lishga urinadi. Leader bo'lgach APScheduler o'rniga dars
+joblarini har JOB_INTERVAL da bajaradi va natijalarni `<log_dir>/<pid>.jsonl`
+ga yozadi.
+
+    python tests/leader_worker.py <log_dir>
+"""
+import asyncio
+import json
+import os
+import sys
+
+JOB_INTERVAL = 0.2
+
+
+async def main(log_dir: str):
+    from app.services import scheduler_service
+
+    log_path = os.path.join(log_dir, f"{os.getpid()}.jsonl")
+
+    def log(event: str, **fields):
+        with open(log_path, "a") as f:
+            f.write(json.dumps({"event": event, "pid": os.getpid(), **fields}) + "\n")
+
+    async def run_jobs():
+        while True:
+            summary = await scheduler_service.reconcile_lessons()
+            auto_opened = await scheduler_service.auto_open_lessons()
+            await scheduler_service.auto_close_lessons()
+            log("round", auto_opened=auto_opened, **{key: summary[key] for key in ("closed", "opened", "created")})
+            await asyncio.sleep(JOB_INTERVAL)
+
+    jobs = []
+
+    def start_jobs():
+        log("leader")
+        jobs.append(asyncio.create_task(run_jobs()))
+
+    scheduler_service._start_jobs = start_jobs
+    await scheduler_service.start_scheduler()
+    log("started")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1]))
@@ -0,0 +1,58 @@
+"""
+Talabaning o'zi davomat qilishi: bir vaqtdagi takroriy bosishlar bitta yozuv beradi
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import async_session
+from app.models.student import Student
+from app.services.attendance_service import mark_self
+
+
+@pytest.fixture
+def open_lesson(db, student_user_id):
+    now = datetime.now()
+    start = now - timedelta(minutes=5)
+    if start.date() != now.date() or (now + timedelta(minutes=60)).date() != now.date():
+        pytest.skip("Yarim tunga yaqin")
+    student_id, group_id = db.execute(
+        "SELECT id, group_id FROM students WHERE user_id = ?", (student_user_id,)
+    ).fetchone()
+    subject_id, teacher_id = db.execute("SELECT subject_id, teacher_id FROM schedule LIMIT 1").fetchone()
+    fmt = "%H:%M:%S.%f"
+    schedule_id = db.execute(
+        "INSERT INTO schedule (group_id, subject_id, teacher_id, day_of_week, start_time, end_time, room, is_active) "
+        "VALUES (?, ?, ?, ?, ?, ?, '101', 0)",
+        (group_id, subject_id, teacher_id, start.weekday(), start.strftime(fmt),
+         (start + timedelta(minutes=80)).strftime(fmt))
+    ).lastrowid
+    lesson_id = db.execute(
+        "INSERT INTO lessons (schedule_id, date, status) VALUES (?, ?, 'open')", (schedule_id, now.date().isoformat())
+    ).lastrowid
+    db.commit()
+    yield student_id, lesson_id
+    db.execute("DELETE FROM attendance WHERE lesson_id = ?", (lesson_id,))
+    db.execute("DELETE FROM lessons WHERE id = ?", (lesson_id,))
+    db.execute("DELETE FROM schedule WHERE id = ?", (schedule_id,))
+    db.commit()
+
+
+def test_concurrent_marks_create_one_row(client, db, open_lesson):
+    student_id, lesson_id = open_lesson
+
+    async def press():
+        async with async_session() as session:
+            student = await session.get(Student, student_id)
+            return await mark_self(session, student, lesson_id)
+
+    async def double_tap():
+        return await asyncio.gather(*(press() for _ in range(5)))
+
+    responses = client.portal.call(double_tap)
+    assert sum(r.success for r in responses) == 1
+    assert {r.message for r in responses if not r.success} == {"Siz allaqachon davomat qilgansiz"}
+    assert db.execute(
+        "SELECT COUNT(*) FROM attendance WHERE lesson_id = ? AND student_id = ?", (lesson_id, student_id)
+    ).fetchone()[0] == 1
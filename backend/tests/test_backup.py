@@ -0,0 +1,58 @@
+"""
+Backup yozuvlar davomida ham tugaydi: pog'onali nusxa cheklovdan oshsa bitta qadamda olinadi
+"""
+import asyncio
+import sqlite3
+
+import pytest
+
+from conftest import APP_DB_PATH
+from app.config import settings
+from app.services import backup_service
+from app.services.metrics_service import backup_fallbacks
+
+
+@pytest.fixture
+def small_steps(dataset, monkeypatch):
+    monkeypatch.setattr(settings, "BACKUP_PAGES_PER_STEP", 1)
+    monkeypatch.setattr(settings, "BACKUP_STEP_SLEEP_MS", 1)
+
+
+def test_backup_falls_back_after_restarts(small_steps, monkeypatch):
+    monkeypatch.setattr(settings, "BACKUP_MAX_RESTARTS", 2)
+    fallbacks = backup_fallbacks._value.get()
+
+    # Har bir qadamdan keyin boshqa ulanishdan yozuv - nusxa har safar boshidan boshlanadi
+    # (vaqtga bog'liq fon thread o'rniga: natija deterministik)
+    conn = sqlite3.connect(APP_DB_PATH, isolation_level=None, timeout=5, check_same_thread=False)
+    conn.execute("CREATE TABLE IF NOT EXISTS backup_test_writes (id INTEGER PRIMARY KEY, value TEXT)")
+    on_progress = backup_service._on_progress
+
+    def write_then_progress(*args):
+        conn.execute("INSERT INTO backup_test_writes (value) VALUES ('x')")
+        return on_progress(*args)
+
+    monkeypatch.setattr(backup_service, "_on_progress", write_then_progress)
+    try:
+        result = asyncio.run(backup_service.run_backup())
+    finally:
+        conn.close()
+
+    assert result["ok"]
+    assert result["restarts"] > 2
+    assert "boshidan boshlandi" in result["fallback"]
+    assert result["verify"]["ok"]
+    assert backup_service.state["running"] is False
+    assert backup_service.state["pages_done"] == backup_service.state["pages_total"]
+    assert backup_fallbacks._value.get() == fallbacks + 1
+
+
+def test_backup_falls_back_after_deadline(small_steps, monkeypatch):
+    monkeypatch.setattr(settings, "BACKUP_MAX_SECONDS", 0)
+
+    result = asyncio.run(backup_service.run_backup())
+
+    assert result["ok"]
+    assert result["fallback"] == "0 s da tugamadi"
+    assert backup_service.state["last"] is result
+    assert backup_service.state["running"] is False
@@ -0,0 +1,104 @@
+"""
+Hisobot pool: mijoz uzilsa ham slot pooldagi ish tugaguncha band turadi
+"""
+import asyncio
+import threading
+
+import pytest
+
+from app.config import settings
+from app.services.executor_service import ReportExecutor, ClientDisconnected
+
+
+class DisconnectedRequest:
+    async def is_disconnected(self) -> bool:
+        return True
+
+
+def blocking_job(release: threading.Event, started: threading.Event) -> str:
+    started.set()
+    release.wait(10)
+    return "ok"
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    monkeypatch.setattr(settings, "REPORT_EXECUTOR", "thread")
+    monkeypatch.setattr(settings, "REPORT_WORKERS", 1)
+    monkeypatch.setattr(settings, "REPORT_DISCONNECT_POLL_SECONDS", 0.01)
+    executor = ReportExecutor()
+    yield executor
+    executor.shutdown()
+
+
+def test_slot_held_until_abandoned_job_finishes(executor):
+    async def scenario():
+        release, started = threading.Event(), threading.Event()
+        with pytest.raises(ClientDisconnected):
+            await executor.run(blocking_job, release, started, request=DisconnectedRequest())
+        assert started.is_set()
+
+        # Ish poolda davom etmoqda - slot bo'sh emas, keyingi ish kutadi
+        assert executor.running == 1
+        second_release = threading.Event()
+        second = asyncio.ensure_future(executor.run(blocking_job, second_release, threading.Event()))
+        await asyncio.sleep(0.1)
+        assert not second.done()
+        assert executor.waiting == 1
+
+        release.set()
+        await asyncio.sleep(0.1)
+        assert executor.waiting == 0
+        assert executor.running == 1  # Endi ikkinchi ish bajarilmoqda
+        second_release.set()
+        assert await second == "ok"
+        await asyncio.sleep(0)
+        assert executor.running == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_not_lost_when_queued_run_cancelled(executor):
+    async def scenario():
+        release = threading.Event()
+        first = asyncio.ensure_future(executor.run(blocking_job, release, threading.Event()))
+        await asyncio.sleep(0.05)
+        assert executor.running == 1
+
+        # Navbatdagi so'rov taski bekor qilinadi (mijoz uzilishi emas - task cancel)
+        queued = asyncio.ensure_future(
+            executor.run(blocking_job, threading.Event(), threading.Event(), request=DisconnectedRequest())
+        )
+        queued_plain = asyncio.ensure_future(executor.run(blocking_job, threading.Event(), threading.Event()))
+        await asyncio.sleep(0)
+        queued.cancel()
+        queued_plain.cancel()
+        for task in (queued, queued_plain):
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        assert executor.waiting == 0
+
+        release.set()
+        assert await first == "ok"
+        await asyncio.sleep(0.05)
+        assert executor.running == 0
+        assert not executor.semaphore.locked()
+
+        # Keyingi ish darhol bajariladi
+        done = threading.Event()
+        done.set()
+        assert await asyncio.wait_for(executor.run(blocking_job, done, threading.Event()), 1) == "ok"
+
+    asyncio.run(scenario())
+
+
+def test_slot_released_after_success(executor):
+    async def scenario():
+        release = threading.Event()
+        release.set()
+        assert await executor.run(blocking_job, release, threading.Event()) == "ok"
+        await asyncio.sleep(0)
+        assert executor.running == 0
+        assert executor.completed == 1
+
+    asyncio.run(scenario())
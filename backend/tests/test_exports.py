@@ -0,0 +1,91 @@
+"""
+Fon eksportlari: holat meta faylda - boshqa worker va restartdan keyin ham ko'rinadi
+"""
+import os
+import time
+from datetime import timedelta
+
+import pytest
+
+from conftest import auth_headers
+from benchmarks.run import dataset_config
+from app.services import export_service
+
+ADMIN = auth_headers(1)
+# Test bazasining (dataset_config) birinchi haftasi - sana qachon ishga tushirilsa ham ma'lumot ichida
+SEMESTER_START = dataset_config("small").semester_start
+PARAMS = {
+    "format": "csv",
+    "start_date": SEMESTER_START.isoformat(),
+    "end_date": (SEMESTER_START + timedelta(days=6)).isoformat()
+}
+
+
+def wait_done(client, job_id: str) -> dict:
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/admin/exports/{job_id}", headers=ADMIN).json()
+        if job["status"] in export_service.FINISHED:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Eksport tugamadi: {job}")
+
+
+def forget_local_jobs():
+    """Boshqa worker / qayta ishga tushgan jarayon - xotirada hech narsa yo'q"""
+    export_service.jobs.clear()
+
+
+@pytest.fixture
+def export_job(client):
+    response = client.post("/api/admin/exports", params=PARAMS, headers=ADMIN)
+    assert response.status_code == 200
+    job = wait_done(client, response.json()["id"])
+    assert job["status"] == "done"
+    assert job["rows"] > 0
+    return job
+
+
+def test_finished_job_visible_from_other_worker(client, export_job):
+    forget_local_jobs()
+    job = client.get(f"/api/admin/exports/{export_job['id']}", headers=ADMIN).json()
+    assert job["status"] == "done"
+    assert job["rows"] == export_job["rows"]
+
+    response = client.get(f"/api/admin/exports/{export_job['id']}/download", headers=ADMIN)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+
+def test_running_job_visible_from_other_worker(client):
+    job = export_service.ExportJob(
+        id="0" * 32, format="csv", filters=export_service.normalize_filters(None, None, None), version=0,
+        status="rendering"
+    )
+    export_service._save_job(job)
+    forget_local_jobs()
+
+    response = client.get(f"/api/admin/exports/{job.id}", headers=ADMIN)
+    assert response.status_code == 200
+    assert response.json()["status"] == "rendering"
+
+    # Heartbeat to'xtadi (jarayon o'ldi) - ish muvaffaqiyatsiz hisoblanadi
+    stale = time.time() - export_service.STALE_SECONDS - 1
+    os.utime(export_service._meta_path(job.id), (stale, stale))
+    assert client.get(f"/api/admin/exports/{job.id}", headers=ADMIN).json()["status"] == "failed"
+
+
+def test_job_lost_on_restart_is_resubmitted(client, export_job):
+    # Restartdan oldin: ish bajarilayotgan edi, fayl hali yozilmagan
+    job = export_service.get_job(export_job["id"])
+    os.remove(job.path)
+    job.status = "querying"
+    export_service._save_job(job)
+    stale = time.time() - export_service.STALE_SECONDS - 1
+    os.utime(export_service._meta_path(job.id), (stale, stale))
+    forget_local_jobs()
+
+    response = client.post("/api/admin/exports", params=PARAMS, headers=ADMIN)
+    assert response.json()["id"] == export_job["id"]
+    assert response.json()["status"] != "failed"
+    assert wait_done(client, export_job["id"])["status"] == "done"
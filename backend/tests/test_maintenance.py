@@ -0,0 +1,71 @@
+"""
+auto_vacuum: yangi baza darhol INCREMENTAL, eski baza bir martalik to'liq VACUUM bilan o'tkaziladi
+"""
+import asyncio
+import shutil
+import sqlite3
+
+import pytest
+
+from app import database
+from app.config import settings
+from app.services import scheduler_service
+
+
+def auto_vacuum(path) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def legacy_db(dataset, tmp_path, monkeypatch):
+    """auto_vacuum=NONE bilan yaratilgan baza nusxasi"""
+    path = tmp_path / "legacy.db"
+    shutil.copy(dataset, path)
+    monkeypatch.setattr(scheduler_service, "DATABASE_PATH", str(path))
+    assert auto_vacuum(path) == 0
+    return path
+
+
+def test_new_database_is_incremental(tmp_path):
+    conn = sqlite3.connect(tmp_path / "new.db")
+    database._configure_writer(conn, None)
+    conn.execute("CREATE TABLE t (x)")
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+
+def test_maintenance_converts_once(legacy_db):
+    report = asyncio.run(scheduler_service.database_maintenance())
+    assert report["vacuum"]["converted"] is True
+    assert auto_vacuum(legacy_db) == 2
+
+    # Keyingi maintenance - faqat incremental_vacuum
+    report = asyncio.run(scheduler_service.database_maintenance())
+    assert "converted" not in report["vacuum"]
+
+
+def test_conversion_budget(legacy_db, monkeypatch):
+    monkeypatch.setattr(settings, "MAINTENANCE_FULL_VACUUM_SECONDS", 0)
+    report = asyncio.run(scheduler_service.database_maintenance())
+    assert report["vacuum"]["converted"] is False
+    assert auto_vacuum(legacy_db) == 0
+
+    conn = sqlite3.connect(legacy_db)
+    assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    conn.close()
+
+
+def test_conversion_disabled_unless_requested(legacy_db, monkeypatch):
+    monkeypatch.setattr(settings, "MAINTENANCE_CONVERT_AUTO_VACUUM", False)
+    report = asyncio.run(scheduler_service.database_maintenance())
+    assert "skipped" in report["vacuum"]
+    assert auto_vacuum(legacy_db) == 0
+
+    report = asyncio.run(scheduler_service.database_maintenance(full_vacuum=True))
+    assert report["vacuum"]["converted"] is True
+    assert auto_vacuum(legacy_db) == 2
@@ -0,0 +1,73 @@
+"""
+Davomat matritsasi: qatnashganlar ham, kutilgan ham faqat o'tilgan (yopilgan) darslar bo'yicha
+"""
+from datetime import date
+
+import pytest
+
+from conftest import auth_headers
+from app.config import settings
+from app.services.matrix_service import matrix_cache
+from app.services.snapshot_service import snapshot
+
+ADMIN_USER_ID = 1
+
+
+@pytest.fixture
+def open_lesson_with_marks(db):
+    """Belgilari bor darsni vaqtincha ochiq holatga o'tkazish (ochiq dars + belgilar)"""
+    lesson_id, day = db.execute(
+        "SELECT l.id, l.date FROM lessons l WHERE l.status = 'closed' "
+        "AND EXISTS (SELECT 1 FROM attendance a WHERE a.lesson_id = l.id AND a.status = 'present') "
+        "ORDER BY l.date DESC LIMIT 1"
+    ).fetchone()
+    db.execute("UPDATE lessons SET status = 'open' WHERE id = ?", (lesson_id,))
+    db.execute("UPDATE data_versions SET version = version + 1")
+    db.commit()
+    yield date.fromisoformat(day)
+    db.execute("UPDATE lessons SET status = 'closed' WHERE id = ?", (lesson_id,))
+    db.execute("UPDATE data_versions SET version = version + 1")
+    db.commit()
+
+
+@pytest.fixture(params=["sql", "snapshot"])
+def matrix_source(request, client, monkeypatch):
+    matrix_cache.clear()
+    if request.param == "snapshot":
+        monkeypatch.setattr(settings, "SNAPSHOT_ENABLED", True)
+        client.portal.call(snapshot._full_load)
+    yield request.param
+    matrix_cache.clear()
+
+
+def held_attendance(db, start: date, end: date) -> dict:
+    rows = db.execute(
+        "SELECT s.group_id, s.subject_id, COUNT(*) FROM attendance a "
+        "JOIN lessons l ON l.id = a.lesson_id JOIN schedule s ON s.id = l.schedule_id "
+        "WHERE l.status = 'closed' AND l.date BETWEEN ? AND ? AND a.status IN ('present', 'late') "
+        "GROUP BY s.group_id, s.subject_id",
+        (start.isoformat(), end.isoformat())
+    ).fetchall()
+    return {(group_id, subject_id): count for group_id, subject_id, count in rows}
+
+
+def test_matrix_counts_only_held_lessons(client, db, open_lesson_with_marks, matrix_source):
+    start = end = open_lesson_with_marks
+    response = client.get(
+        "/api/admin/attendance/matrix",
+        params={"start_date": start.isoformat(), "end_date": end.isoformat()},
+        headers=auth_headers(ADMIN_USER_ID)
+    )
+    assert response.status_code == 200
+    matrix = response.json()
+
+    attended = {
+        (group["id"], subject["id"]): matrix["attended"][i][j]
+        for i, group in enumerate(matrix["groups"])
+        for j, subject in enumerate(matrix["subjects"])
+        if matrix["attended"][i][j]
+    }
+    assert attended == held_attendance(db, start, end)
+    for attended_row, expected_row in zip(matrix["attended"], matrix["expected"]):
+        for attended_cell, expected_cell in zip(attended_row, expected_row):
+            assert attended_cell <= expected_cell
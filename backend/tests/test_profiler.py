@@ -0,0 +1,32 @@
+"""
+So'rov profili: fayllar event loop threadidan tashqarida yoziladi
+"""
+import threading
+
+from conftest import auth_headers
+from app.services import profiler_service
+
+
+def test_profile_saved_off_event_loop(client, student_user_id, monkeypatch):
+    loop_thread = client.portal.call(threading.get_ident)
+    save_threads = []
+    save_profile = profiler_service._save_profile
+
+    def record_thread(*args):
+        save_threads.append(threading.get_ident())
+        return save_profile(*args)
+
+    monkeypatch.setattr(profiler_service, "_save_profile", record_thread)
+    token = profiler_service.create_profile_token()["token"]
+    response = client.get(
+        "/api/student/profile",
+        headers={**auth_headers(student_user_id), "X-Profile-Token": token}
+    )
+    assert response.status_code == 200
+
+    profile_id = response.headers["x-profile-id"]
+    assert profiler_service.profile_path(profile_id) is not None
+    assert save_threads and loop_thread not in save_threads
+
+    (meta,) = [p for p in profiler_service.list_profiles() if p["id"] == profile_id]
+    assert meta["route"] and meta["status"] == "200"
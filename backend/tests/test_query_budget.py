@@ -0,0 +1,46 @@
+"""
+Endpointlar statementlar byudjeti ichida qoladi (query_budget)
+"""
+import threading
+
+import pytest
+from sqlalchemy import text
+
+from conftest import auth_headers
+from app.database import async_session
+from app.services.query_budget import query_budget, QueryBudgetExceeded
+
+
+@query_budget(6)
+def test_student_stats_within_budget(client, student_user_id):
+    response = client.get("/api/student/stats", headers=auth_headers(student_user_id))
+    assert response.status_code == 200
+
+
+@query_budget(6)
+def test_student_profile_within_budget(client, student_user_id):
+    response = client.get("/api/student/profile", headers=auth_headers(student_user_id))
+    assert response.status_code == 200
+
+
+def test_budget_exceeded(client, student_user_id):
+    with pytest.raises(QueryBudgetExceeded, match="ruxsat 2"):
+        with query_budget(2):
+            client.get("/api/student/today", headers=auth_headers(student_user_id))
+
+
+def test_other_tasks_not_counted(client):
+    """Boshqa kontekstdagi statementlar (scheduler job, parallel so'rov) byudjetga kirmaydi"""
+    async def background_query():
+        async with async_session() as db:
+            await db.execute(text("SELECT 1"))
+
+    with query_budget(0) as budget:
+        thread = threading.Thread(target=client.portal.call, args=(background_query,))
+        thread.start()
+        thread.join()
+    assert budget.count == 0
+
+    with query_budget(1) as budget:
+        client.portal.call(background_query)
+    assert budget.count == 1
@@ -0,0 +1,73 @@
+"""
+Darslarni ochish: oyna bo'yicha (aniq daqiqa emas), faol bo'lmagan jadval ochilmaydi
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.scheduler_service import auto_open_lessons, reconcile_lessons
+
+
+def add_schedule(db, start: datetime, is_active: bool = True) -> int:
+    group_id, subject_id, teacher_id = db.execute(
+        "SELECT group_id, subject_id, teacher_id FROM schedule LIMIT 1"
+    ).fetchone()
+    fmt = "%H:%M:%S.%f"
+    return db.execute(
+        "INSERT INTO schedule (group_id, subject_id, teacher_id, day_of_week, start_time, end_time, room, is_active) "
+        "VALUES (?, ?, ?, ?, ?, ?, '101', ?)",
+        (group_id, subject_id, teacher_id, start.weekday(), start.replace(second=0, microsecond=0).strftime(fmt),
+         (start + timedelta(minutes=80)).strftime(fmt), int(is_active))
+    ).lastrowid
+
+
+def lesson_status(db, schedule_id: int, day):
+    return db.execute(
+        "SELECT status FROM lessons WHERE schedule_id = ? AND date = ?", (schedule_id, day.isoformat())
+    ).fetchall()
+
+
+@pytest.fixture
+def schedules(db):
+    now = datetime.now()
+    if (now + timedelta(minutes=10)).date() != now.date() or (now - timedelta(minutes=15)).date() != now.date():
+        pytest.skip("Yarim tunga yaqin")
+    created = []
+    yield now, created
+    for schedule_id in created:
+        db.execute(
+            "DELETE FROM notifications WHERE lesson_id IN (SELECT id FROM lessons WHERE schedule_id = ?)",
+            (schedule_id,)
+        )
+        db.execute("DELETE FROM lessons WHERE schedule_id = ?", (schedule_id,))
+        db.execute("DELETE FROM schedule WHERE id = ?", (schedule_id,))
+    db.commit()
+
+
+def test_auto_open_uses_window(client, db, schedules):
+    now, created = schedules
+    soon = add_schedule(db, now + timedelta(minutes=3))
+    later = add_schedule(db, now + timedelta(minutes=10))
+    created += [soon, later]
+    db.commit()
+
+    assert client.portal.call(auto_open_lessons) == 1
+    assert lesson_status(db, soon, now.date()) == [("open",)]
+    assert lesson_status(db, later, now.date()) == []
+
+    # Qayta ishga tushsa - ikkinchi marta ochilmaydi
+    assert client.portal.call(auto_open_lessons) == 0
+
+
+def test_inactive_schedule_not_opened(client, db, schedules):
+    now, created = schedules
+    inactive = add_schedule(db, now - timedelta(minutes=10), is_active=False)
+    created.append(inactive)
+    db.execute(
+        "INSERT INTO lessons (schedule_id, date, status) VALUES (?, ?, 'pending')", (inactive, now.date().isoformat())
+    )
+    db.commit()
+
+    client.portal.call(reconcile_lessons)
+    client.portal.call(auto_open_lessons)
+    assert lesson_status(db, inactive, now.date()) == [("pending",)]
@@ -0,0 +1,168 @@
+"""
+Bir nechta worker - bitta leader: joblar faqat qulfni olgan jarayonda ishlaydi,
+har bir dars bir marta ochiladi/yopiladi, leader o'lsa kutayotgan worker o'rnini oladi.
+"""
+import json
+import os
+import shutil
+import signal
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from app.services.leader_service import LeaderLock
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+WORKERS = 3
+TIMEOUT = 30
+
+
+def read_log(log_dir: Path) -> list:
+    records = []
+    for path in log_dir.glob("*.jsonl"):
+        records += [json.loads(line) for line in path.read_text().splitlines() if line]
+    return records
+
+
+def wait_for(condition, log_dir: Path, timeout: float = TIMEOUT) -> list:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        records = read_log(log_dir)
+        if condition(records):
+            return records
+        time.sleep(0.1)
+    raise AssertionError(f"Kutilgan holat {timeout} s ichida bo'lmadi: {read_log(log_dir)}")
+
+
+def leaders(records) -> list:
+    return [r["pid"] for r in records if r["event"] == "leader"]
+
+
+def totals(records) -> dict:
+    """Jami o'tishlar; auto_open_lessons ochganlari ham "created" ga (reconcile bilan poyga)"""
+    rounds = [r for r in records if r["event"] == "round"]
+    result = {key: sum(r[key] for r in rounds) for key in ("closed", "opened", "created")}
+    result["created"] += sum(r["auto_opened"] for r in rounds)
+    return result
+
+
+def add_schedule(conn, template, start: datetime) -> int:
+    fmt = "%H:%M:%S.%f"
+    cursor = conn.execute(
+        "INSERT INTO schedule (group_id, subject_id, teacher_id, day_of_week, start_time, end_time, room, is_active) "
+        "VALUES (?, ?, ?, ?, ?, ?, '101', 1)",
+        (*template, start.weekday(), start.strftime(fmt), (start + timedelta(minutes=80)).strftime(fmt))
+    )
+    return cursor.lastrowid
+
+
+def add_pending_lesson(conn, schedule_id: int, day) -> int:
+    return conn.execute(
+        "INSERT INTO lessons (schedule_id, date, status) VALUES (?, ?, 'pending')",
+        (schedule_id, day.isoformat())
+    ).lastrowid
+
+
+def duplicate_lessons(conn) -> list:
+    return conn.execute(
+        "SELECT schedule_id, date, COUNT(*) FROM lessons GROUP BY schedule_id, date HAVING COUNT(*) > 1"
+    ).fetchall()
+
+
+@pytest.fixture
+def workdir(dataset, tmp_path):
+    shutil.copy(dataset, tmp_path / "leader.db")
+    (tmp_path / "log").mkdir()
+    return tmp_path
+
+
+def test_single_leader_and_failover(workdir):
+    now = datetime.now()
+    if (now - timedelta(hours=2)).date() != now.date() or (now + timedelta(hours=3)).date() != now.date():
+        pytest.skip("Yarim tunga yaqin - darslar ikki sanaga bo'linadi")
+    today = now.date()
+    db_path = workdir / "leader.db"
+    log_dir = workdir / "log"
+    lock_path = workdir / "scheduler.lock"
+
+    # Faqat test darslari: qolgan jadval o'chiriladi, eski darslar yopiladi
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("UPDATE schedule SET is_active = 0")
+    conn.execute("UPDATE lessons SET status = 'closed' WHERE status != 'closed'")
+    conn.execute("DELETE FROM lessons WHERE date = ?", (today.isoformat(),))
+    template = conn.execute("SELECT group_id, subject_id, teacher_id FROM schedule LIMIT 1").fetchone()
+
+    to_close = add_pending_lesson(conn, add_schedule(conn, template, now - timedelta(minutes=100)), today)
+    to_open = add_pending_lesson(conn, add_schedule(conn, template, now - timedelta(minutes=10)), today)
+    to_create = add_schedule(conn, template, now - timedelta(minutes=5))
+    add_schedule(conn, template, now + timedelta(hours=2))
+
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(BACKEND_DIR),
+        "DATABASE_URL": f"sqlite+aiosqlite:///{db_path}",
+        "SCHEDULER_ENABLED": "true",
+        "SCHEDULER_LOCK_PATH": str(lock_path),
+        "SCHEDULER_LEADER_RETRY_SECONDS": "1",
+    }
+    workers = [
+        subprocess.Popen(
+            [sys.executable, str(BACKEND_DIR / "tests" / "leader_worker.py"), str(log_dir)],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL
+        )
+        for _ in range(WORKERS)
+    ]
+    try:
+        # Hamma worker ishga tushdi, faqat bittasi leader
+        records = wait_for(
+            lambda r: sum(1 for x in r if x["event"] == "started") == WORKERS and totals(r)["created"] >= 1,
+            log_dir
+        )
+        time.sleep(2.5)  # Kutayotganlar kamida ikki marta qayta urinadi
+        records = read_log(log_dir)
+        assert len(leaders(records)) == 1
+        leader_pid = leaders(records)[0]
+        assert {r["pid"] for r in records if r["event"] == "round"} == {leader_pid}
+        assert lock_path.read_text().strip() == str(leader_pid)
+        assert not LeaderLock(str(lock_path)).acquire()
+
+        # Har bir dars bir marta o'tdi
+        assert totals(records) == {"closed": 1, "opened": 1, "created": 1}
+        assert conn.execute("SELECT status FROM lessons WHERE id = ?", (to_close,)).fetchone()[0] == "closed"
+        assert conn.execute("SELECT status FROM lessons WHERE id = ?", (to_open,)).fetchone()[0] == "open"
+        assert conn.execute(
+            "SELECT status FROM lessons WHERE schedule_id = ? AND date = ?", (to_create, today.isoformat())
+        ).fetchall() == [("open",)]
+        assert duplicate_lessons(conn) == []
+
+        # Leader o'ldiriladi - kutayotganlardan biri o'rnini oladi
+        leader = next(w for w in workers if w.pid == leader_pid)
+        leader.send_signal(signal.SIGKILL)
+        leader.wait()
+        late = add_schedule(conn, template, now - timedelta(minutes=1))
+
+        records = wait_for(lambda r: len(leaders(r)) == 2 and totals(r)["created"] >= 2, log_dir)
+        (new_leader,) = set(leaders(records)) - {leader_pid}
+        assert new_leader in {w.pid for w in workers if w.poll() is None}
+
+        time.sleep(1)
+        records = read_log(log_dir)
+        assert len(leaders(records)) == 2
+        assert {r["pid"] for r in records if r["event"] == "round"} == {leader_pid, new_leader}
+        assert totals(records) == {"closed": 1, "opened": 1, "created": 2}
+        assert conn.execute(
+            "SELECT COUNT(*) FROM lessons WHERE schedule_id = ? AND date = ?", (late, today.isoformat())
+        ).fetchone()[0] == 1
+        assert duplicate_lessons(conn) == []
+    finally:
+        for worker in workers:
+            if worker.poll() is None:
+                worker.kill()
+            worker.wait()
+        conn.close()
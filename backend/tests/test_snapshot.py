@@ -0,0 +1,46 @@
+"""
+Admin umumiy statistikasi: snapshot va SQL bir xil natija beradi
+"""
+from conftest import auth_headers
+from app.config import settings
+from app.services.snapshot_service import snapshot
+
+ADMIN_USER_ID = 1
+COUNTS = ("total_lessons", "total_attendance", "today_lessons", "today_attendance")
+
+
+def admin_counts(client) -> dict:
+    response = client.get("/api/admin/stats", headers=auth_headers(ADMIN_USER_ID))
+    assert response.status_code == 200
+    return {key: response.json()[key] for key in COUNTS}
+
+
+def test_admin_stats_from_snapshot(client, db, monkeypatch):
+    sql = admin_counts(client)
+    assert sql["total_attendance"] > 0
+
+    monkeypatch.setattr(settings, "SNAPSHOT_ENABLED", True)
+    client.portal.call(snapshot._full_load)
+    refreshes = dict(snapshot.refreshes)
+    assert admin_counts(client) == sql
+
+    # Yangi belgi - delta orqali hisobga kiradi
+    lesson_id, student_id = db.execute(
+        "SELECT l.id, s.id FROM lessons l JOIN schedule sc ON sc.id = l.schedule_id "
+        "JOIN students s ON s.group_id = sc.group_id "
+        "WHERE NOT EXISTS (SELECT 1 FROM attendance a WHERE a.lesson_id = l.id AND a.student_id = s.id) "
+        "ORDER BY l.date DESC LIMIT 1"
+    ).fetchone()
+    db.execute(
+        "INSERT INTO attendance (lesson_id, student_id, status, marked_by) VALUES (?, ?, 'present', 'teacher')",
+        (lesson_id, student_id)
+    )
+    db.execute("UPDATE data_versions SET version = version + 1 WHERE name = 'attendance'")
+    db.commit()
+    try:
+        assert admin_counts(client)["total_attendance"] == sql["total_attendance"] + 1
+        assert snapshot.refreshes["delta"] == refreshes["delta"] + 1
+    finally:
+        db.execute("DELETE FROM attendance WHERE lesson_id = ? AND student_id = ?", (lesson_id, student_id))
+        db.execute("UPDATE data_versions SET version = version + 1")
+        db.commit()
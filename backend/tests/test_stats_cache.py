@@ -0,0 +1,79 @@
+"""
+Fanlar statistikasi keshi: boshqa talabalarning belgilari kalitni eskirtirmaydi,
+talabaning o'z belgisi va guruhda dars yopilishi esa eskirtiradi
+"""
+import pytest
+
+from conftest import auth_headers
+from app.services.stats_service import stats_cache
+
+
+def subject_stats(client, user_id: int) -> dict:
+    response = client.get("/api/student/stats/subjects", headers=auth_headers(user_id))
+    assert response.status_code == 200
+    return {row["subject_id"]: row for row in response.json()}
+
+
+def teacher_user(db, lesson_id: int) -> int:
+    return db.execute(
+        "SELECT t.user_id FROM lessons l JOIN schedule s ON s.id = l.schedule_id "
+        "JOIN teachers t ON t.id = s.teacher_id WHERE l.id = ?", (lesson_id,)
+    ).fetchone()[0]
+
+
+@pytest.fixture
+def classmates(db, student_user_id):
+    student_id, group_id = db.execute(
+        "SELECT id, group_id FROM students WHERE user_id = ?", (student_user_id,)
+    ).fetchone()
+    other_id = db.execute(
+        "SELECT id FROM students WHERE group_id = ? AND id != ? LIMIT 1", (group_id, student_id)
+    ).fetchone()[0]
+    return student_id, other_id, group_id
+
+
+def test_subject_stats_cache_scoped_to_student(client, db, student_user_id, classmates):
+    student_id, other_id, group_id = classmates
+    lesson_id, subject_id = db.execute(
+        "SELECT l.id, s.subject_id FROM lessons l JOIN schedule s ON s.id = l.schedule_id "
+        "WHERE s.group_id = ? AND l.status = 'closed' ORDER BY l.date DESC LIMIT 1", (group_id,)
+    ).fetchone()
+    teacher = auth_headers(teacher_user(db, lesson_id))
+    mark = "/api/teacher/lesson/{}/mark/{}"
+
+    before = subject_stats(client, student_user_id)
+
+    # Sinfdoshning belgisi - kesh saqlanadi
+    hits = stats_cache.hits
+    assert client.post(mark.format(lesson_id, other_id), params={"status": "late"}, headers=teacher).status_code == 200
+    assert subject_stats(client, student_user_id) == before
+    assert stats_cache.hits == hits + 1
+
+    # Talabaning o'z belgisi - qayta hisoblanadi
+    assert client.post(mark.format(lesson_id, student_id), params={"status": "absent"}, headers=teacher).status_code == 200
+    after = subject_stats(client, student_user_id)
+    assert stats_cache.hits == hits + 1
+    assert after[subject_id]["present_count"] + after[subject_id]["late_count"] <= (
+        before[subject_id]["present_count"] + before[subject_id]["late_count"]
+    )
+    assert after[subject_id]["absent_count"] >= before[subject_id]["absent_count"]
+
+
+def test_subject_stats_cache_follows_group_lessons(client, db, student_user_id, classmates):
+    student_id, _, group_id = classmates
+    lesson_id, subject_id = db.execute(
+        "SELECT l.id, s.subject_id FROM lessons l JOIN schedule s ON s.id = l.schedule_id "
+        "WHERE s.group_id = ? AND l.status = 'closed' ORDER BY l.date DESC LIMIT 1", (group_id,)
+    ).fetchone()
+    db.execute("UPDATE lessons SET status = 'open' WHERE id = ?", (lesson_id,))
+    db.commit()
+    stats_cache.clear()
+
+    before = subject_stats(client, student_user_id)
+    hits = stats_cache.hits
+    response = client.post(f"/api/teacher/lesson/{lesson_id}/close", headers=auth_headers(teacher_user(db, lesson_id)))
+    assert response.status_code == 200
+
+    after = subject_stats(client, student_user_id)
+    assert stats_cache.hits == hits
+    assert after[subject_id]["total_lessons"] == before[subject_id]["total_lessons"] + 1
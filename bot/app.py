@@ -3,31 +3,46 @@ Telegram Bot - Mini App uchun
 """
 import asyncio
 import logging
-import os
 
 from aiogram import Bot, Dispatcher, types
 from aiogram.types import WebAppInfo, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.filters import Command
-from dotenv import load_dotenv  # ✅ YANGI
-
-# .env faylni yuklash
-load_dotenv()  # ✅ YANGI
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+
+# Config (.env config.py da yuklanadi)
+from config import (
+    BOT_TOKEN, WEBAPP_URL, TELEGRAM_API_URL, INTERNAL_API_TOKEN, NOTIFY_ENABLED,
+    WEBHOOK_URL, UPDATE_CONCURRENCY
+)
+from backend import BackendClient
+from notifications import NotificationDispatcher
+from webhook import ConcurrencyLimitMiddleware, run_webhook
+import attendance
+import student
 
 # Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Config
-BOT_TOKEN = os.getenv("BOT_TOKEN")
-WEBAPP_URL = os.getenv("WEBAPP_URL", "https://your-domain.com")
-
 # ❗ TOKEN TEKSHIRISH (JUDA MUHIM)
 if not BOT_TOKEN:
     raise ValueError("❌ BOT_TOKEN topilmadi. .env faylni tekshiring!")
 
 # Bot va Dispatcher
-bot = Bot(token=BOT_TOKEN)
+session = AiohttpSession(api=TelegramAPIServer.from_base(TELEGRAM_API_URL)) if TELEGRAM_API_URL else None
+bot = Bot(token=BOT_TOKEN, session=session)
 dp = Dispatcher()
+dp.update.outer_middleware(ConcurrencyLimitMiddleware(UPDATE_CONCURRENCY))
+
+# Backend ichki API (handlerlarga `backend` argumenti sifatida beriladi)
+backend = BackendClient()
+dp["backend"] = backend
+dp.include_router(attendance.router)
+dp.include_router(student.router)
+
+# Dars xabarlari (backend outbox -> talabalar)
+notifier = NotificationDispatcher(bot, backend)
 
 
 @dp.message(Command("start"))
@@ -63,6 +78,8 @@ async def cmd_help(message: types.Message):
         "📊 Statistikangizni ko'rishingiz\n"
         "📅 Dars jadvalini ko'rishingiz mumkin\n\n"
         "🔹 /start - Botni boshlash\n"
+        "🔹 /schedule - Haftalik jadval\n"
+        "🔹 /stats - Davomat statistikasi\n"
         "🔹 /help - Yordam\n"
         "🔹 /app - Ilovani ochish",
         parse_mode="HTML"
@@ -95,6 +112,8 @@ async def callback_help(callback: types.CallbackQuery):
         "📊 Statistikangizni ko'rishingiz\n"
         "📅 Dars jadvalini ko'rishingiz mumkin\n\n"
         "🔹 /start - Botni boshlash\n"
+        "🔹 /schedule - Haftalik jadval\n"
+        "🔹 /stats - Davomat statistikasi\n"
         "🔹 /help - Yordam\n"
         "🔹 /app - Ilovani ochish",
         parse_mode="HTML"
@@ -102,11 +121,31 @@ async def callback_help(callback: types.CallbackQuery):
     await callback.answer()
 
 
+@dp.startup()
+async def on_startup():
+    if NOTIFY_ENABLED and INTERNAL_API_TOKEN:
+        notifier.start()
+    else:
+        logger.info("🔕 Dars xabarlari o'chirilgan (NOTIFY_ENABLED / INTERNAL_API_TOKEN)")
+
+
+@dp.shutdown()
+async def on_shutdown():
+    await notifier.stop()
+    await backend.close()
+    await bot.session.close()
+
+
 async def main():
-    """Bot ishga tushirish"""
+    """Bot ishga tushirish (polling)"""
     logger.info("Bot ishga tushmoqda...")
-    await dp.start_polling(bot)
+    await bot.delete_webhook()
+    await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if WEBHOOK_URL:
+        logger.info("Bot ishga tushmoqda (webhook)...")
+        run_webhook(dp, bot)
+    else:
+        asyncio.run(main())
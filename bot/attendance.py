@@ -0,0 +1,71 @@
+"""
+"Darsdaman" tugmasi - Mini App ni ochmasdan davomat qilish
+
+callback_data: `here:<lesson_id>:<imzo>`. Imzo - HMAC(CALLBACK_SECRET,
+"lesson_id:chat_id"), ya'ni tugma faqat xabar yuborilgan talabada ishlaydi
+(boshqa dars yoki boshqa foydalanuvchi uchun qo'lda yasalgan data rad etiladi).
+Bosilganda bot backenddagi davomat mantiqini ichki API orqali bitta so'rovda
+chaqiradi va natijani callback javobida ko'rsatadi.
+"""
+import base64
+import hashlib
+import hmac
+import logging
+from typing import Optional
+
+from aiogram import F, Router
+from aiogram.types import CallbackQuery, InlineKeyboardButton
+
+from backend import BackendClient
+from config import CALLBACK_SECRET
+
+logger = logging.getLogger(__name__)
+router = Router()
+
+PREFIX = "here"
+
+
+def _signature(lesson_id: int, chat_id: int) -> str:
+    digest = hmac.new(CALLBACK_SECRET.encode(), f"{lesson_id}:{chat_id}".encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:12]).decode()
+
+
+def here_button(lesson_id: int, chat_id: int) -> InlineKeyboardButton:
+    """Imzolangan "Darsdaman" tugmasi (callback_data <= 64 bayt)"""
+    return InlineKeyboardButton(
+        text="✋ Darsdaman",
+        callback_data=f"{PREFIX}:{lesson_id}:{_signature(lesson_id, chat_id)}"
+    )
+
+
+def verify(data: str, chat_id: int) -> Optional[int]:
+    """Imzo to'g'ri bo'lsa - lesson_id"""
+    try:
+        _, lesson_id, signature = data.split(":")
+        lesson_id = int(lesson_id)
+    except ValueError:
+        return None
+    if not hmac.compare_digest(signature, _signature(lesson_id, chat_id)):
+        return None
+    return lesson_id
+
+
+@router.callback_query(F.data.startswith(f"{PREFIX}:"))
+async def callback_here(callback: CallbackQuery, backend: BackendClient):
+    """Davomat qilish (tugma)"""
+    lesson_id = verify(callback.data, callback.from_user.id)
+    if lesson_id is None:
+        await callback.answer("❌ Noto'g'ri tugma", show_alert=True)
+        return
+
+    try:
+        result = await backend.mark_attendance(callback.from_user.id, lesson_id)
+    except Exception as e:
+        logger.warning(f"⚠️ Davomat so'rovi bajarilmadi: {e}")
+        await callback.answer("⚠️ Server bilan bog'lanib bo'lmadi. Ilova orqali urinib ko'ring.", show_alert=True)
+        return
+
+    if result["success"]:
+        await callback.answer(f"✅ {result['message']}")
+    else:
+        await callback.answer(f"❌ {result['message']}", show_alert=True)
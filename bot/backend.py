@@ -0,0 +1,78 @@
+"""
+Backend ichki API klienti (/api/internal)
+
+Butun bot uchun bitta klient (handlerlarga `backend` argumenti sifatida
+beriladi) va bitta aiohttp sessiya - ulanishlar qayta ishlatiladi (keep-alive),
+har bir handler o'z sessiyasini ochmaydi. Parallel ulanishlar BACKEND_POOL_SIZE
+bilan cheklanadi: davomat "bo'roni"da backend so'rovlar ostida qolmaydi,
+ortiqchalari pool navbatida kutadi.
+"""
+import logging
+from typing import List, Optional
+
+import aiohttp
+
+from config import API_URL, INTERNAL_API_TOKEN, BACKEND_POOL_SIZE, BACKEND_TIMEOUT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class BackendClient:
+    def __init__(self, base_url: str = API_URL, token: str = INTERNAL_API_TOKEN):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                base_url=self.base_url,
+                connector=aiohttp.TCPConnector(
+                    limit=BACKEND_POOL_SIZE, keepalive_timeout=60, ttl_dns_cache=300
+                ),
+                headers={"X-Internal-Token": self.token},
+                timeout=aiohttp.ClientTimeout(total=BACKEND_TIMEOUT_SECONDS)
+            )
+        return self._session
+
+    async def _get(self, path: str):
+        """GET - 404 bo'lsa None (masalan, talaba ro'yxatdan o'tmagan)"""
+        async with self.session.get(path) as response:
+            if response.status == 404:
+                return None
+            response.raise_for_status()
+            return await response.json()
+
+    async def claim_notifications(self, limit: int) -> List[dict]:
+        """Yuborilishi kerak bo'lgan xabarlar (backend ularni band qiladi)"""
+        async with self.session.post("/api/internal/notifications/claim", params={"limit": limit}) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def ack_notifications(self, ids: List[int]) -> int:
+        """Yuborilgan xabarlarni tasdiqlash"""
+        async with self.session.post("/api/internal/notifications/ack", json={"ids": ids}) as response:
+            response.raise_for_status()
+            return (await response.json())["acked"]
+
+    async def mark_attendance(self, telegram_id: int, lesson_id: int) -> dict:
+        """Talaba nomidan davomat (MarkAttendanceResponse: success, message)"""
+        async with self.session.post(
+            "/api/internal/attendance/mark",
+            json={"telegram_id": telegram_id, "lesson_id": lesson_id}
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def get_schedule(self, telegram_id: int) -> Optional[List[dict]]:
+        """Haftalik jadval (kunlar bo'yicha, WeekScheduleResponse)"""
+        return await self._get(f"/api/internal/students/{telegram_id}/schedule")
+
+    async def get_stats(self, telegram_id: int) -> Optional[List[dict]]:
+        """Fanlar bo'yicha statistika (SubjectStats)"""
+        return await self._get(f"/api/internal/students/{telegram_id}/stats")
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
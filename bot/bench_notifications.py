@@ -0,0 +1,90 @@
+"""
+Xabarlar navbati benchmarki - fake Bot API server bilan
+
+Fake server (fake_bot_api.py) shu jarayonda ishga tushadi, backend o'rniga
+sintetik yozuvlar beriladi. Natija: yuborish tezligi, 429 lar soni,
+sekundiga eng ko'p xabar (Telegram chegarasidan oshmasligi kerak).
+
+Ishlatish (bot papkasidan):
+    python bench_notifications.py --groups 40 --students 30
+    python bench_notifications.py --groups 10 --students 30 --error-rate 0.05
+"""
+import argparse
+import asyncio
+import time
+
+from aiohttp import web
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+
+import notifications
+from fake_bot_api import create_app
+
+
+class SyntheticBackend:
+    """Backend ichki API o'rniga: `groups` ta dars, har birida `students` ta talaba"""
+
+    def __init__(self, groups: int, students: int):
+        self.events = [
+            {
+                "id": group + 1,
+                "kind": "lesson_opened",
+                "lesson_id": group + 1,
+                "subject_name": "Matematika",
+                "group_name": f"IT-{group + 1}",
+                "room": "101",
+                "start_time": "08:30:00",
+                "end_time": "09:50:00",
+                "chat_ids": [1_000_000 + group * students + student for student in range(students)]
+            }
+            for group in range(groups)
+        ]
+        self.acked = set()
+
+    async def claim_notifications(self, limit: int):
+        batch, self.events = self.events[:limit], self.events[limit:]
+        return batch
+
+    async def ack_notifications(self, ids):
+        self.acked.update(ids)
+        return len(ids)
+
+
+async def run(args):
+    app = create_app(global_rate=30, chat_rate=1, error_rate=args.error_rate, latency_ms=args.latency_ms)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+
+    session = AiohttpSession(api=TelegramAPIServer.from_base(f"http://127.0.0.1:{args.port}"))
+    bot = Bot("42:fake", session=session)
+    backend = SyntheticBackend(args.groups, args.students)
+    notifications.NOTIFY_POLL_SECONDS = 0.2
+    dispatcher = notifications.NotificationDispatcher(bot, backend, workers=args.workers)
+
+    started = time.perf_counter()
+    dispatcher.start()
+    while len(backend.acked) < args.groups:
+        await asyncio.sleep(0.2)
+    elapsed = time.perf_counter() - started
+    await dispatcher.stop()
+    await bot.session.close()
+    await runner.cleanup()
+
+    total = args.groups * args.students
+    fake = app["fake"].stats
+    print(f"Xabarlar: {total}, vaqt: {elapsed:.1f} s, tezlik: {total / elapsed:.1f} xabar/s")
+    print(f"Dispatcher: {dispatcher.stats}")
+    print(f"Fake server: {fake}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Notification dispatcher benchmark")
+    parser.add_argument("--groups", type=int, default=20)
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=notifications.NOTIFY_WORKERS)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--port", type=int, default=8081)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,42 @@
+"""
+Bot sozlamalari (.env / muhit o'zgaruvchilari)
+"""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BOT_TOKEN = os.getenv("BOT_TOKEN")
+WEBAPP_URL = os.getenv("WEBAPP_URL", "https://your-domain.com")
+
+# Backend ichki API (backend dagi INTERNAL_API_TOKEN bilan bir xil)
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN", "")
+BACKEND_POOL_SIZE = int(os.getenv("BACKEND_POOL_SIZE", "20"))  # Backendga parallel ulanishlar
+BACKEND_TIMEOUT_SECONDS = float(os.getenv("BACKEND_TIMEOUT_SECONDS", "10"))
+
+# Webhook (WEBHOOK_URL bo'sh bo'lsa - polling)
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")  # Tashqi manzil, masalan https://bot.example.com
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/webhook")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")  # X-Telegram-Bot-Api-Secret-Token
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8080"))
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "40"))  # Telegram -> bot parallel so'rovlar
+UPDATE_CONCURRENCY = int(os.getenv("UPDATE_CONCURRENCY", "64"))  # Bir vaqtda qayta ishlanadigan updatelar
+
+# Tugmalar callback_data imzosi (bo'sh bo'lsa - INTERNAL_API_TOKEN)
+CALLBACK_SECRET = os.getenv("CALLBACK_SECRET", "") or INTERNAL_API_TOKEN
+
+# Boshqa Bot API server (masalan, fake_bot_api.py - yuklama testlari uchun)
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "")
+
+# Xabarlar navbati
+NOTIFY_ENABLED = os.getenv("NOTIFY_ENABLED", "true").lower() == "true"
+NOTIFY_GLOBAL_RATE = float(os.getenv("NOTIFY_GLOBAL_RATE", "25"))  # xabar/s (Telegram chegarasi ~30)
+NOTIFY_CHAT_INTERVAL = float(os.getenv("NOTIFY_CHAT_INTERVAL", "1.1"))  # bitta chatga xabarlar orasida, s (1 + zaxira)
+NOTIFY_WORKERS = int(os.getenv("NOTIFY_WORKERS", "16"))  # Parallel sendMessage so'rovlari
+NOTIFY_QUEUE_SIZE = int(os.getenv("NOTIFY_QUEUE_SIZE", "2000"))  # Shundan kam bo'lsa - yangi xabarlar olinadi
+NOTIFY_BATCH_SIZE = int(os.getenv("NOTIFY_BATCH_SIZE", "50"))
+NOTIFY_POLL_SECONDS = float(os.getenv("NOTIFY_POLL_SECONDS", "5"))  # Navbat bo'sh bo'lsa
+NOTIFY_MAX_ATTEMPTS = int(os.getenv("NOTIFY_MAX_ATTEMPTS", "5"))  # Tarmoq/5xx xatolarida
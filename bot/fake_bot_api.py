@@ -0,0 +1,134 @@
+"""
+Fake Telegram Bot API server - yuklama testlari uchun
+
+Haqiqiy Telegram chegaralarini taqlid qiladi: bitta chatga 1 xabar/s,
+umumiy 30 xabar/s; oshirilsa 429 + retry_after. --error-rate bilan
+tasodifiy 5xx xatolari ham qaytariladi.
+
+Ishlatish:
+    python fake_bot_api.py --port 8081
+    TELEGRAM_API_URL=http://localhost:8081 python app.py
+
+Statistika: GET /stats
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import deque
+
+from aiohttp import web
+
+WINDOW = 1.0  # s
+
+
+class FakeTelegram:
+    def __init__(self, global_rate: int = 30, chat_rate: int = 1, error_rate: float = 0.0, latency_ms: float = 0):
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.error_rate = error_rate
+        self.latency = latency_ms / 1000
+        self._global = deque()
+        self._chats = {}
+        self.message_id = 0
+        self.stats = {"sent": 0, "rate_limited": 0, "errors": 0, "chats": 0, "max_per_second": 0, "callback_answers": 0}
+
+    def _limited(self, chat_id: int) -> float:
+        """0 - yuborish mumkin, aks holda retry_after (s)"""
+        now = time.monotonic()
+        while self._global and self._global[0] <= now - WINDOW:
+            self._global.popleft()
+        chat = self._chats.setdefault(chat_id, deque())
+        while chat and chat[0] <= now - WINDOW:
+            chat.popleft()
+        if len(chat) >= self.chat_rate:
+            return chat[0] + WINDOW - now
+        if len(self._global) >= self.global_rate:
+            return self._global[0] + WINDOW - now
+        chat.append(now)
+        self._global.append(now)
+        self.stats["max_per_second"] = max(self.stats["max_per_second"], len(self._global))
+        return 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        if request.content_type.startswith("application/json"):
+            data = await request.json()
+        else:
+            data = dict(await request.post())
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if method == "getMe":
+            return ok({"id": 1, "is_bot": True, "first_name": "Fake", "username": "fake_bot"})
+        if method == "answerCallbackQuery":
+            self.stats["callback_answers"] += 1
+            return ok(True)
+        if method in ("deleteWebhook", "setWebhook", "setMyCommands"):
+            return ok(True)
+        if method == "getUpdates":
+            await asyncio.sleep(1)
+            return ok([])
+        if method not in ("sendMessage", "editMessageText", "editMessageReplyMarkup"):
+            return web.json_response({"ok": False, "error_code": 404, "description": "Not Found"}, status=404)
+
+        if self.error_rate and random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response(
+                {"ok": False, "error_code": 502, "description": "Bad Gateway"}, status=502
+            )
+
+        chat_id = int(data["chat_id"])
+        retry_after = self._limited(chat_id)
+        if retry_after:
+            self.stats["rate_limited"] += 1
+            seconds = max(1, int(retry_after + 0.999))
+            return web.json_response({
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {seconds}",
+                "parameters": {"retry_after": seconds}
+            }, status=429)
+
+        self.message_id += 1
+        self.stats["sent"] += 1
+        self.stats["chats"] = len(self._chats)
+        return ok({
+            "message_id": self.message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "text": data.get("text", "")
+        })
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats)
+
+
+def ok(result) -> web.Response:
+    return web.json_response({"ok": True, "result": result})
+
+
+def create_app(**kwargs) -> web.Application:
+    fake = FakeTelegram(**kwargs)
+    app = web.Application()
+    app["fake"] = fake
+    app.router.add_post("/bot{token}/{method}", fake.handle)
+    app.router.add_get("/stats", fake.get_stats)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Telegram Bot API")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--global-rate", type=int, default=30)
+    parser.add_argument("--chat-rate", type=int, default=1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+    web.run_app(
+        create_app(
+            global_rate=args.global_rate, chat_rate=args.chat_rate,
+            error_rate=args.error_rate, latency_ms=args.latency_ms
+        ),
+        port=args.port
+    )
@@ -0,0 +1,256 @@
+"""
+Xabarlar navbati - backend outbox dan talabalarga yuborish
+
+Telegram chegaralari: bitta chatga ~1 xabar/s, umumiy ~30 xabar/s. Oshirilsa -
+429 (retry_after). Shuning uchun:
+- umumiy token bucket (NOTIFY_GLOBAL_RATE) va chat bo'yicha interval
+  (NOTIFY_CHAT_INTERVAL) yuborishdan oldin kutiladi;
+- 429 kelsa - barcha workerlar retry_after ga to'xtaydi, xabar qayta navbatga;
+- tarmoq/5xx xatolari - eksponensial backoff bilan NOTIFY_MAX_ATTEMPTS marta;
+- bot bloklangan / chat topilmadi - qayta urinilmaydi.
+
+Backenddagi yozuv (event) barcha qabul qiluvchilarga yuborilgach tasdiqlanadi
+(ack). Bot to'xtab qolsa - tasdiqlanmagan yozuvlar lease tugagach qayta olinadi.
+"""
+import asyncio
+import html
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramRetryAfter, TelegramNetworkError, TelegramServerError,
+    TelegramForbiddenError, TelegramBadRequest
+)
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, WebAppInfo
+
+from attendance import here_button
+from config import (
+    WEBAPP_URL, NOTIFY_GLOBAL_RATE, NOTIFY_CHAT_INTERVAL, NOTIFY_WORKERS,
+    NOTIFY_QUEUE_SIZE, NOTIFY_BATCH_SIZE, NOTIFY_POLL_SECONDS, NOTIFY_MAX_ATTEMPTS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Umumiy token bucket + chat bo'yicha minimal interval + 429 pauzasi.
+    Bucket hajmi 1 - xabarlar tekis taqsimlanadi (boshida portlash yo'q,
+    har qanday 1 s oynada <= rate).
+    """
+
+    def __init__(self, rate: float, chat_interval: float):
+        self.rate = rate
+        self.chat_interval = chat_interval
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._chat_next: Dict[int, float] = {}
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """429 - hamma kutadi"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self, chat_id: int):
+        # Chat navbati - bir chatga parallel yuborilmaydi (tekshirish va band qilish orasida await yo'q)
+        while True:
+            now = time.monotonic()
+            slot = self._chat_next.get(chat_id, 0.0)
+            if slot <= now:
+                break
+            await asyncio.sleep(slot - now)
+        self._chat_next[chat_id] = now + self.chat_interval
+
+        await self._acquire_global()
+        # Interval haqiqiy yuborish vaqtidan hisoblanadi
+        self._chat_next[chat_id] = time.monotonic() + self.chat_interval
+
+    async def _acquire_global(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(1.0, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def forget_idle(self):
+        """Eski chat slotlarini tozalash (xotira o'smasligi uchun)"""
+        now = time.monotonic()
+        self._chat_next = {chat: slot for chat, slot in self._chat_next.items() if slot > now}
+
+
+@dataclass
+class Job:
+    chat_id: int
+    event_id: int
+    text: str
+    reply_markup: Optional[InlineKeyboardMarkup] = None
+    attempts: int = 0
+
+
+def render(event: dict) -> str:
+    """Xabar matni"""
+    subject = html.escape(event.get("subject_name") or "Dars", quote=False)
+    group = html.escape(event.get("group_name") or "", quote=False)
+    room = html.escape(event.get("room") or "-", quote=False)
+    hours = f"{event['start_time'][:5]}-{event['end_time'][:5]}"
+
+    if event["kind"] == "lesson_closing":
+        title = "⏰ <b>Davomat tez orada yopiladi!</b>"
+        footer = "Siz hali davomat qilmadingiz."
+    else:
+        title = "🔔 <b>Dars boshlandi</b>"
+        footer = "Davomat qilishni unutmang!"
+
+    return (
+        f"{title}\n\n"
+        f"📚 {subject}\n"
+        f"👥 {group}\n"
+        f"🚪 Xona: {room}\n"
+        f"🕐 {hours}\n\n"
+        f"{footer}"
+    )
+
+
+def keyboard(event: dict, chat_id: int) -> InlineKeyboardMarkup:
+    """"Darsdaman" (shu chat uchun imzolangan) va Mini App tugmalari"""
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [here_button(event["lesson_id"], chat_id)],
+        [InlineKeyboardButton(text="📱 Ilovani ochish", web_app=WebAppInfo(url=WEBAPP_URL))]
+    ])
+
+
+class NotificationDispatcher:
+    """
+    Navbat: poller backenddan yozuvlarni oladi, har bir qabul qiluvchi uchun
+    Job qo'shadi; NOTIFY_WORKERS ta worker limiter orqali yuboradi.
+    """
+
+    def __init__(self, bot: Bot, backend, workers: int = NOTIFY_WORKERS):
+        self.bot = bot
+        self.backend = backend
+        self.workers = workers
+        self.limiter = RateLimiter(NOTIFY_GLOBAL_RATE, NOTIFY_CHAT_INTERVAL)
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._remaining: Dict[int, int] = {}  # event_id -> yuborilmagan xabarlar
+        self._acks: List[int] = []
+        self._tasks: List[asyncio.Task] = []
+        self._retries = set()
+        self.stats = {"sent": 0, "retried": 0, "rate_limited": 0, "dropped": 0, "events": 0}
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._poll_loop())]
+        self._tasks += [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"🔔 Xabarlar navbati ishga tushdi ({self.workers} worker)")
+
+    async def stop(self):
+        tasks = self._tasks + list(self._retries)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        await self._flush_acks()
+
+    def submit(self, events: List[dict]):
+        """Yozuvlarni navbatga qo'yish"""
+        for event in events:
+            chat_ids = event.get("chat_ids") or []
+            if event["id"] in self._remaining:
+                continue  # Lease tugab qayta kelgan, hali yuborilmoqda
+            self.stats["events"] += 1
+            if not chat_ids:
+                self._acks.append(event["id"])
+                continue
+            text = render(event)
+            self._remaining[event["id"]] = len(chat_ids)
+            for chat_id in chat_ids:
+                self.queue.put_nowait(Job(chat_id, event["id"], text, keyboard(event, chat_id)))
+
+    async def _poll_loop(self):
+        while True:
+            await self._flush_acks()
+            events = []
+            if self.queue.qsize() < NOTIFY_QUEUE_SIZE:
+                try:
+                    events = await self.backend.claim_notifications(NOTIFY_BATCH_SIZE)
+                except Exception as e:
+                    logger.warning(f"⚠️ Xabarlarni olib bo'lmadi: {e}")
+            self.submit(events)
+            self.limiter.forget_idle()
+            if len(events) < NOTIFY_BATCH_SIZE:
+                await asyncio.sleep(NOTIFY_POLL_SECONDS)
+
+    async def _flush_acks(self):
+        if not self._acks:
+            return
+        ids, self._acks = self._acks, []
+        try:
+            await self.backend.ack_notifications(ids)
+        except Exception as e:
+            self._acks.extend(ids)
+            logger.warning(f"⚠️ Tasdiqlab bo'lmadi ({len(ids)} ta): {e}")
+
+    def _done(self, job: Job):
+        self._remaining[job.event_id] -= 1
+        if self._remaining[job.event_id] == 0:
+            del self._remaining[job.event_id]
+            self._acks.append(job.event_id)
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._send(job)
+            finally:
+                self.queue.task_done()
+
+    async def _send(self, job: Job):
+        await self.limiter.acquire(job.chat_id)
+        try:
+            await self.bot.send_message(
+                job.chat_id, job.text, reply_markup=job.reply_markup, parse_mode="HTML"
+            )
+        except TelegramRetryAfter as e:
+            # Xabar yo'qolmaydi - urinishlar hisobiga kirmaydi
+            self.stats["rate_limited"] += 1
+            self.limiter.pause(e.retry_after)
+            self.queue.put_nowait(job)
+            return
+        except (TelegramForbiddenError, TelegramBadRequest) as e:
+            # Bot bloklangan, chat topilmadi - qayta urinish foydasiz
+            self.stats["dropped"] += 1
+            logger.info(f"Xabar yuborilmadi ({job.chat_id}): {e}")
+        except (TelegramNetworkError, TelegramServerError) as e:
+            job.attempts += 1
+            if job.attempts < NOTIFY_MAX_ATTEMPTS:
+                self.stats["retried"] += 1
+                delay = min(60, 2 ** job.attempts) * random.uniform(0.5, 1.5)
+                task = asyncio.create_task(self._retry_later(job, delay))
+                self._retries.add(task)
+                task.add_done_callback(self._retries.discard)
+                return
+            self.stats["dropped"] += 1
+            logger.warning(f"⚠️ Xabar yuborilmadi ({job.chat_id}), {job.attempts} urinish: {e}")
+        except Exception as e:
+            # Boshqa API xatolari (NotFound, Unauthorized, EntityTooLarge ...) va kutilmagan
+            # xatolar - worker to'xtamasligi va yozuv tasdiqlanishi uchun tashlab yuboriladi
+            self.stats["dropped"] += 1
+            logger.exception(f"⚠️ Xabar yuborilmadi ({job.chat_id}): {e}")
+        else:
+            self.stats["sent"] += 1
+        self._done(job)
+
+    async def _retry_later(self, job: Job, delay: float):
+        await asyncio.sleep(delay)
+        self.queue.put_nowait(job)
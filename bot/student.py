@@ -0,0 +1,84 @@
+"""
+Talaba buyruqlari - /schedule, /stats
+
+Ma'lumotlar backend ichki API dan umumiy (pooled) klient orqali olinadi.
+"""
+import html
+import logging
+from datetime import date
+
+from aiogram import Router, types
+from aiogram.filters import Command
+
+from backend import BackendClient
+
+logger = logging.getLogger(__name__)
+router = Router()
+
+NOT_REGISTERED = "ℹ️ Siz hali talaba sifatida ro'yxatdan o'tmagansiz. /app orqali ro'yxatdan o'ting."
+BACKEND_ERROR = "⚠️ Server bilan bog'lanib bo'lmadi. Keyinroq urinib ko'ring."
+
+
+@router.message(Command("schedule"))
+async def cmd_schedule(message: types.Message, backend: BackendClient):
+    """Haftalik dars jadvali"""
+    try:
+        week = await backend.get_schedule(message.from_user.id)
+    except Exception as e:
+        logger.warning(f"⚠️ Jadval olinmadi: {e}")
+        await message.answer(BACKEND_ERROR)
+        return
+    if week is None:
+        await message.answer(NOT_REGISTERED)
+        return
+
+    today = date.today().weekday()
+    lines = ["📅 <b>Haftalik jadval</b>"]
+    for day in week:
+        if not day["lessons"]:
+            continue
+        marker = "👉 " if day["day_of_week"] == today else ""
+        lines.append(f"\n{marker}<b>{day['day_name']}</b>")
+        for lesson in day["lessons"]:
+            room = f", {html.escape(lesson['room'], quote=False)}" if lesson.get("room") else ""
+            lines.append(
+                f"🕐 {lesson['start_time'][:5]}-{lesson['end_time'][:5]} "
+                f"{html.escape(lesson.get('subject_name') or 'Nomalum', quote=False)}{room}"
+            )
+    if len(lines) == 1:
+        lines.append("\nJadval bo'sh")
+
+    await message.answer("\n".join(lines), parse_mode="HTML")
+
+
+@router.message(Command("stats"))
+async def cmd_stats(message: types.Message, backend: BackendClient):
+    """Davomat statistikasi (fanlar bo'yicha)"""
+    try:
+        subjects = await backend.get_stats(message.from_user.id)
+    except Exception as e:
+        logger.warning(f"⚠️ Statistika olinmadi: {e}")
+        await message.answer(BACKEND_ERROR)
+        return
+    if subjects is None:
+        await message.answer(NOT_REGISTERED)
+        return
+
+    total = sum(subject["total_lessons"] for subject in subjects)
+    attended = sum(subject["present_count"] + subject["late_count"] for subject in subjects)
+    absent = sum(subject["absent_count"] for subject in subjects)
+    percentage = round(attended / total * 100, 1) if total else 0
+
+    lines = [
+        "📊 <b>Davomat statistikasi</b>\n",
+        f"✅ Qatnashgan: {attended}/{total} ({percentage}%)",
+        f"❌ Qoldirilgan: {absent}\n"
+    ]
+    for subject in subjects:
+        lines.append(
+            f"📚 {html.escape(subject['subject_name'], quote=False)}: "
+            f"{subject['present_count'] + subject['late_count']}/{subject['total_lessons']} "
+            f"({subject['attendance_percentage']}%)"
+        )
+
+    await message.answer("\n".join(lines), parse_mode="HTML")
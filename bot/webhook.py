@@ -0,0 +1,65 @@
+"""
+Webhook rejimi - aiohttp server
+
+Telegram updatelarni o'zi yuboradi (polling kechikishi yo'q). So'rov
+`X-Telegram-Bot-Api-Secret-Token` sarlavhasi WEBHOOK_SECRET ga teng bo'lsagina
+qabul qilinadi; javob darhol qaytariladi, update fonda qayta ishlanadi.
+Bir vaqtda qayta ishlanadigan updatelar UPDATE_CONCURRENCY bilan cheklanadi
+(ortiqchalari semaforda kutadi) - backend pool va Telegram chegaralari uchun.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+from aiohttp import web
+from aiogram import BaseMiddleware, Bot, Dispatcher
+from aiogram.types import TelegramObject
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+
+from config import (
+    WEBHOOK_URL, WEBHOOK_PATH, WEBHOOK_SECRET, WEBHOOK_HOST, WEBHOOK_PORT,
+    WEBHOOK_MAX_CONNECTIONS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrencyLimitMiddleware(BaseMiddleware):
+    """Parallel qayta ishlanadigan updatelar chegarasi (polling va webhook)"""
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        async with self.semaphore:
+            return await handler(event, data)
+
+
+def run_webhook(dp: Dispatcher, bot: Bot):
+    """aiohttp serverni ishga tushirish (startupda webhook o'rnatiladi)"""
+    if not WEBHOOK_SECRET:
+        raise ValueError("❌ WEBHOOK_SECRET topilmadi - webhook rejimida majburiy!")
+
+    @dp.startup()
+    async def set_webhook():
+        await bot.set_webhook(
+            f"{WEBHOOK_URL.rstrip('/')}{WEBHOOK_PATH}",
+            secret_token=WEBHOOK_SECRET,
+            max_connections=WEBHOOK_MAX_CONNECTIONS,
+            allowed_updates=dp.resolve_used_update_types()
+        )
+        logger.info(f"🌐 Webhook o'rnatildi: {WEBHOOK_URL.rstrip('/')}{WEBHOOK_PATH}")
+
+    async def health(request: web.Request) -> web.Response:
+        return web.json_response({"status": "healthy"})
+
+    app = web.Application()
+    SimpleRequestHandler(dispatcher=dp, bot=bot, secret_token=WEBHOOK_SECRET).register(app, path=WEBHOOK_PATH)
+    app.router.add_get("/health", health)
+    setup_application(app, dp, bot=bot)
+    web.run_app(app, host=WEBHOOK_HOST, port=WEBHOOK_PORT)
@@ -37,6 +37,8 @@ export const authAPI = {
 export const studentAPI = {
   getToday: () => api.get('/student/today'),
   getStats: () => api.get('/student/stats'),
+  getSubjectStats: () => api.get('/student/stats/subjects'),
+  getTrend: (params) => api.get('/student/stats/trend', { params }),
   getSchedule: () => api.get('/student/schedule')
 }
 
@@ -50,6 +52,7 @@ export const teacherAPI = {
   deleteLesson: (lessonId) => api.delete(`/teacher/lesson/${lessonId}`),
   getSubjects: () => api.get('/teacher/subjects'),
   getGroups: () => api.get('/teacher/groups'),
+  getGroupTrend: (groupId, params) => api.get(`/teacher/groups/${groupId}/trend`, { params }),
   createLesson: (group_id, subject_id, room) => api.post(`/teacher/lesson/create?group_id=${group_id}&subject_id=${subject_id}${room ? '&room=' + room : ''}`),
   getMySchedule: () => api.get('/teacher/my-schedule')
 }
@@ -57,7 +60,7 @@ export const teacherAPI = {
 // Attendance API
 export const attendanceAPI = {
   mark: (lessonId) => api.post(`/attendance/mark/${lessonId}`),
-  getHistory: () => api.get('/attendance/history')
+  getHistory: (params) => api.get('/attendance/history', { params })
 }
 
 // Admin API
@@ -71,6 +74,9 @@ export const adminAPI = {
   getSubjects: () => api.get('/admin/subjects'),
   getTodayLessons: () => api.get('/admin/lessons/today'),
   getAttendanceReport: (params) => api.get('/admin/attendance/report', { params }),
+  getAttendanceTrend: (params) => api.get('/admin/attendance/trend', { params }),
+  getAttendanceMatrix: (params) => api.get('/admin/attendance/matrix', { params }),
+  getAtRisk: (params) => api.get('/admin/risk', { params }),
   exportExcel: (params) => api.get('/admin/attendance/export', {
     params,
     responseType: 'blob'